@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.forms import UserChangeForm, UserCreationForm
 
-from backend.models import Entry, Team, Tenant, TenantRequest, User
+from backend.models import ArchivedEntry, Entry, ScoringJob, Team, TeamDailyStats, Tenant, TenantRequest, User
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -42,10 +42,42 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class EntryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'reported_at', 'user', 'team', 'tenant', 'stress_score', 'motivation_score', 'score_status')
+    # 一覧の各行の user / team / tenant を1回の JOIN で読み込む
+    list_select_related = ('user', 'team', 'tenant')
+    list_filter = ('score_status', 'reported_at')
+    date_hierarchy = 'reported_at'
+    search_fields = ('user__email', 'user__name', 'team__name')
+    # 全ユーザー・チームを選択肢として読み込まない
+    raw_id_fields = ('user', 'team', 'tenant')
+    # 大きなテーブルで絞り込みのたびに全件数を数えない
+    show_full_result_count = False
+    ordering = ('-reported_at', 'id')
+
+
+class ScoringJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'entry_id', 'status', 'attempts', 'next_attempt_at', 'updated_at')
+    list_filter = ('status',)
+    raw_id_fields = ('entry',)
+    show_full_result_count = False
+
+
+class ArchivedEntryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tenant', 'team', 'month', 'entry_count', 'archived_at')
+    list_select_related = ('tenant', 'team')
+    list_filter = ('month',)
+    raw_id_fields = ('tenant', 'team')
+    exclude = ('payload',)
+
+
 admin.site.register(Team)
 admin.site.register(Tenant)
 admin.site.register(User, UserAdmin)
-admin.site.register(Entry)
+admin.site.register(Entry, EntryAdmin)
 admin.site.register(TenantRequest)
+admin.site.register(ScoringJob, ScoringJobAdmin)
+admin.site.register(TeamDailyStats)
+admin.site.register(ArchivedEntry, ArchivedEntryAdmin)
 
 # Register your models here.
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "backend"
+
+    def ready(self):
+        from backend.sqlite_tuning import configure_sqlite_connection
+
+        # SQLite の新しい接続ごとに WAL・busy_timeout などの PRAGMA を適用する
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='backend.sqlite_tuning')
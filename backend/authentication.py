@@ -1,5 +1,233 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+DEFAULT_TOKEN_AUTH = {
+    'STATELESS': False,
+    'USER_CACHE_ALIAS': 'default',
+    'USER_CACHE_TIMEOUT': 60,
+    'VERIFIED_TOKEN_CACHE_SIZE': 1024,
+}
+
+# ステートレス認証でユーザーを組み立てるためにアクセストークンに含めるクレーム
+USER_CLAIMS = ('tenant_id', 'role', 'name')
+
+
+def get_token_auth_settings():
+    """settings.TOKEN_AUTH を既定値とマージして返す"""
+    return {**DEFAULT_TOKEN_AUTH, **getattr(settings, 'TOKEN_AUTH', {})}
+
+
+def add_user_claims(token, user):
+    """
+    トークンにステートレス認証用のユーザークレームを追加する
+
+    Args:
+        token (Token): simplejwt のトークン（RefreshToken の場合はアクセストークンにも引き継がれる）
+        user (User): トークンを発行するユーザー
+
+    Returns:
+        Token: クレームを追加したトークン
+    """
+    token['tenant_id'] = user.tenant_id
+    token['role'] = user.role
+    token['name'] = user.name
+    return token
+
+
+def _user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def get_cached_user(user_id):
+    """
+    テナントを結合したユーザー行を短時間キャッシュして返す
+
+    ステートレス認証のユーザーがトークンにない属性（email, tenant, managed_teams 等）を
+    必要とした場合に使う。TTL は TOKEN_AUTH の USER_CACHE_TIMEOUT。
+
+    Args:
+        user_id (int): ユーザーID
+
+    Returns:
+        User: ユーザー
+
+    Raises:
+        User.DoesNotExist: ユーザーが存在しない場合
+    """
+    from backend.models import User
+
+    config = get_token_auth_settings()
+    cache = caches[config['USER_CACHE_ALIAS']]
+    key = _user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.select_related('tenant').get(pk=user_id)
+        cache.set(key, user, timeout=config['USER_CACHE_TIMEOUT'])
+    return user
+
+
+def invalidate_cached_user(user_id):
+    """キャッシュ済みのユーザー行を破棄する"""
+    caches[get_token_auth_settings()['USER_CACHE_ALIAS']].delete(_user_cache_key(user_id))
+
+
+class VerifiedTokenCache:
+    """
+    検証済みアクセストークンのプロセス内 LRU キャッシュ
+
+    トークン文字列の SHA-256 をキーに検証済みトークン（クレーム）を保持し、
+    同じ Cookie での署名検証・クレーム解析を省略する。各エントリーは
+    トークンの exp で失効し、max_entries を超えると最も古く使われたものから追い出す。
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(raw_token):
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode('utf-8')
+        return hashlib.sha256(raw_token).hexdigest()
+
+    def get(self, raw_token):
+        """有効期限内の検証済みトークンを返す（なければ None）"""
+        if not self.max_entries:
+            return None
+        key = self._key(raw_token)
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            token, expires_at = item
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return token
+
+    def set(self, raw_token, token):
+        """検証済みトークンを exp まで保持する（exp のないトークンは保持しない）"""
+        expires_at = token.get('exp')
+        if not self.max_entries or expires_at is None:
+            return
+        key = self._key(raw_token)
+        with self._lock:
+            self._data[key] = (token, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def evict(self, raw_token):
+        """トークンをキャッシュから取り除く（ログアウト時）"""
+        with self._lock:
+            self._data.pop(self._key(raw_token), None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_verified_tokens = None
+_verified_tokens_lock = threading.Lock()
+
+
+def get_verified_token_cache():
+    """
+    TOKEN_AUTH の VERIFIED_TOKEN_CACHE_SIZE に従ってプロセス共通のキャッシュを返す
+
+    Returns:
+        VerifiedTokenCache: 検証済みトークンキャッシュ（サイズ0の場合は何も保持しない）
+    """
+    global _verified_tokens
+    if _verified_tokens is None:
+        with _verified_tokens_lock:
+            if _verified_tokens is None:
+                _verified_tokens = VerifiedTokenCache(get_token_auth_settings()['VERIFIED_TOKEN_CACHE_SIZE'])
+    return _verified_tokens
+
+
+def reset_verified_token_cache():
+    """検証済みトークンキャッシュを破棄する（設定変更時・テスト用）"""
+    global _verified_tokens
+    with _verified_tokens_lock:
+        _verified_tokens = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(setting, **kwargs):
+    if setting == 'TOKEN_AUTH':
+        reset_verified_token_cache()
+
+
+class TenantTokenUser(TokenUser):
+    """
+    アクセストークンのクレームから組み立てる軽量ユーザー
+
+    id / tenant_id / role / name はトークンから返すためDBを参照しない。
+    それ以外の属性はキャッシュ経由で読み込んだユーザー行に委譲する。
+
+    Note:
+        - トークンの有効期限内はロール・テナントの変更が反映されない（再ログイン・リフレッシュで反映）
+        - ユーザー行を読まないため、is_active の確認やユーザー削除の検知は行わない（User モデルに is_active 列はなく
+          常に True。削除されたユーザーのトークンもアクセストークンの有効期限までは認証される）
+        - ORM に渡す場合は user_id=request.user.id のように ID を使う
+    """
+    @cached_property
+    def tenant_id(self):
+        return self.token['tenant_id']
+
+    @cached_property
+    def role(self):
+        return self.token['role']
+
+    @cached_property
+    def name(self):
+        return self.token['name']
+
+    @cached_property
+    def managed_team_ids(self):
+        """管理するチームのID一覧（リクエスト中は1回だけ読み込む）"""
+        from backend.models import Team
+
+        return list(Team.objects.filter(managers=self.id).values_list('id', flat=True))
+
+    @cached_property
+    def user(self):
+        """ユーザー行（短時間キャッシュ）"""
+        return get_cached_user(self.id)
+
+    def __eq__(self, other):
+        # User インスタンスとも ID で比較できるようにする
+        other_id = getattr(other, 'pk', None)
+        if other_id is None:
+            return NotImplemented
+        return str(self.id) == str(other_id)
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __getattr__(self, attr):
+        if attr.startswith('__') or attr == 'token':
+            raise AttributeError(attr)
+        return getattr(self.user, attr)
 
 
 class CustomJWTAuthentication(JWTAuthentication):
@@ -17,6 +245,16 @@ class CustomJWTAuthentication(JWTAuthentication):
         2. トークンの検証（署名、有効期限等）
         3. ユーザー情報の取得・返却
         
+    Verified Token Cache:
+        - 検証済みのトークンはプロセス内 LRU に exp まで保持し、再検証を省略する
+        - ログアウト（TokenDeleteView）時にキャッシュから取り除く
+        
+    Stateless Mode (TOKEN_AUTH["STATELESS"] = True):
+        - トークンに tenant_id / role / name クレームがあれば、ユーザー行を読まずに
+          TenantTokenUser を返す（クレームのない古いトークンは従来通りDBから取得）
+        - ユーザー行を読まないため is_active を確認しない（User モデルに is_active 列はなく常に True。
+          削除されたユーザーを即時に拒否する必要がある場合は STATELESS を無効にする）
+        
     Returns:
         tuple: (User, validated_token) または None
     """
@@ -36,4 +274,47 @@ class CustomJWTAuthentication(JWTAuthentication):
             return None
 
         validated_token = self.get_validated_token(access_token)
-        return self.get_user(validated_token), validated_token
\ No newline at end of file
+        return self.get_user(validated_token), validated_token
+
+    def get_validated_token(self, raw_token):
+        """
+        検証済みトークンキャッシュを確認し、なければ署名・有効期限を検証してキャッシュする
+        """
+        cache = get_verified_token_cache()
+        validated_token = cache.get(raw_token)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            cache.set(raw_token, validated_token)
+        return validated_token
+
+    def get_user(self, validated_token):
+        """
+        トークンのユーザーを返す
+
+        ステートレスモードでは TenantTokenUser を、それ以外はテナントを結合した
+        ユーザー行を1クエリで読み込んで返す（権限チェックで Tenant を再度読まないように）。
+        """
+        if get_token_auth_settings()['STATELESS'] and all(
+            claim in validated_token for claim in (api_settings.USER_ID_CLAIM, *USER_CLAIMS)
+        ):
+            return TenantTokenUser(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = self.user_model.objects.select_related('tenant').get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
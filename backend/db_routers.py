@@ -0,0 +1,121 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+# 読み取り専用レプリカの接続名（settings.DATABASES に定義されている場合のみ使う）
+REPLICA_ALIAS = 'replica'
+
+# 書き込み後の読み取りを default に送る期間を示す Cookie（レプリカの遅延で直前の書き込みが見えなくならないように）
+PRIMARY_READS_COOKIE = 'primary_reads'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_available():
+    """
+    default とは別のデータベースを指すレプリカが settings.DATABASES に定義されているか
+
+    テスト実行時はレプリカが default のミラー（同じ接続先）になるため False になる。
+    """
+    databases = connections.settings
+    if REPLICA_ALIAS not in databases:
+        return False
+    replica, default = databases[REPLICA_ALIAS], databases['default']
+    return any(replica.get(key) != default.get(key) for key in ('ENGINE', 'HOST', 'PORT', 'NAME'))
+
+
+def replica_reads_enabled():
+    """現在のコンテキストで読み取りをレプリカに振り分けるか"""
+    return _replica_reads.get()
+
+
+@contextmanager
+def replica_reads():
+    """
+    ブロック内の読み取りクエリをレプリカに振り分ける
+
+    レプリカは遅延があるため、直前の書き込みを読み直す処理では使わないこと。
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """
+    ブロック内の読み取りクエリを default に送る（replica_reads() の内側でも）
+
+    結果をキャッシュに保存するなど、レプリカの遅延した値を残してはいけない読み取りに使う。
+    """
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    書き込みはすべて default、明示した読み取りのみレプリカに送るデータベースルーター
+
+    settings.DATABASES に "replica" がない（または default と同じ接続先の）場合は何もしない。
+    レプリカへの振り分けは replica_reads() / ReplicaReadMixin の内側に限るため、
+    保存直後の読み直しや管理画面・管理コマンドは従来どおり default を読む。
+    """
+    def db_for_read(self, model, **hints):
+        if replica_reads_enabled() and replica_available():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # レプリカは default の複製のため、どちらから読んだオブジェクト同士も関連付けてよい
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
+
+
+class ReplicaReadMixin:
+    """
+    指定したアクションの GET / HEAD の読み取りをレプリカに振り分けるビューの Mixin
+
+    認証・権限チェック（initial）の後からレスポンスの確定（finalize_response）までの
+    クエリが対象になる。書き込みに成功したレスポンスには DATABASE_REPLICA_STICKY_SECONDS 秒の
+    Cookie を付け、その間の同じクライアントの読み取りは default に送る（自分の書き込みを読めるように）。
+
+    Attributes:
+        replica_read_actions (Iterable[str]|None): 対象のアクション名（None は全アクション）
+    """
+    replica_read_actions = ('list',)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        actions = self.replica_read_actions
+        if (
+            request.method in ('GET', 'HEAD')
+            and (actions is None or getattr(self, 'action', None) in actions)
+            and PRIMARY_READS_COOKIE not in request.COOKIES
+        ):
+            self._replica_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _replica_reads.reset(token)
+            self._replica_token = None
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400 and replica_available():
+            response.set_cookie(
+                PRIMARY_READS_COOKIE, '1',
+                max_age=getattr(settings, 'DATABASE_REPLICA_STICKY_SECONDS', 5),
+                httponly=True, samesite='Lax',
+            )
+        return response
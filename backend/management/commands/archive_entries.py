@@ -0,0 +1,58 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from backend.models import Tenant
+from backend.retention.archive import archive_entries
+from backend.retention.policy import build_retention_policy, get_retention_cutoff
+
+
+class Command(BaseCommand):
+    """
+    保持期間を過ぎたエントリーをアーカイブに移すコマンド
+
+    テナントごとに domain_settings["retention"]["days"]（既定: settings.ENTRY_RETENTION）から
+    境界日を求め、それより前のエントリーを (team, 月) 単位の圧縮済み ArchivedEntry に移す。
+    定期実行（日次の cron など）を想定している。
+
+    Usage:
+        python manage.py archive_entries
+        python manage.py archive_entries --tenant 1 --dry-run
+        python manage.py archive_entries --tenant 1 --days 365
+    """
+    help = '保持期間を過ぎたエントリーをアーカイブに移す'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, help='対象テナントID')
+        parser.add_argument('--days', type=int, help='テナントの設定の代わりに使う保持日数')
+        parser.add_argument('--today', type=date.fromisoformat, help='境界日の計算に使う日付 (YYYY-MM-DD)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='読み込み・削除の単位件数')
+        parser.add_argument('--dry-run', action='store_true', help='件数の表示のみ行う')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.order_by('id')
+        if options['tenant']:
+            tenants = tenants.filter(pk=options['tenant'])
+
+        total = 0
+        for tenant in tenants:
+            domain_settings = tenant.domain_settings
+            if options['days'] is not None:
+                domain_settings = {**(domain_settings or {}), 'retention': {'days': options['days']}}
+            cutoff = get_retention_cutoff(build_retention_policy(domain_settings), today=options['today'])
+            if cutoff is None:
+                continue
+
+            result = archive_entries(
+                tenant.pk, cutoff, batch_size=options['batch_size'], dry_run=options['dry_run'],
+            )
+            total += result['entries']
+            verb = 'アーカイブ対象' if options['dry_run'] else 'アーカイブ済み'
+            self.stdout.write(
+                f"tenant={tenant.pk}: {cutoff} より前の {result['entries']} 件（{result['chunks']} か月・チーム）を{verb}"
+            )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{total} 件がアーカイブ対象です。'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{total} 件のエントリーをアーカイブしました。'))
@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from backend.models import Entry, User
+from backend.serializers.entry_serializer import EntryDetailSerializer, EntryLeanSerializer
+from backend.serializers.user_serializer import UserDetailSerializer, UserLeanSerializer
+
+
+class Command(BaseCommand):
+    """
+    一覧表示の DRF シリアライザーと軽量シリアライザーの処理時間を比較するコマンド
+
+    どちらも一覧APIと同じクエリセット（select_related / prefetch_related 相当）から
+    --limit 件を読み込み、クエリ実行を含めた変換時間の最小値を出力する。
+
+    Usage:
+        python manage.py benchmark_read_serializers --tenant 1
+        python manage.py benchmark_read_serializers --tenant 1 --limit 500 --repeat 10 --entry-fields id,reported_at --user-fields id,name
+    """
+    help = '一覧表示用シリアライザーの処理時間を比較する'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, help='対象テナントID')
+        parser.add_argument('--limit', type=int, default=200, help='1回あたりの読み込み件数')
+        parser.add_argument('--repeat', type=int, default=5, help='計測回数')
+        parser.add_argument('--entry-fields', help='エントリーの軽量シリアライザーに渡す ?fields= の値')
+        parser.add_argument('--user-fields', help='ユーザーの軽量シリアライザーに渡す ?fields= の値')
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        entries = Entry.objects.select_related('user', 'team').order_by('-reported_at', 'id')
+        users = User.objects.prefetch_related('teams').order_by('id')
+        if options['tenant']:
+            entries = entries.filter(tenant_id=options['tenant'])
+            users = users.filter(tenant_id=options['tenant'])
+
+        targets = [
+            ('entries', entries, EntryDetailSerializer, EntryLeanSerializer, ('reported_at',), options['entry_fields']),
+            ('users', users, UserDetailSerializer, UserLeanSerializer, (), options['user_fields']),
+        ]
+        for label, queryset, detail_class, lean_class, extra_columns, fields in targets:
+            try:
+                lean = lean_class(fields=fields)
+            except ValidationError as e:
+                raise CommandError(f'{label}: {e.detail["fields"]}')
+            drf_time = self._measure(
+                lambda: detail_class(list(queryset[:limit]), many=True).data, options['repeat']
+            )
+            lean_time = self._measure(
+                lambda: lean.to_representation(lean.values(queryset, *extra_columns)[:limit]), options['repeat']
+            )
+            speedup = drf_time / lean_time if lean_time else float('inf')
+            self.stdout.write(
+                f'{label}: drf={drf_time * 1000:.1f}ms lean={lean_time * 1000:.1f}ms ({speedup:.1f}x)'
+            )
+
+    @staticmethod
+    def _measure(func, repeat):
+        timings = []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
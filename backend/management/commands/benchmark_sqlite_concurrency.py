@@ -0,0 +1,160 @@
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.sqlite_tuning import DEFAULT_SQLITE_TUNING, apply_sqlite_pragmas, get_sqlite_tuning
+
+# チューニングなし（SQLite の既定: ロールバックジャーナル・synchronous=FULL）
+BASELINE_TUNING = {
+    'ENABLED': True,
+    'JOURNAL_MODE': 'DELETE',
+    'SYNCHRONOUS': 'FULL',
+    'BUSY_TIMEOUT': DEFAULT_SQLITE_TUNING['BUSY_TIMEOUT'],
+}
+
+SCHEMA = '''
+CREATE TABLE entry (
+    id INTEGER PRIMARY KEY,
+    team_id INTEGER NOT NULL,
+    reported_at TEXT NOT NULL,
+    stress_score INTEGER,
+    motivation_score INTEGER,
+    answers TEXT
+);
+CREATE INDEX entry_team_reported_at ON entry (team_id, reported_at);
+'''
+
+# ダッシュボード相当の読み取り（チーム・期間ごとの平均）
+READ_QUERY = '''
+SELECT reported_at, AVG(stress_score), AVG(motivation_score)
+FROM entry WHERE team_id = ? AND reported_at >= ?
+GROUP BY reported_at
+'''
+
+
+class Command(BaseCommand):
+    """
+    SQLite の PRAGMA チューニング前後で読み書きの同時実行性能を比較するコマンド
+
+    一時ファイルの SQLite データベースに対して、エントリー登録相当の書き込み
+    （1件ごとにコミット）とダッシュボード相当の集計読み取りを複数スレッドで
+    同時に --duration 秒実行し、チューニングなし（DELETE ジャーナル）と
+    settings.SQLITE_TUNING の設定それぞれの処理件数・読み取りレイテンシを出力する。
+
+    Usage:
+        python manage.py benchmark_sqlite_concurrency
+        python manage.py benchmark_sqlite_concurrency --readers 8 --writers 2 --duration 10 --rows 50000
+    """
+    help = 'SQLite の PRAGMA チューニング前後の読み書き同時実行性能を比較する'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help='読み取りスレッド数')
+        parser.add_argument('--writers', type=int, default=1, help='書き込みスレッド数')
+        parser.add_argument('--duration', type=float, default=5.0, help='計測秒数')
+        parser.add_argument('--rows', type=int, default=20000, help='事前に投入する行数')
+        parser.add_argument('--teams', type=int, default=20, help='チーム数')
+
+    def handle(self, *args, **options):
+        tuned = {**get_sqlite_tuning(), 'ENABLED': True}
+        for label, config in (('baseline', BASELINE_TUNING), ('tuned', tuned)):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'benchmark.sqlite3')
+                self._prepare(path, config, options['rows'], options['teams'])
+                result = self._run(path, config, options)
+            self.stdout.write(
+                f"{label}: reads={result['reads']} ({result['reads'] / options['duration']:.0f}/s) "
+                f"writes={result['writes']} ({result['writes'] / options['duration']:.0f}/s) "
+                f"read_p50={result['read_p50'] * 1000:.2f}ms read_p95={result['read_p95'] * 1000:.2f}ms "
+                f"read_max={result['read_max'] * 1000:.1f}ms locked={result['locked']}"
+            )
+
+    @staticmethod
+    def _connect(path, config):
+        # 待機は busy_timeout に任せる
+        connection = sqlite3.connect(path, timeout=0, check_same_thread=False)
+        apply_sqlite_pragmas(connection, config)
+        return connection
+
+    def _prepare(self, path, config, rows, teams):
+        connection = self._connect(path, config)
+        try:
+            connection.executescript(SCHEMA)
+            connection.executemany(
+                'INSERT INTO entry (team_id, reported_at, stress_score, motivation_score, answers) VALUES (?, ?, ?, ?, ?)',
+                (
+                    (i % teams, f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}', i % 100, (i * 7) % 100, '{"q1": "順調です"}')
+                    for i in range(rows)
+                ),
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
+    def _run(self, path, config, options):
+        stop = threading.Event()
+        lock = threading.Lock()
+        latencies, counts = [], {'reads': 0, 'writes': 0, 'locked': 0}
+
+        def record(name, latency=None):
+            with lock:
+                counts[name] += 1
+                if latency is not None:
+                    latencies.append(latency)
+
+        def reader(index):
+            connection = self._connect(path, config)
+            try:
+                team = index % options['teams']
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        connection.execute(READ_QUERY, (team, '2024-06-01')).fetchall()
+                    except sqlite3.OperationalError:
+                        record('locked')
+                        continue
+                    record('reads', time.perf_counter() - started)
+            finally:
+                connection.close()
+
+        def writer(index):
+            connection = self._connect(path, config)
+            try:
+                i = 0
+                while not stop.is_set():
+                    i += 1
+                    try:
+                        connection.execute(
+                            'INSERT INTO entry (team_id, reported_at, stress_score, motivation_score, answers) '
+                            'VALUES (?, ?, ?, ?, ?)',
+                            (i % options['teams'], '2024-12-31', i % 100, i % 100, '{"q1": "忙しい"}'),
+                        )
+                        connection.commit()
+                    except sqlite3.OperationalError:
+                        connection.rollback()
+                        record('locked')
+                        continue
+                    record('writes')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(options['readers'])]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        latencies.sort()
+        return {
+            **counts,
+            'read_p50': statistics.median(latencies) if latencies else 0.0,
+            'read_p95': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            'read_max': latencies[-1] if latencies else 0.0,
+        }
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.scoring.queue import DatabaseScoringQueue, get_scoring_queue
+
+
+class Command(BaseCommand):
+    """
+    AIスコア計算ジョブのワーカーコマンド
+
+    SCORING_QUEUE の BACKEND が DatabaseScoringQueue の場合に、
+    ScoringJob テーブルのジョブを取得してスレッドプールで実行する。
+
+    Usage:
+        python manage.py process_scoring_jobs            # 常駐
+        python manage.py process_scoring_jobs --once     # 1回だけ処理して終了
+    """
+    help = 'ScoringJob テーブルのAIスコア計算ジョブを処理する'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='実行可能なジョブを1回処理して終了する')
+        parser.add_argument('--interval', type=float, default=2.0, help='ジョブがない場合のポーリング間隔（秒）')
+        parser.add_argument('--batch-size', type=int, default=None, help='1回で取得する最大ジョブ数')
+
+    def handle(self, *args, **options):
+        queue = get_scoring_queue()
+        if not isinstance(queue, DatabaseScoringQueue):
+            raise CommandError(
+                'SCORING_QUEUE の BACKEND が backend.scoring.queue.DatabaseScoringQueue ではありません。'
+            )
+
+        while True:
+            processed = queue.drain(options['batch_size'])
+            if processed:
+                self.stdout.write(f'{processed} 件のジョブを処理しました。')
+            if options['once']:
+                break
+            if not processed:
+                time.sleep(options['interval'])
@@ -0,0 +1,36 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from backend.stats.rollup import rebuild_team_daily_stats
+
+
+class Command(BaseCommand):
+    """
+    チーム日次集計（TeamDailyStats）の再構築コマンド
+
+    通常は Entry のスコア書き込み時に該当日の行が更新されるが、
+    QuerySet.update() / delete() でエントリーを一括変更した後や
+    集計テーブルの初回作成時にはこのコマンドで作り直す。
+    アーカイブ済みの (team, date) の集計行は削除せずに残す。
+
+    Usage:
+        python manage.py rebuild_team_daily_stats
+        python manage.py rebuild_team_daily_stats --tenant 1 --from 2025-01-01
+    """
+    help = 'チーム日次集計をエントリーから再構築する'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, help='対象テナントID')
+        parser.add_argument('--from', dest='date_from', type=date.fromisoformat, help='対象開始日 (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', type=date.fromisoformat, help='対象終了日 (YYYY-MM-DD)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='bulk_create の単位件数')
+
+    def handle(self, *args, **options):
+        created = rebuild_team_daily_stats(
+            tenant_id=options['tenant'],
+            date_from=options['date_from'],
+            date_to=options['date_to'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'{created} 件の集計行を作成しました。'))
@@ -0,0 +1,174 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from backend.models import Entry
+from backend.scoring.breaker import CircuitOpenError
+from backend.scoring.cache import NullScoreCache
+from backend.scoring.worker import score_batch_with_breaker, score_locally
+from backend.stats.cache import invalidate_for_rollup_keys
+from backend.stats.rollup import refresh_for_keys
+
+
+class Command(BaseCommand):
+    """
+    既存エントリーのAIスコア再計算コマンド
+
+    プロンプトやモデルの変更後に、条件に一致するエントリーの
+    stress_score / motivation_score を再計算して書き戻す。
+    スコアキャッシュのキーにはモデルIDとプロンプトの版が含まれるため、変更後の再計算では
+    以前のスコアを返さない（--no-cache で同じ条件のキャッシュも使わずに再計算できる）。
+
+    Flow:
+        1. 条件に一致するエントリーを id 順に .iterator() で読み出す
+        2. chunk-size 件ごとに batch-size 件ずつのバッチに分け、スレッドプールで採点
+           （スコア計算キューと同じく、テナントの主スコアラーがローカルスコアラーのエントリーは
+           LLMに送らず、LLMの呼び出しはサーキットブレーカーを通す）
+        3. チャンク単位で bulk_update し、該当する (team, date) のチーム日次集計を再計算して
+           テナントのレスポンスキャッシュを無効化
+        4. チェックポイントに最終IDを記録
+        ブレーカーが開いた場合は処理中のチャンクを書き戻さずに中断する（--checkpoint 指定時は再実行で続きから再開）
+
+    Usage:
+        python manage.py rescore_entries --tenant 1 --from 2025-01-01 --workers 8
+        python manage.py rescore_entries --tenant 1 --checkpoint rescore.json  # 中断後も同じコマンドで再開
+    """
+    help = '既存エントリーのストレス度・モチベーション度を再計算する'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, help='対象テナントID')
+        parser.add_argument('--team', type=int, help='対象チームID')
+        parser.add_argument('--from', dest='date_from', type=date.fromisoformat, help='対象開始日 (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', type=date.fromisoformat, help='対象終了日 (YYYY-MM-DD)')
+        parser.add_argument('--workers', type=int, default=4, help='並列で実行するスレッド数')
+        parser.add_argument('--batch-size', type=int, default=20, help='1回のAI呼び出しにまとめる件数')
+        parser.add_argument('--chunk-size', type=int, default=500, help='bulk_update・チェックポイントの単位件数')
+        parser.add_argument('--checkpoint', help='進捗を記録するJSONファイルのパス（存在する場合は続きから再開）')
+        parser.add_argument('--restart', action='store_true', help='チェックポイントを無視して最初から実行する')
+        parser.add_argument('--no-cache', action='store_true', help='スコアキャッシュを使わずに再計算する')
+
+    def handle(self, *args, **options):
+        filters = self._build_filters(options)
+        last_id = self._load_checkpoint(options, filters)
+
+        queryset = Entry.objects.filter(**filters, answers__isnull=False)
+        if last_id:
+            queryset = queryset.filter(id__gt=last_id)
+            self.stdout.write(f'チェックポイントから再開します (id > {last_id})')
+        queryset = queryset.order_by('id').select_related('tenant').only(
+            'id', 'tenant_id', 'team_id', 'reported_at', 'questions', 'answers', 'tenant__domain_settings',
+        )
+        cache = NullScoreCache() if options['no_cache'] else None
+
+        total = failed_total = 0
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='rescore') as executor:
+            for chunk in self._chunks(queryset.iterator(chunk_size=options['chunk_size']), options['chunk_size']):
+                chunk_started = time.monotonic()
+                entries = [entry for entry in chunk if entry.answers]
+                batches = [
+                    entries[i:i + options['batch_size']]
+                    for i in range(0, len(entries), options['batch_size'])
+                ]
+                try:
+                    failed_ids = {
+                        entry_id
+                        for failed in executor.map(
+                            lambda batch: self._score(batch, options['batch_size'], cache), batches
+                        )
+                        for entry_id in failed
+                    }
+                except CircuitOpenError as e:
+                    raise CommandError(
+                        f'AIスコア計算のサーキットブレーカーが開いているため中断しました（{total} 件更新済み）: {e}'
+                    )
+                scored = [entry for entry in entries if entry.pk not in failed_ids]
+                Entry.objects.bulk_update(
+                    scored,
+                    ['stress_score', 'motivation_score', 'score_status'],
+                    batch_size=options['chunk_size'],
+                )
+                invalidate_for_rollup_keys(refresh_for_keys(entry.rollup_key for entry in scored))
+
+                last_id = chunk[-1].pk
+                self._save_checkpoint(options, filters, last_id)
+
+                total += len(scored)
+                failed_total += len(failed_ids)
+                elapsed = time.monotonic() - chunk_started
+                self.stdout.write(
+                    f'{len(scored)} 件更新 (失敗 {len(failed_ids)} 件, last_id={last_id}, '
+                    f'{len(chunk) / elapsed if elapsed else 0:.1f} 件/秒)'
+                )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'完了: {total} 件更新, 失敗 {failed_total} 件, {elapsed:.1f} 秒 '
+            f'({total / elapsed if elapsed else 0:.1f} 件/秒)'
+        ))
+
+    @staticmethod
+    def _score(batch, batch_size, cache):
+        """バッチを採点し、採点できなかったエントリーIDを返す"""
+        try:
+            _, remote = score_locally(batch)
+            return score_batch_with_breaker(remote, batch_size, cache=cache) if remote else set()
+        finally:
+            # ワーカースレッドのDB接続を解放（DatabaseScoreCache使用時）
+            close_old_connections()
+
+    @staticmethod
+    def _chunks(iterator, size):
+        chunk = []
+        for item in iterator:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _build_filters(options):
+        filters = {}
+        if options['tenant']:
+            filters['tenant_id'] = options['tenant']
+        if options['team']:
+            filters['team_id'] = options['team']
+        if options['date_from']:
+            filters['reported_at__gte'] = options['date_from']
+        if options['date_to']:
+            filters['reported_at__lte'] = options['date_to']
+        return filters
+
+    @staticmethod
+    def _checkpoint_filters(filters):
+        return {key: str(value) for key, value in filters.items()}
+
+    def _load_checkpoint(self, options, filters):
+        path = options['checkpoint']
+        if not path or options['restart'] or not os.path.exists(path):
+            return None
+
+        with open(path, encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('filters') != self._checkpoint_filters(filters):
+            raise CommandError(
+                f'チェックポイント {path} の対象条件が一致しません。--restart で最初から実行してください。'
+            )
+        return checkpoint.get('last_id')
+
+    def _save_checkpoint(self, options, filters, last_id):
+        path = options['checkpoint']
+        if not path:
+            return
+
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'filters': self._checkpoint_filters(filters), 'last_id': last_id}, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,188 @@
+# Generated by Django 5.2.2 on 2026-10-17 17:46
+
+import backend.models.user
+import datetime
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tenant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('domain_settings', models.JSONField(default=dict)),
+            ],
+            options={
+                'db_table': 'tenant',
+            },
+        ),
+        migrations.CreateModel(
+            name='TenantRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tenant_name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('name', models.CharField(max_length=100)),
+                ('domain', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': 'tenant_requests',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('role', models.IntegerField(choices=[(1, 'SUPERUSER'), (2, 'ADMIN'), (3, 'MANAGER'), (4, 'USER')], default=4)),
+                ('is_staff', models.BooleanField(default=False)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
+            ],
+            options={
+                'db_table': 'user',
+            },
+            managers=[
+                ('objects', backend.models.user.UserManager()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScoreCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('scores', models.JSONField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'score_cache',
+                'indexes': [models.Index(fields=['expires_at'], name='score_cache_expires_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Team',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('questions', models.JSONField(blank=True, null=True)),
+                ('managers', models.ManyToManyField(blank=True, limit_choices_to={'role__in': [2, 3]}, related_name='managed_teams', to=settings.AUTH_USER_MODEL)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='backend.tenant')),
+            ],
+            options={
+                'db_table': 'team',
+            },
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='teams',
+            field=models.ManyToManyField(related_name='members', to='backend.team'),
+        ),
+        migrations.CreateModel(
+            name='Entry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('questions', models.JSONField(blank=True, null=True)),
+                ('answers', models.JSONField(blank=True, null=True)),
+                ('stress_score', models.IntegerField(blank=True, null=True)),
+                ('motivation_score', models.IntegerField(blank=True, null=True)),
+                ('score_status', models.CharField(choices=[('pending', 'Pending'), ('scored', 'Scored'), ('failed', 'Failed'), ('estimated', 'Estimated')], default='pending', max_length=20)),
+                ('reported_at', models.DateField(default=datetime.date.today)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='backend.team')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='backend.tenant')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='backend.tenant'),
+        ),
+        migrations.CreateModel(
+            name='ScoringJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scoring_jobs', to='backend.entry')),
+            ],
+            options={
+                'db_table': 'scoring_jobs',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='scoring_job_due_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('stress_sum', models.IntegerField(default=0)),
+                ('stress_avg', models.FloatField(default=0)),
+                ('stress_min', models.IntegerField(default=0)),
+                ('stress_max', models.IntegerField(default=0)),
+                ('motivation_sum', models.IntegerField(default=0)),
+                ('motivation_avg', models.FloatField(default=0)),
+                ('motivation_min', models.IntegerField(default=0)),
+                ('motivation_max', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='backend.team')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='backend.tenant')),
+            ],
+            options={
+                'db_table': 'team_daily_stats',
+                'indexes': [models.Index(fields=['tenant', 'team', 'date'], name='team_stats_tenant_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('team', 'date'), name='unique_team_daily_stats')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['tenant'], name='team_tenant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['tenant', 'reported_at'], name='entry_tenant_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['tenant', 'team', 'reported_at'], name='entry_tenant_team_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['tenant', 'user', 'reported_at'], name='entry_tenant_user_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='entry',
+            constraint=models.UniqueConstraint(fields=('tenant', 'user', 'team', 'reported_at'), name='unique_entry_per_day'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['tenant'], name='user_tenant_idx'),
+        ),
+    ]
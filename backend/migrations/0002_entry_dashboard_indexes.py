@@ -0,0 +1,30 @@
+# Generated by Django 5.2.2 on 2026-10-17 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0001_initial'),
+    ]
+
+    # 置き換え先のインデックスを先に作成し、旧インデックスがない期間を作らない
+    operations = [
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['tenant', 'team', 'reported_at'], include=('user', 'stress_score', 'motivation_score'), name='entry_team_date_cover_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['tenant', 'user', '-reported_at', 'id'], name='entry_user_recent_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='entry',
+            name='entry_tenant_team_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='entry',
+            name='entry_tenant_user_date_idx',
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.2 on 2026-10-17 17:49
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0002_entry_dashboard_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('date_from', models.DateField()),
+                ('date_to', models.DateField()),
+                ('entry_count', models.IntegerField(default=0)),
+                ('payload', models.BinaryField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='backend.team')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='backend.tenant')),
+            ],
+            options={
+                'db_table': 'archived_entries',
+                'indexes': [models.Index(fields=['tenant', 'team', 'month'], name='archived_entry_month_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,9 @@
+from .archived_entry import ArchivedEntry
 from .entry import Entry
+from .score_cache_entry import ScoreCacheEntry
+from .scoring_job import ScoringJob
 from .team import Team
+from .team_daily_stats import TeamDailyStats
 from .tenant import Tenant
 from .tenant_request import TenantRequest
 from .user import User
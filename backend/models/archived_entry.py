@@ -0,0 +1,117 @@
+import datetime
+import json
+import zlib
+
+from django.db import models
+from django.utils import timezone
+
+from .team import Team
+from .tenant import Tenant
+
+# アーカイブに保存する Entry の列（reported_at は ISO 形式の文字列で保存する）
+ARCHIVED_ENTRY_FIELDS = (
+    'id', 'user_id', 'team_id', 'reported_at', 'questions', 'answers',
+    'stress_score', 'motivation_score', 'score_status',
+)
+
+
+class ArchivedEntryQuerySet(models.QuerySet):
+    def covering(self, team_ids=None, user_id=None, date_from=None, date_to=None):
+        """
+        指定したチーム・期間のエントリーを含みうるアーカイブに絞り込む
+
+        ユーザーはアーカイブの行（チーム・月単位）では絞り込めないため、展開時に除く。
+        """
+        chunks = self
+        if team_ids is not None:
+            chunks = chunks.filter(team_id__in=team_ids)
+        if date_from is not None:
+            chunks = chunks.filter(date_to__gte=date_from)
+        if date_to is not None:
+            chunks = chunks.filter(date_from__lte=date_to)
+        return chunks
+
+    def entries(self, team_ids=None, user_id=None, date_from=None, date_to=None):
+        """
+        アーカイブを展開してエントリーの辞書を返す
+
+        月単位の行は date_from / date_to で絞り込んでから展開するため、
+        期間を指定すれば対象外の月の payload は読み込まない。
+
+        Args:
+            team_ids (Iterable[int]|None): 対象チームID
+            user_id (int|None): 対象ユーザーID
+            date_from (date|None): 開始日（含む）
+            date_to (date|None): 終了日（含む）
+
+        Returns:
+            Iterator[dict]: ARCHIVED_ENTRY_FIELDS のキーを持つ辞書（チーム・月・記録日順）
+        """
+        chunks = self.covering(team_ids=team_ids, date_from=date_from, date_to=date_to)
+        for chunk in chunks.order_by('team_id', 'month', 'id').iterator():
+            for row in chunk.rows():
+                if user_id is not None and row['user_id'] != user_id:
+                    continue
+                if date_from is not None and row['reported_at'] < date_from:
+                    continue
+                if date_to is not None and row['reported_at'] > date_to:
+                    continue
+                yield row
+
+
+class ArchivedEntry(models.Model):
+    """
+    保持期間を過ぎたエントリーのアーカイブモデル
+
+    archive_entries コマンドが Entry から移したエントリーを (tenant, team, 月) 単位で
+    1行にまとめ、JSON Lines を zlib で圧縮して保存する。ダッシュボードは直近のエントリーしか
+    読まないため、Entry とそのインデックスを小さく保ちつつ、まれな履歴の参照には
+    ArchivedEntry.objects.entries() で応える。同じ月を再度アーカイブした場合は行が追加される。
+
+    Attributes:
+        tenant (ForeignKey): 所属テナント（組織）
+        team (ForeignKey): チーム
+        month (DateField): 対象月（月初日）
+        date_from / date_to (DateField): 含まれるエントリーの記録日の最小・最大
+        entry_count (IntegerField): 含まれるエントリー数
+        payload (BinaryField): エントリーの JSON Lines（zlib 圧縮）
+        archived_at (DateTimeField): アーカイブ日時
+    """
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE)
+    month = models.DateField()
+    date_from = models.DateField()
+    date_to = models.DateField()
+    entry_count = models.IntegerField(default=0)
+    payload = models.BinaryField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    objects = ArchivedEntryQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'archived_entries'
+        indexes = [
+            models.Index(fields=['tenant', 'team', 'month'], name='archived_entry_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"({self.id}){self.team_id} {self.month:%Y-%m} n={self.entry_count}"
+
+    @staticmethod
+    def pack(rows):
+        """エントリーの辞書を圧縮した JSON Lines に変換する"""
+        lines = (
+            json.dumps({**row, 'reported_at': row['reported_at'].isoformat()}, ensure_ascii=False, separators=(',', ':'))
+            for row in rows
+        )
+        return zlib.compress('\n'.join(lines).encode('utf-8'))
+
+    def rows(self):
+        """payload を展開してエントリーの辞書のリストを返す"""
+        data = zlib.decompress(bytes(self.payload)).decode('utf-8')
+        rows = []
+        for line in data.splitlines():
+            row = json.loads(line)
+            row['reported_at'] = datetime.date.fromisoformat(row['reported_at'])
+            rows.append(row)
+        return rows
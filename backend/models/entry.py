@@ -1,16 +1,38 @@
 
 import datetime
+import hashlib
 import json
-import logging
+from functools import partial
 
-from botocore.exceptions import ClientError
-from django.db import models
+from django.db import models, transaction
 
 from .team import Team
 from .tenant import Tenant
 from .user import User
 
 
+class ScoreStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    SCORED = 'scored', 'Scored'
+    FAILED = 'failed', 'Failed'
+    ESTIMATED = 'estimated', 'Estimated'
+
+
+# 同じ質問・回答でも保存時に再計算する状態（LLMのスコアが得られなかったもの）
+RESCORE_STATUSES = (ScoreStatus.FAILED, ScoreStatus.ESTIMATED)
+
+
+def score_fingerprint(questions, answers):
+    """
+    質問・回答の内容から、キーの順序に依存しないフィンガープリントを返す
+
+    Returns:
+        str: SHA-256 の16進文字列
+    """
+    payload = json.dumps([questions, answers], ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
 class Entry(models.Model):
     """
     チームメンバーのモチベーション・ストレス記録エントリーモデル
@@ -26,15 +48,27 @@ class Entry(models.Model):
         answers (JSONField): ユーザーの回答内容
         stress_score (IntegerField): AIが計算したストレス度 (0-100)
         motivation_score (IntegerField): AIが計算したモチベーション度 (0-100)
+        score_status (CharField): スコア計算状態 (pending / scored / failed / estimated)
         reported_at (DateField): 記録日（デフォルト: 今日）
         
     Constraints:
         - 1日1エントリーの制約: (tenant, user, team, reported_at)でユニーク
         
     AI Integration:
-        - save()時に自動でAWS Bedrockを呼び出し
+        - save()時はスコアを"pending"にして即時保存し、計算はキューに投入
+        - 読み込み時から質問・回答が変わらない save() と update_fields 指定の save() では再計算しない
+        - テナントの設定でローカルスコアラー（語句辞書）を主スコアラー・仮の値・フォールバックに使える
+        - フォールバックで確定したスコアは "estimated" となり、次回の保存時に再計算される
+        - バックグラウンドワーカーがAWS Bedrockを呼び出してスコアを書き戻す
         - answersが存在する場合のみAI計算実行
-        - 計算失敗時はデフォルト値(0)を設定
+        - リトライ上限まで失敗した場合はデフォルト値(0)・"failed"を設定
+        - bulk_upsert() の計算待ちエントリーはコミット後にまとめてキューへ投入し、バッチで採点する
+        - bulk_upsert() は質問・回答のフィンガープリントが変わらない上書きではスコアを引き継ぐ
+        
+    Rollup:
+        - スコア確定済みのエントリーは TeamDailyStats に (team, date) 単位で集計される
+        - save() / delete() とスコアの書き戻し時に該当日の集計行を再計算する
+        - 同じタイミングでテナントのチーム別エントリー集約キャッシュを無効化する
     """
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -43,6 +77,11 @@ class Entry(models.Model):
     answers = models.JSONField(blank=True, null=True)
     stress_score = models.IntegerField(null=True, blank=True)
     motivation_score = models.IntegerField(null=True, blank=True)
+    score_status = models.CharField(
+        max_length=20,
+        choices=ScoreStatus.choices,
+        default=ScoreStatus.PENDING,
+    )
     reported_at = models.DateField(default=datetime.date.today)
     
     class Meta:
@@ -54,42 +93,258 @@ class Entry(models.Model):
         ]
         indexes = [
             models.Index(fields=['tenant', 'reported_at'], name='entry_tenant_date_idx'),
-            models.Index(fields=['tenant', 'team', 'reported_at'], name='entry_tenant_team_date_idx'),
-            models.Index(fields=['tenant', 'user', 'reported_at'], name='entry_tenant_user_date_idx'),
+            # チーム別エントリー集約API（テナント・チーム・期間）。PostgreSQL ではスコアを INCLUDE し、
+            # テーブルを読まずにインデックスのみで返す（SQLite では INCLUDE なしのキー列のみ）
+            models.Index(
+                fields=['tenant', 'team', 'reported_at'],
+                include=['user', 'stress_score', 'motivation_score'],
+                name='entry_team_date_cover_idx',
+            ),
+            # エントリー一覧（自分のエントリーを (-reported_at, id) 順にカーソルページネーション）
+            models.Index(fields=['tenant', 'user', '-reported_at', 'id'], name='entry_user_recent_idx'),
         ]
+
+    @classmethod
+    def check(cls, **kwargs):
+        # entry_team_date_cover_idx の INCLUDE は PostgreSQL 用で、SQLite ではキー列のみのインデックスになる。
+        # この既知の差だけを除き、他のモデルの W040 は通常どおり報告する
+        return [error for error in super().check(**kwargs) if error.id != 'models.W040']
         
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # チーム・日付の変更時に変更前の集計行も再計算できるよう、読み込み時の値を保持する
+        instance._loaded_rollup_key = (
+            instance.__dict__.get('tenant_id'),
+            instance.__dict__.get('team_id'),
+            instance.__dict__.get('reported_at'),
+        )
+        # 質問・回答が変わらない保存でAIスコアを再計算しないよう、読み込み時のフィンガープリントを保持する
+        # （遅延読み込みの列がある場合は不明として扱い、保存時に再計算する）
+        if 'questions' in instance.__dict__ and 'answers' in instance.__dict__:
+            instance._loaded_score_fingerprint = instance.score_fingerprint
+        return instance
+    
+    @property
+    def rollup_key(self):
+        """チーム日次集計（TeamDailyStats）の行を特定する (tenant_id, team_id, reported_at)"""
+        return (self.tenant_id, self.team_id, self.reported_at)
+    
     def save(self, *args, **kwargs):
-        # AI計算を試行し、失敗してもデータ保存は継続
-        try:
-            if self.answers:  # answersがある場合のみAI計算を実行
-                scores = self.calculate_scores()
-                self.stress_score = scores.get('stress_score', 0)
-                self.motivation_score = scores.get('motivation_score', 0)
+        adding = self._state.adding
+        # update_fields 指定の保存は指定列だけを書き込み、スコアの再計算は行わない
+        rescore = kwargs.get('update_fields') is None and self.needs_scoring()
+        if rescore:
+            self._reset_scores()
+
+        super().save(*args, **kwargs)
+        self._loaded_score_fingerprint = self.score_fingerprint
+
+        from backend.stats.cache import invalidate_team_entries
+        invalidate_team_entries(self.tenant_id)
+
+        # 新規の計算待ちエントリーは集計対象外のため、集計行の再計算は不要
+        if not (adding and self.score_status == ScoreStatus.PENDING):
+            self._refresh_rollup()
+
+        if rescore and self.score_status == ScoreStatus.PENDING:
+            # トランザクション確定後にキューへ投入（未確定の行をワーカーが読まないように）
+            from backend.scoring.queue import enqueue_scoring
+            transaction.on_commit(partial(enqueue_scoring, self.pk))
+
+    def needs_scoring(self):
+        """
+        保存時にAIスコアを(再)計算する必要があるか
+
+        新規作成、読み込み時から質問・回答が変わった場合、またはスコアが欠けている
+        （計算に失敗した、計算待ちでないのに値がない）場合に True を返す。
+        """
+        if self._state.adding:
+            return True
+        if getattr(self, '_loaded_score_fingerprint', None) != self.score_fingerprint:
+            return True
+        if self.score_status in RESCORE_STATUSES:
+            return True
+        return self.score_status != ScoreStatus.PENDING and (
+            self.stress_score is None or self.motivation_score is None
+        )
+
+    @classmethod
+    def bulk_upsert(cls, entries, batch_size=None):
+        """
+        複数エントリーを INSERT ... ON CONFLICT DO UPDATE で保存する
+
+        (tenant, user, team, reported_at) が既存のエントリーと重複する場合は上書きする。
+        既存エントリーと質問・回答のフィンガープリントが同じ場合はスコアを引き継ぎ、
+        AIスコアを再計算しない（失敗したスコアは再計算する）。
+
+        bulk_create は save() を経由しないため、save() と同じスコアの初期化・
+        チーム日次集計の再計算・レスポンスキャッシュの無効化をまとめて行い、
+        計算待ちのエントリーはコミット後に一括でキューへ投入する。
+
+        Args:
+            entries (list[Entry]): 保存するエントリー（自然キーが互いに重複しないこと）
+            batch_size (int|None): 1回の INSERT 文に含める件数
+
+        Returns:
+            list[tuple[bool, bool]]: エントリーごとの (新規作成したか, スコアを再計算するか)
+        """
+        if not entries:
+            return []
+
+        natural_keys = [entry.natural_key for entry in entries]
+        # 自然キーの各列で絞り込んだ候補（実際の組の一致は Python 側で判定する）
+        candidates = cls.objects.filter(
+            tenant_id__in={key[0] for key in natural_keys},
+            user_id__in={key[1] for key in natural_keys},
+            team_id__in={key[2] for key in natural_keys},
+            reported_at__in={key[3] for key in natural_keys},
+        )
+        existing = {}
+        for *key, questions, answers, stress_score, motivation_score, score_status in candidates.values_list(
+            'tenant_id', 'user_id', 'team_id', 'reported_at',
+            'questions', 'answers', 'stress_score', 'motivation_score', 'score_status',
+        ):
+            existing[tuple(key)] = (
+                score_fingerprint(questions, answers),
+                (stress_score, motivation_score, score_status),
+            )
+
+        from backend.scoring.policy import get_scoring_policies
+        policies = get_scoring_policies(key[0] for key in natural_keys)
+
+        outcomes, rescored, unchanged = [], [], []
+        for entry, key in zip(entries, natural_keys):
+            previous = existing.get(key)
+            if (
+                previous is not None
+                and previous[0] == entry.score_fingerprint
+                and previous[1][2] not in RESCORE_STATUSES
+            ):
+                entry.stress_score, entry.motivation_score, entry.score_status = previous[1]
+                unchanged.append(entry)
+                outcomes.append((False, False))
             else:
-                # answersがない場合はデフォルト値を設定
-                self.stress_score = 0
-                self.motivation_score = 0
-        except (ClientError, json.JSONDecodeError, KeyError) as e:
-            # AI計算失敗時はログ出力してデフォルト値を設定
-            logger = logging.getLogger(__name__)
-            logger.error(f"AI score calculation failed: {type(e).__name__}: {e}")
-            self.stress_score = 0
-            self.motivation_score = 0
-        except Exception as e:
-            # 予期しないエラーは重要度を上げてログ
-            logger = logging.getLogger(__name__)
-            logger.critical(f"Unexpected error in AI calculation: {e}")
+                entry._reset_scores(policies[entry.tenant_id])
+                rescored.append(entry)
+                outcomes.append((previous is None, True))
+
+        upsert = partial(
+            cls.objects.bulk_create,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['tenant', 'user', 'team', 'reported_at'],
+        )
+        with transaction.atomic():
+            if rescored:
+                upsert(rescored, update_fields=[
+                    'questions', 'answers', 'stress_score', 'motivation_score', 'score_status',
+                ])
+            if unchanged:
+                upsert(unchanged, update_fields=['questions', 'answers'])
+            if any(entry.pk is None for entry in entries):
+                # 挿入行のIDを返せないデータベースでは自然キーで引き直す
+                ids = {
+                    tuple(key): pk for pk, *key in candidates.values_list(
+                        'pk', 'tenant_id', 'user_id', 'team_id', 'reported_at'
+                    )
+                }
+                for entry in entries:
+                    entry.pk = ids.get(entry.natural_key)
+
+            from backend.stats.cache import invalidate_for_rollup_keys
+            from backend.stats.rollup import refresh_for_keys
+
+            # スコアを引き継いだエントリーと新規の計算待ちエントリーは集計行に影響しない
+            refresh_for_keys(
+                entry.rollup_key for entry, (created, rescore) in zip(entries, outcomes)
+                if rescore and not (created and entry.score_status == ScoreStatus.PENDING)
+            )
+            invalidate_for_rollup_keys({entry.rollup_key for entry in entries})
+
+            pending_ids = [entry.pk for entry in rescored if entry.score_status == ScoreStatus.PENDING]
+            if pending_ids:
+                from backend.scoring.queue import enqueue_scoring_many
+                transaction.on_commit(partial(enqueue_scoring_many, pending_ids))
+
+        for entry in entries:
+            entry._state.adding = False
+            entry._loaded_rollup_key = entry.rollup_key
+        return outcomes
+
+    @property
+    def natural_key(self):
+        """1日1エントリーの制約を構成する (tenant_id, user_id, team_id, reported_at)"""
+        return (self.tenant_id, self.user_id, self.team_id, self.reported_at)
+
+    @property
+    def score_fingerprint(self):
+        """AIスコアの入力（質問・回答）のフィンガープリント"""
+        return score_fingerprint(self.questions, self.answers)
+
+    def delete(self, *args, **kwargs):
+        rollup_keys = self._rollup_keys()
+        result = super().delete(*args, **kwargs)
+        
+        from backend.stats.cache import invalidate_for_rollup_keys
+        from backend.stats.rollup import refresh_for_keys
+        invalidate_for_rollup_keys(refresh_for_keys(rollup_keys))
+        return result
+
+    def _reset_scores(self, policy=None):
+        """
+        保存前にスコアを初期化する
+
+        AI計算はバックグラウンドのスコア計算キューに委譲し、保存を即時に完了させる。
+        テナントの主スコアラーがローカルスコアラーの場合はその場で確定し、
+        provisional が有効な場合はLLMの計算待ちの間の仮の値を設定する。
+
+        Args:
+            policy (dict|None): テナントのスコア計算の方針（省略時はテナントから読み込む）
+        """
+        if not self.answers:
+            # answersがない場合はデフォルト値を設定
             self.stress_score = 0
             self.motivation_score = 0
-        
-        super().save(*args, **kwargs)
-    
+            self.score_status = ScoreStatus.SCORED
+            return
+
+        from backend.scoring.lexicon import get_lexicon_scorer
+        from backend.scoring.policy import get_entry_scoring_policy
+
+        policy = policy or get_entry_scoring_policy(self)
+        if policy['scorer'] == 'lexicon':
+            self._assign_scores(get_lexicon_scorer().score(self.questions, self.answers), ScoreStatus.SCORED)
+        elif policy['provisional']:
+            self._assign_scores(get_lexicon_scorer().score(self.questions, self.answers), ScoreStatus.PENDING)
+        else:
+            self.stress_score = None
+            self.motivation_score = None
+            self.score_status = ScoreStatus.PENDING
+
+    def _assign_scores(self, scores, status):
+        self.stress_score = int(scores.get('stress_score', 0))
+        self.motivation_score = int(scores.get('motivation_score', 0))
+        self.score_status = status
+
+    def _rollup_keys(self):
+        """現在と読み込み時の (tenant_id, team_id, reported_at) の組"""
+        keys = {self.rollup_key, getattr(self, '_loaded_rollup_key', self.rollup_key)}
+        return {key for key in keys if None not in key}
+
+    def _refresh_rollup(self):
+        """現在と読み込み時の (team, date) の集計行を再計算する"""
+        from backend.stats.rollup import refresh_for_keys
+
+        refresh_for_keys(self._rollup_keys())
+        self._loaded_rollup_key = self.rollup_key
+
     def calculate_scores(self):
         """
-        AWS Bedrockを使用してストレス度とモチベーション度を計算する
+        AIを使用してストレス度とモチベーション度を計算する
         
-        質問と回答のJSONデータをAmazon Nova Microモデルに送信し、
-        0-100のスケールでストレス度とモチベーション度を採点する。
+        質問と回答のJSONデータをプロセス共通のスコア計算クライアント
+        （既定: AWS Bedrock）に送信し、0-100のスケールで採点する。
         
         Returns:
             dict: 以下の形式の辞書
@@ -102,66 +357,29 @@ class Entry(models.Model):
             ClientError: AWS Bedrock API呼び出しエラー
             JSONDecodeError: レスポンスのJSONパースエラー
             KeyError: 必要なキーが存在しないエラー
+            CircuitOpenError: 連続失敗でサーキットブレーカーが開いており、呼び出しを行わなかった
             
         Note:
-            - リージョン: us-west-2
-            - モデル: us.amazon.nova-micro-v1:0
-            - エラー時はデフォルト値（0）を返す
+            - リージョン・モデル: settings.AWS_BEDROCK_REGION / AWS_BEDROCK_MODEL_ID
+            - クライアント: settings.AI_SCORING_CLIENT（テストではフェイクを注入可能）
+            - 同一の質問・回答・モデルの結果は settings.SCORE_CACHE でキャッシュされる
+            - エラーは呼び出し元（スコア計算ワーカー）に伝播し、リトライ判定に使われる
+            - キャッシュにない場合の呼び出しは settings.SCORING_CIRCUIT_BREAKER のブレーカーを通す
+            - テナントの domain_settings["scoring"]["scorer"] が "lexicon" の場合はローカルスコアラーを使う
         """
-        
-        import json
-
-        from boto3 import client
-        from botocore.exceptions import ClientError
-
-        bedrock_client = client("bedrock-runtime", region_name="us-west-2")
-        model_id = "us.amazon.nova-micro-v1:0"
-
-        extracted_questions = "\n".join([f"{k}: {v}" for k,v in self.questions.items()])
-        extracted_answers = "\n".join([f"{k}: {v}" for k,v in self.answers.items()])
+        from backend.scoring.breaker import get_circuit_breaker
+        from backend.scoring.cache import get_score_cache
+        from backend.scoring.policy import get_entry_scoring_policy, get_scorer
 
-        user_message = f"""
-以下の質問と回答から、ストレス度とモチベーション度をそれぞれ0-100で採点し、JSON形式で出力してください。説明不要です。
-- ストレス度: ストレスが高い場合は数値を高く採点する
-- モチベーション度: モチベーションが高い場合は数値を高く採点する
-- 各項目について「reason」は30字以内で簡潔に
-
-質問:
-{extracted_questions}
-
-回答:
-{extracted_answers}
-
-出力形式:
-{{"stress_score": 数値, "stress_reason": "ストレス説明", "motivation_score": 数値, "motivation_reason": "モチベーション説明"}}
-"""
-
-        conversation = [
-            {
-                "role": "user",
-                "content": [{"text": user_message}],
-            }
-        ]
-
-        try:
-            response = bedrock_client.converse(
-                modelId=model_id,
-                messages=conversation,
-                inferenceConfig={"maxTokens": 512, "temperature": 0, "topP": 0.9},
-            )
-
-            response_text = response["output"]["message"]["content"][0]["text"]
-            json_data = json.loads(response_text)
-            
-            return json_data
-
-        except (ClientError, Exception) as e:
-            logger = logging.getLogger(__name__)
-            logger.error(f"ERROR: Can't invoke '{model_id}'. Reason: {e}")
-            # デフォルト値を返す
-            return {
-                'stress_score': 0,
-                'motivation_score': 0,
-                'stress_reason': '計算エラー',
-                'motivation_reason': '計算エラー'
-            }
\ No newline at end of file
+        scorer = get_entry_scoring_policy(self)['scorer']
+        client = get_scorer(scorer)
+        if scorer == 'lexicon':
+            # ローカルスコアラーは外部呼び出しがないため、キャッシュ・ブレーカーを通さない
+            return client.score(self.questions, self.answers)
+        return get_score_cache().get_or_compute(
+            self.questions,
+            self.answers,
+            client.model_id,
+            lambda: get_circuit_breaker().call(lambda: client.score(self.questions, self.answers)),
+            prompt_version=client.prompt_version,
+        )
@@ -0,0 +1,29 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ScoreCacheEntry(models.Model):
+    """
+    AIスコア計算結果のキャッシュモデル
+
+    DatabaseScoreCache が使用する。質問・回答・モデルIDを正規化した
+    ハッシュをキーに、計算済みスコアを保持する。
+
+    Attributes:
+        key (CharField): キャッシュキー（SHA-256）
+        scores (JSONField): 計算済みスコア
+        expires_at (DateTimeField): 有効期限（NULLの場合は無期限）
+    """
+    key = models.CharField(max_length=64, unique=True)
+    scores = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'score_cache'
+        indexes = [
+            models.Index(fields=['expires_at'], name='score_cache_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"({self.id}){self.key}"
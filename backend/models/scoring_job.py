@@ -0,0 +1,50 @@
+from django.db import models
+from django.utils import timezone
+
+from .entry import Entry
+
+
+class ScoringJobStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    RUNNING = 'running', 'Running'
+    DONE = 'done', 'Done'
+    FAILED = 'failed', 'Failed'
+
+
+class ScoringJob(models.Model):
+    """
+    AIスコア計算ジョブモデル
+
+    データベースキュー（SCORING_QUEUE の BACKEND="backend.scoring.queue.DatabaseScoringQueue"）で使用する永続ジョブ。
+    process_scoring_jobs コマンドのワーカーが取得・実行し、失敗時は
+    next_attempt_at を指数バックオフで先送りして再実行する。
+
+    Attributes:
+        entry (ForeignKey): 対象エントリー
+        status (CharField): ジョブ状態 (pending / running / done / failed)
+        attempts (IntegerField): 実行回数
+        next_attempt_at (DateTimeField): 次回実行可能日時
+        last_error (TextField): 直近の失敗理由
+        claimed_at (DateTimeField): ワーカーが取得した日時（リースの起点）
+    """
+    entry = models.ForeignKey(Entry, on_delete=models.CASCADE, related_name='scoring_jobs')
+    status = models.CharField(
+        max_length=20,
+        choices=ScoringJobStatus.choices,
+        default=ScoringJobStatus.PENDING,
+    )
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'scoring_jobs'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='scoring_job_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"({self.id})entry={self.entry_id} {self.status}"
@@ -0,0 +1,50 @@
+from django.db import models
+
+from .team import Team
+from .tenant import Tenant
+
+
+class TeamDailyStats(models.Model):
+    """
+    チーム・日付別のスコア集計（ロールアップ）モデル
+
+    スコアが確定したエントリー（score_status が scored / estimated のもの。failed は含まない）を
+    (team, date) 単位で集計した結果を保持する。エントリーのスコア書き込み時に
+    backend.stats.rollup が該当日の行だけを再集計し、rebuild_team_daily_stats
+    コマンドで全体を再構築できる。
+
+    Attributes:
+        tenant (ForeignKey): 所属テナント（組織）
+        team (ForeignKey): 集計対象チーム
+        date (DateField): 集計日
+        count (IntegerField): 集計したエントリー数
+        stress_sum / motivation_sum (IntegerField): スコアの合計
+        stress_avg / motivation_avg (FloatField): スコアの平均
+        stress_min / stress_max (IntegerField): ストレス度の最小・最大
+        motivation_min / motivation_max (IntegerField): モチベーション度の最小・最大
+    """
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE)
+    date = models.DateField()
+    count = models.IntegerField(default=0)
+    stress_sum = models.IntegerField(default=0)
+    stress_avg = models.FloatField(default=0)
+    stress_min = models.IntegerField(default=0)
+    stress_max = models.IntegerField(default=0)
+    motivation_sum = models.IntegerField(default=0)
+    motivation_avg = models.FloatField(default=0)
+    motivation_min = models.IntegerField(default=0)
+    motivation_max = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'team_daily_stats'
+        constraints = [
+            models.UniqueConstraint(fields=['team', 'date'], name='unique_team_daily_stats'),
+        ]
+        indexes = [
+            models.Index(fields=['tenant', 'team', 'date'], name='team_stats_tenant_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"({self.id}){self.team_id} {self.date} n={self.count}"
@@ -6,6 +6,7 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.db import models
+from django.utils.functional import cached_property
 
 from .team import Team
 from .tenant import Tenant
@@ -67,4 +68,9 @@ class User(AbstractBaseUser, PermissionsMixin):
         ]
 
     def __str__(self):        
-        return f"({self.id}){self.name}"
\ No newline at end of file
+        return f"({self.id}){self.name}"
+
+    @cached_property
+    def managed_team_ids(self):
+        """管理するチームのID一覧（リクエスト中は1回だけ読み込む）"""
+        return list(self.managed_teams.values_list('id', flat=True))
\ No newline at end of file
@@ -0,0 +1,43 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+DEFAULT_API_PAGINATION = {
+    'PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 500,
+}
+
+
+def get_pagination_settings():
+    """settings.API_PAGINATION を既定値とマージして返す"""
+    return {**DEFAULT_API_PAGINATION, **getattr(settings, 'API_PAGINATION', {})}
+
+
+class ConfiguredCursorPagination(CursorPagination):
+    """
+    カーソル（キーセット）ページネーションの基底クラス
+
+    OFFSET を使わず直前ページの末尾の値を条件に次ページを読むため、
+    履歴が増えても各ページの応答時間が変わらない。カーソルは並び順の
+    値をエンコードしたもので、途中で行が追加されてもページがずれない。
+
+    Query Parameters:
+        - cursor: 前後のページを指すカーソル（レスポンスの next / previous に含まれる）
+        - page_size: 1ページの件数（最大 API_PAGINATION の MAX_PAGE_SIZE）
+    """
+    page_size_query_param = 'page_size'
+
+    def __init__(self):
+        # ビューのリクエストごとに生成されるため、設定の変更をその都度反映する
+        config = get_pagination_settings()
+        self.page_size = config['PAGE_SIZE']
+        self.max_page_size = config['MAX_PAGE_SIZE']
+
+
+class EntryCursorPagination(ConfiguredCursorPagination):
+    """エントリー一覧用（記録日の新しい順。entry_user_recent_idx を使う）"""
+    ordering = ('-reported_at', 'id')
+
+
+class IdCursorPagination(ConfiguredCursorPagination):
+    """ユーザー・チーム一覧用（ID順）"""
+    ordering = 'id'
@@ -14,13 +14,13 @@ class TenantBasePermission(BasePermission):
     def _check_url_tenant(self, request, view):
         """URLのテナントIDとユーザーのテナントIDを確認"""
         url_tenant_id = view.kwargs.get('tenants_pk')
-        if url_tenant_id and str(url_tenant_id) != str(request.user.tenant.id):
+        if url_tenant_id and str(url_tenant_id) != str(request.user.tenant_id):
             return False
         return True
     
     def _check_object_tenant(self, request, obj):
-        """オブジェクトのテナントとユーザーのテナントを確認"""
-        if hasattr(obj, 'tenant') and obj.tenant != request.user.tenant:
+        """オブジェクトのテナントとユーザーのテナントを確認（Tenant 行は読まずに ID で比較）"""
+        if hasattr(obj, 'tenant_id') and obj.tenant_id != request.user.tenant_id:
             return False
         return True
     
@@ -40,6 +40,20 @@ class IsAdminOrManager(TenantBasePermission):
         return request.user.role in [UserRole.SUPERUSER.value, UserRole.ADMIN.value, UserRole.MANAGER.value]
 
 
+class IsAdmin(TenantBasePermission):
+    """
+    管理者（SUPERUSER / ADMIN）のみアクセス可能
+    """
+    def has_permission(self, request, view):
+        if not self._is_authenticated_user(request):
+            return False
+        
+        if not self._check_url_tenant(request, view):
+            return False
+        
+        return request.user.role in [UserRole.SUPERUSER.value, UserRole.ADMIN.value]
+
+
 class IsOwnerOrAdmin(TenantBasePermission):
     """
     データの所有者または管理者のみアクセス可能（オブジェクトレベル権限）
@@ -59,12 +73,12 @@ class IsOwnerOrAdmin(TenantBasePermission):
             return True
         
         # データの所有者確認
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
+        if hasattr(obj, 'user_id'):
+            return obj.user_id == request.user.id
         
         # User オブジェクト自体の場合
         if hasattr(obj, 'email') and hasattr(obj, 'name'):
-            return obj == request.user
+            return obj.pk == request.user.id
         
         return False
 
@@ -0,0 +1,36 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """
+    コンパクト形式のJSONレンダラー
+
+    ?format=compact または Accept: application/vnd.wellboard.compact+json で選択される。
+    ビューは request.accepted_renderer の型でコンパクト形式が要求されたか判定し、
+    時系列データを列指向の配列で返す。
+    """
+    media_type = 'application/vnd.wellboard.compact+json'
+    format = 'compact'
+
+
+class CSVExportRenderer(JSONRenderer):
+    """
+    エクスポートAPIの CSV 形式の選択用レンダラー
+
+    ?format=csv または Accept: text/csv で選択される。本文はビューが
+    StreamingHttpResponse で直接書き出すため、このレンダラーが描画するのは
+    エラー応答（JSON）のみ。
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONExportRenderer(JSONRenderer):
+    """
+    エクスポートAPIの NDJSON（1行1オブジェクトの JSON）形式の選択用レンダラー
+
+    ?format=ndjson または Accept: application/x-ndjson で選択される。
+    CSVExportRenderer と同様にエラー応答の描画にのみ使われる。
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
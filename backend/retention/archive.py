@@ -0,0 +1,152 @@
+import datetime
+import heapq
+import logging
+
+from django.db import transaction
+from django.db.models.functions import TruncMonth
+
+from backend.models import ArchivedEntry, Entry
+from backend.models.archived_entry import ARCHIVED_ENTRY_FIELDS
+from backend.stats.cache import invalidate_team_entries
+
+logger = logging.getLogger(__name__)
+
+
+def _next_month(month):
+    return (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def archive_entries(tenant_id, cutoff, batch_size=1000, dry_run=False):
+    """
+    記録日が cutoff より前のエントリーを ArchivedEntry に移す
+
+    (team, 月) ごとに1トランザクションで ArchivedEntry を作成して元のエントリーを削除するため、
+    途中で中断しても二重に保存されたり失われたりしない。チーム日次集計（TeamDailyStats）は
+    削除せずに残すため、チーム集計（summary）は保持期間より前の期間も引き続き表示できる。
+
+    Args:
+        tenant_id (int): テナントID
+        cutoff (date): この日より前の記録日のエントリーを移す
+        batch_size (int): 読み込み・削除の単位件数
+        dry_run (bool): True の場合は件数を数えるだけで移さない
+
+    Returns:
+        dict: entries（移したエントリー数）/ chunks（作成した ArchivedEntry 数）
+    """
+    entries = Entry.objects.filter(tenant_id=tenant_id, reported_at__lt=cutoff)
+    months = list(
+        entries.annotate(month=TruncMonth('reported_at'))
+        .values_list('team_id', 'month')
+        .distinct()
+        .order_by('team_id', 'month')
+    )
+    if dry_run:
+        return {'entries': entries.count(), 'chunks': len(months)}
+
+    archived = 0
+    for team_id, month in months:
+        archived += _archive_chunk(entries.filter(team_id=team_id), tenant_id, team_id, month, batch_size)
+    if archived:
+        invalidate_team_entries(tenant_id)
+    return {'entries': archived, 'chunks': len(months)}
+
+
+@transaction.atomic
+def _archive_chunk(entries, tenant_id, team_id, month, batch_size):
+    """1チーム・1か月分のエントリーを ArchivedEntry の1行にまとめて削除する"""
+    rows = list(
+        entries.filter(reported_at__gte=month, reported_at__lt=_next_month(month))
+        .order_by('reported_at', 'user_id', 'id')
+        .values(*ARCHIVED_ENTRY_FIELDS)
+        .iterator(chunk_size=batch_size)
+    )
+    if not rows:
+        return 0
+
+    ArchivedEntry.objects.create(
+        tenant_id=tenant_id,
+        team_id=team_id,
+        month=month,
+        date_from=rows[0]['reported_at'],
+        date_to=rows[-1]['reported_at'],
+        entry_count=len(rows),
+        payload=ArchivedEntry.pack(rows),
+    )
+    # QuerySet.delete() は Entry.delete() を呼ばないため、チーム日次集計は再計算されずに残る
+    ids = [row['id'] for row in rows]
+    for start in range(0, len(ids), batch_size):
+        Entry.objects.filter(pk__in=ids[start:start + batch_size]).delete()
+    logger.info(f'Archived {len(rows)} entries (tenant={tenant_id}, team={team_id}, month={month:%Y-%m})')
+    return len(rows)
+
+
+def archived_days(tenant_id, keys):
+    """
+    (team_id, 記録日) の組のうち、アーカイブ済みの期間に含まれるものを返す
+
+    アーカイブ済みの (team, date) の集計行はアーカイブしたエントリーから作られているため、
+    その日のエントリーを新たに保存すると集計行とエクスポートが食い違う。書き込みAPIは
+    この関数で該当する日付を拒否する。
+
+    Args:
+        tenant_id (int): テナントID
+        keys (Iterable[tuple]): (team_id, reported_at) の組
+
+    Returns:
+        set[tuple]: アーカイブ済みの (team_id, reported_at) の組
+    """
+    keys = set(keys)
+    if not keys:
+        return set()
+    days = [day for _, day in keys]
+    ranges = list(
+        ArchivedEntry.objects.filter(tenant_id=tenant_id)
+        .covering(team_ids={team_id for team_id, _ in keys}, date_from=min(days), date_to=max(days))
+        .values_list('team_id', 'date_from', 'date_to')
+    )
+    return {
+        (team_id, day) for team_id, day in keys
+        if any(team_id == archived_team_id and date_from <= day <= date_to
+               for archived_team_id, date_from, date_to in ranges)
+    }
+
+
+def entry_history(tenant_id, team_ids=None, user_id=None, date_from=None, date_to=None, chunk_size=2000):
+    """
+    Entry とアーカイブを合わせたエントリーの履歴を記録日・ID順に返す
+
+    保持期間をまたぐ履歴の参照（エントリーのエクスポートなど）用。Entry は iterator で少しずつ読み、
+    アーカイブは1か月分ずつ展開して並べ替えてから両者をマージするため、メモリ使用量は
+    1か月分のアーカイブ程度に収まる。ダッシュボードのように直近の期間だけを読む処理では
+    Entry を直接使うこと。
+
+    読み取り先（レプリカ・default）は呼び出し時に決め、返したイテレーターを読み進める間も変えない。
+
+    Returns:
+        Iterator[dict]: ARCHIVED_ENTRY_FIELDS のキーを持つ辞書
+    """
+    using = Entry.objects.db
+    entries = Entry.objects.using(using).filter(tenant_id=tenant_id)
+    if team_ids is not None:
+        entries = entries.filter(team_id__in=team_ids)
+    if user_id is not None:
+        entries = entries.filter(user_id=user_id)
+    if date_from is not None:
+        entries = entries.filter(reported_at__gte=date_from)
+    if date_to is not None:
+        entries = entries.filter(reported_at__lte=date_to)
+    rows = entries.order_by('reported_at', 'id').values(*ARCHIVED_ENTRY_FIELDS).iterator(chunk_size=chunk_size)
+
+    chunks = ArchivedEntry.objects.using(using).filter(tenant_id=tenant_id)
+    archived = _archived_history(chunks, team_ids=team_ids, user_id=user_id, date_from=date_from, date_to=date_to)
+    return heapq.merge(archived, rows, key=_history_key)
+
+
+def _history_key(row):
+    return row['reported_at'], row['id']
+
+
+def _archived_history(chunks, **filters):
+    """アーカイブを1か月分ずつ展開し、記録日・ID順に返す"""
+    for month in chunks.covering(**filters).dates('month', 'month'):
+        yield from sorted(chunks.filter(month=month).entries(**filters), key=_history_key)
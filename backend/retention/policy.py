@@ -0,0 +1,63 @@
+import datetime
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENTRY_RETENTION = {
+    # 既定の保持日数（None はアーカイブしない）
+    'DAYS': None,
+    # ダッシュボードの既定の表示期間より短くしないための下限
+    'MIN_DAYS': 90,
+}
+
+
+def get_retention_settings():
+    """settings.ENTRY_RETENTION を既定値とマージして返す"""
+    return {**DEFAULT_ENTRY_RETENTION, **getattr(settings, 'ENTRY_RETENTION', {})}
+
+
+def build_retention_policy(domain_settings):
+    """
+    テナントの domain_settings からエントリーの保持期間を組み立てる
+
+    domain_settings["retention"] の値が settings.ENTRY_RETENTION の既定値を上書きする。
+
+        {"retention": {"days": 365}}
+
+    Args:
+        domain_settings (dict|None): Tenant.domain_settings
+
+    Returns:
+        dict:
+            - days (int|None): Entry に残す日数（None はアーカイブしない）
+    """
+    config = get_retention_settings()
+    tenant_config = (domain_settings or {}).get('retention') or {}
+
+    days = tenant_config.get('days', config['DAYS'])
+    if days is None:
+        return {'days': None}
+    if isinstance(days, bool) or not isinstance(days, int):
+        logger.warning(f"Invalid retention days {days!r} in tenant settings, using {config['DAYS']!r}")
+        days = config['DAYS']
+        if days is None:
+            return {'days': None}
+    if days < config['MIN_DAYS']:
+        logger.warning(f"Retention days {days} is shorter than the minimum, using {config['MIN_DAYS']}")
+        days = config['MIN_DAYS']
+    return {'days': days}
+
+
+def get_retention_cutoff(policy, today=None):
+    """
+    保持期間の境界日を返す（この日より前の記録日のエントリーがアーカイブ対象）
+
+    Returns:
+        date|None: 境界日（アーカイブしない場合 None）
+    """
+    if policy['days'] is None:
+        return None
+    today = today or datetime.date.today()
+    return today - datetime.timedelta(days=policy['days'])
@@ -0,0 +1,188 @@
+import json
+import logging
+
+from backend.models.entry import ScoreStatus
+from backend.scoring.cache import get_score_cache, make_score_cache_key
+from backend.scoring.client import SCORE_PROMPT_TEMPLATE, format_qa, get_scoring_client, template_digest
+
+logger = logging.getLogger(__name__)
+
+BATCH_PROMPT_TEMPLATE = """
+以下の{count}件の質問と回答について、それぞれストレス度とモチベーション度を0-100で採点し、JSON配列で出力してください。説明不要です。
+- ストレス度: ストレスが高い場合は数値を高く採点する
+- モチベーション度: モチベーションが高い場合は数値を高く採点する
+- 各要素の「index」には対応する [番号] を入れ、全{count}件を1件ずつ出力する
+
+{blocks}
+
+出力形式:
+[{{"index": 番号, "stress_score": 数値, "motivation_score": 数値}}, ...]
+"""
+
+BLOCK_TEMPLATE = """[{index}]
+質問:
+{questions}
+
+回答:
+{answers}
+"""
+
+
+# バッチ採点のプロンプトの版（1件ずつの採点へのフォールバックも含むため、通常の採点プロンプトも含める）
+BATCH_PROMPT_VERSION = template_digest(SCORE_PROMPT_TEMPLATE, BATCH_PROMPT_TEMPLATE, BLOCK_TEMPLATE)
+
+
+class BatchParseError(ValueError):
+    """バッチ応答のJSON配列を解釈できない場合のエラー"""
+
+
+def build_batch_prompt(entries):
+    """
+    複数エントリーの質問・回答を番号付きブロックにまとめたプロンプトを生成する
+
+    Args:
+        entries (list[Entry]): 採点対象のエントリー
+
+    Returns:
+        str: プロンプト
+    """
+    blocks = "\n".join(
+        BLOCK_TEMPLATE.format(
+            index=index,
+            questions=format_qa(entry.questions),
+            answers=format_qa(entry.answers),
+        )
+        for index, entry in enumerate(entries)
+    )
+    return BATCH_PROMPT_TEMPLATE.format(count=len(entries), blocks=blocks)
+
+
+def parse_batch_response(text, count):
+    """
+    バッチ応答のJSON配列を index 順のスコアリストに変換する
+
+    Args:
+        text (str): LLMの応答テキスト（コードブロックで囲まれていてもよい）
+        count (int): 期待する件数
+
+    Returns:
+        list[dict]: index 順のスコア
+
+    Raises:
+        BatchParseError: JSON配列として解釈できない、または件数・indexが一致しない場合
+    """
+    start, end = text.find('['), text.rfind(']')
+    if start == -1 or end < start:
+        raise BatchParseError('JSON array not found in response')
+    try:
+        items = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise BatchParseError(f'Invalid JSON array: {e}') from e
+
+    results = [None] * count
+    for item in items:
+        try:
+            index = int(item['index'])
+            scores = {
+                'stress_score': int(item['stress_score']),
+                'motivation_score': int(item['motivation_score']),
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            raise BatchParseError(f'Invalid item {item!r}: {e}') from e
+        if not 0 <= index < count or results[index] is not None:
+            raise BatchParseError(f'Unexpected index {index}')
+        results[index] = scores
+
+    if any(scores is None for scores in results):
+        raise BatchParseError(f'Expected {count} items, got {len(items)}')
+    return results
+
+
+class BatchScorer:
+    """
+    複数エントリーを1回のLLM呼び出しでまとめて採点するスコアラー
+
+    バックフィル・再計算向け。キャッシュ済みのエントリーはLLMに送らず、
+    応答のパースに失敗したバッチは1件ずつの呼び出しにフォールバックする。
+    採点結果はエントリーの属性に設定するだけで、保存は呼び出し元が行う。
+
+    Args:
+        client (BaseScoringClient|None): スコア計算クライアント（既定: プロセス共通）
+        cache (BaseScoreCache|None): スコアキャッシュ（既定: プロセス共通）
+        batch_size (int): 1回の呼び出しにまとめる最大件数
+        tokens_per_entry (int): 1件あたりに確保する出力トークン数
+    """
+    def __init__(self, client=None, cache=None, batch_size=20, tokens_per_entry=48):
+        self.client = client if client is not None else get_scoring_client()
+        self.cache = cache if cache is not None else get_score_cache()
+        self.batch_size = batch_size
+        self.tokens_per_entry = tokens_per_entry
+
+    def score_entries(self, entries):
+        """
+        エントリーを採点して stress_score / motivation_score / score_status を設定する
+
+        Args:
+            entries (Iterable[Entry]): 採点対象のエントリー（answers があるもの）
+
+        Returns:
+            list[Entry]: 採点に失敗したエントリー
+        """
+        pending = []
+        for entry in entries:
+            key = make_score_cache_key(entry.questions, entry.answers, self.client.model_id, BATCH_PROMPT_VERSION)
+            scores = self.cache.get(key)
+            if scores is not None:
+                self.cache.stats.incr('hits')
+                self._assign(entry, scores)
+            else:
+                self.cache.stats.incr('misses')
+                pending.append((entry, key))
+
+        failed = []
+        for start in range(0, len(pending), self.batch_size):
+            failed.extend(self._score_batch(pending[start:start + self.batch_size]))
+        return failed
+
+    def _score_batch(self, batch):
+        if len(batch) == 1:
+            # 1件だけのバッチは通常の採点プロンプトの方が安定する
+            return self._score_individually(batch)
+
+        entries = [entry for entry, _ in batch]
+        try:
+            text = self.client.complete(
+                build_batch_prompt(entries),
+                max_tokens=self.tokens_per_entry * len(entries) + 64,
+            )
+            results = parse_batch_response(text, len(entries))
+        except Exception as e:
+            logger.warning(
+                f"Batch scoring failed for {len(entries)} entries, falling back to per-entry calls: "
+                f"{type(e).__name__}: {e}"
+            )
+            return self._score_individually(batch)
+
+        for (entry, key), scores in zip(batch, results):
+            self.cache.set(key, scores)
+            self._assign(entry, scores)
+        return []
+
+    def _score_individually(self, batch):
+        failed = []
+        for entry, key in batch:
+            try:
+                scores = self.client.score(entry.questions, entry.answers)
+            except Exception as e:
+                logger.error(f"AI score calculation failed (entry={entry.pk}): {type(e).__name__}: {e}")
+                failed.append(entry)
+                continue
+            self.cache.set(key, scores)
+            self._assign(entry, scores)
+        return failed
+
+    @staticmethod
+    def _assign(entry, scores):
+        entry.stress_score = int(scores.get('stress_score', 0))
+        entry.motivation_score = int(scores.get('motivation_score', 0))
+        entry.score_status = ScoreStatus.SCORED
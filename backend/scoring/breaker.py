@@ -0,0 +1,208 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCORING_CIRCUIT_BREAKER = {
+    'ENABLED': True,
+    'FAILURE_THRESHOLD': 5,
+    'RESET_TIMEOUT': 30.0,
+}
+
+
+class CircuitState:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """
+    サーキットブレーカーが開いているため呼び出しを行わなかったことを示すエラー
+
+    Attributes:
+        retry_after (float): 再び呼び出しを試せるまでの秒数
+    """
+    def __init__(self, retry_after):
+        super().__init__(f'AI scoring circuit is open (retry after {retry_after:.1f}s)')
+        self.retry_after = retry_after
+
+
+class CircuitBreakerStats:
+    """状態遷移・呼び出し結果の回数（プロセス内カウンタ）"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.successes = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.opened = 0
+        self.half_opened = 0
+        self.closed = 0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self):
+        return {
+            'successes': self.successes,
+            'failures': self.failures,
+            'short_circuited': self.short_circuited,
+            'opened': self.opened,
+            'half_opened': self.half_opened,
+            'closed': self.closed,
+        }
+
+
+class CircuitBreaker:
+    """
+    AIスコア計算の呼び出しを保護するサーキットブレーカー
+
+    連続 failure_threshold 回の失敗で open になり、reset_timeout 秒の間は
+    呼び出しを行わずに CircuitOpenError を送出する。経過後は half_open になり、
+    1件だけ試行して成功すれば closed、失敗すれば再び open に戻る。
+
+    Args:
+        failure_threshold (int): open にする連続失敗回数
+        reset_timeout (float): open を維持する秒数
+        enabled (bool): False の場合は常に呼び出しを通す
+        clock (callable): 現在時刻（秒）を返す関数（テストでの差し替え用）
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, enabled=True, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.enabled = enabled
+        self.clock = clock
+        self.stats = CircuitBreakerStats()
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == CircuitState.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+            self.stats.incr('half_opened')
+            logger.info('AI scoring circuit half-open: allowing a trial call')
+        return self._state
+
+    def allow(self):
+        """
+        呼び出しの可否を判定する
+
+        Raises:
+            CircuitOpenError: open 中、または half_open で試行中の呼び出しがある場合
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return
+            if state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            retry_after = max(self.reset_timeout - (self.clock() - self._opened_at), 0.0)
+        self.stats.incr('short_circuited')
+        raise CircuitOpenError(retry_after)
+
+    def record_success(self):
+        if not self.enabled:
+            return
+        self.stats.incr('successes')
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state != CircuitState.CLOSED:
+                self._state = CircuitState.CLOSED
+                self._trial_in_flight = False
+                self.stats.incr('closed')
+                logger.info('AI scoring circuit closed')
+
+    def record_failure(self):
+        if not self.enabled:
+            return
+        self.stats.incr('failures')
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        if self._state != CircuitState.OPEN:
+            self.stats.incr('opened')
+            logger.warning(
+                f'AI scoring circuit opened after {self._consecutive_failures} consecutive failures; '
+                f'short-circuiting for {self.reset_timeout}s'
+            )
+        self._state = CircuitState.OPEN
+        self._opened_at = self.clock()
+        self._trial_in_flight = False
+
+    def call(self, func):
+        """
+        ブレーカーを通して func を呼び出す
+
+        Raises:
+            CircuitOpenError: open 中で呼び出しを行わなかった場合
+            Exception: func の例外はそのまま伝播する（失敗として記録される）
+        """
+        self.allow()
+        try:
+            result = func()
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def as_dict(self):
+        return {'state': self.state, **self.stats.as_dict()}
+
+
+_breaker = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker():
+    """
+    settings.SCORING_CIRCUIT_BREAKER に従ってプロセス共通のサーキットブレーカーを返す
+
+    Returns:
+        CircuitBreaker: サーキットブレーカー
+    """
+    global _breaker
+    if _breaker is None:
+        with _breaker_lock:
+            if _breaker is None:
+                config = {**DEFAULT_SCORING_CIRCUIT_BREAKER, **getattr(settings, 'SCORING_CIRCUIT_BREAKER', {})}
+                _breaker = CircuitBreaker(
+                    failure_threshold=config['FAILURE_THRESHOLD'],
+                    reset_timeout=config['RESET_TIMEOUT'],
+                    enabled=config['ENABLED'],
+                )
+    return _breaker
+
+
+def reset_circuit_breaker():
+    """サーキットブレーカーのインスタンスを破棄する（設定変更時・テスト用）"""
+    global _breaker
+    with _breaker_lock:
+        _breaker = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(setting, **kwargs):
+    if setting == 'SCORING_CIRCUIT_BREAKER':
+        reset_circuit_breaker()
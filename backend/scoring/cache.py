@@ -0,0 +1,333 @@
+import hashlib
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from backend.models import ScoreCacheEntry
+
+DEFAULT_SCORE_CACHE = {
+    'BACKEND': 'backend.scoring.cache.LocMemScoreCache',
+    'TIMEOUT': 60 * 60 * 24 * 30,
+    'MAX_ENTRIES': 10000,
+    'OPTIONS': {},
+}
+
+KEY_VERSION = 'v1'
+
+
+def _normalize(value):
+    """キャッシュキー用に値を正規化する（全角半角・前後空白・連続空白の揺れを吸収）"""
+    if isinstance(value, str):
+        return ' '.join(unicodedata.normalize('NFKC', value).split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_score_cache_key(questions, answers, model_id, prompt_version=''):
+    """
+    質問・回答・モデルID・プロンプトの版から安定したキャッシュキーを生成する
+
+    Args:
+        questions (dict|None): 質問
+        answers (dict|None): 回答
+        model_id (str): スコア計算に使うモデルID
+        prompt_version (str): 採点プロンプトの版（プロンプト変更後に古いスコアを返さないため）
+
+    Returns:
+        str: SHA-256 の16進文字列
+    """
+    payload = json.dumps(
+        [KEY_VERSION, model_id, prompt_version, _normalize(questions or {}), _normalize(answers or {})],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ScoreCacheStats:
+    """キャッシュのヒット・ミス・追い出し回数（プロセス内カウンタ）"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
+
+
+class BaseScoreCache:
+    """
+    AIスコアキャッシュの基底クラス
+
+    サブクラスは get() / set() / clear() を実装する。
+    temperature=0 の採点結果は決定的なので、同一の質問・回答は
+    キャッシュから返してBedrock呼び出しを省略できる。
+    """
+    def __init__(self, timeout=None, max_entries=None, **options):
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.stats = ScoreCacheStats()
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, scores):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get_or_compute(self, questions, answers, model_id, compute, prompt_version=''):
+        """
+        キャッシュ済みのスコアを返し、なければ compute() で計算して保存する
+
+        compute() が例外を送出した場合は何も保存しない。
+
+        Args:
+            questions (dict|None): 質問
+            answers (dict|None): 回答
+            model_id (str): モデルID
+            compute (callable): スコア計算関数
+            prompt_version (str): 採点プロンプトの版
+
+        Returns:
+            dict: スコア
+        """
+        key = make_score_cache_key(questions, answers, model_id, prompt_version)
+        scores = self.get(key)
+        if scores is not None:
+            self.stats.incr('hits')
+            return scores
+
+        self.stats.incr('misses')
+        scores = compute()
+        self.set(key, scores)
+        return scores
+
+
+class NullScoreCache(BaseScoreCache):
+    """何もキャッシュしない（キャッシュ無効化用）"""
+    def get(self, key):
+        return None
+
+    def set(self, key, scores):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LocMemScoreCache(BaseScoreCache):
+    """
+    プロセス内の LRU キャッシュ（TTL付き）
+
+    MAX_ENTRIES を超えると最も古く使われたエントリーから追い出す。
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            scores, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.stats.incr('evictions')
+                return None
+            self._data.move_to_end(key)
+            return scores
+
+    def set(self, key, scores):
+        expires_at = time.monotonic() + self.timeout if self.timeout else None
+        with self._lock:
+            self._data[key] = (scores, expires_at)
+            self._data.move_to_end(key)
+            while self.max_entries and len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats.incr('evictions')
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DjangoScoreCache(BaseScoreCache):
+    """
+    Django のキャッシュフレームワーク（settings.CACHES）を使うキャッシュ
+
+    追い出しは各キャッシュバックエンドの設定に従う。キーには世代番号を含め、
+    clear() は世代を進めることでこのキャッシュのキーだけを無効化する
+    （エイリアスを共有する他のキャッシュは消さない。古いキーは TIMEOUT で消える）。
+
+    Options:
+        ALIAS: 使用する CACHES のエイリアス（既定: default）
+        KEY_PREFIX: キープレフィックス（既定: score）
+    """
+    def __init__(self, *args, ALIAS='default', KEY_PREFIX='score', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.alias = ALIAS
+        self.key_prefix = KEY_PREFIX
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _generation_key(self):
+        return f"{self.key_prefix}:generation"
+
+    def _generation(self):
+        # 世代が追い出されていた場合は時刻ベースの値で作り直し、以前の世代のキーと衝突しないようにする
+        key = self._generation_key()
+        generation = self.cache.get(key)
+        if generation is None:
+            self.cache.add(key, time.time_ns(), timeout=None)
+            generation = self.cache.get(key)
+        return generation
+
+    def _key(self, key):
+        return f"{self.key_prefix}:{self._generation()}:{key}"
+
+    def get(self, key):
+        return self.cache.get(self._key(key))
+
+    def set(self, key, scores):
+        self.cache.set(self._key(key), scores, timeout=self.timeout)
+
+    def clear(self):
+        try:
+            self.cache.incr(self._generation_key())
+        except ValueError:
+            self.cache.add(self._generation_key(), time.time_ns(), timeout=None)
+
+
+class DatabaseScoreCache(BaseScoreCache):
+    """
+    ScoreCacheEntry テーブルを使う永続キャッシュ
+
+    プロセス・サーバー間でキャッシュを共有できる。CULL_EVERY 回の保存ごとに期限切れ行を削除し、
+    MAX_ENTRIES を超えた場合は古い順に削除する（件数の COUNT を保存のたびに実行しないため、
+    次の削除までは MAX_ENTRIES を一時的に超えうる）。取得時は期限切れ行を返さない。
+
+    Options:
+        CULL_EVERY: 削除処理を実行する保存回数の間隔（既定: 100）
+    """
+    def __init__(self, *args, CULL_EVERY=100, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cull_every = max(1, CULL_EVERY)
+        self._sets = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        entry = ScoreCacheEntry.objects.filter(key=key).values('scores', 'expires_at').first()
+        if entry is None:
+            return None
+        if entry['expires_at'] is not None and entry['expires_at'] <= timezone.now():
+            ScoreCacheEntry.objects.filter(key=key).delete()
+            self.stats.incr('evictions')
+            return None
+        return entry['scores']
+
+    def set(self, key, scores):
+        expires_at = timezone.now() + timedelta(seconds=self.timeout) if self.timeout else None
+        ScoreCacheEntry.objects.update_or_create(
+            key=key,
+            defaults={'scores': scores, 'created_at': timezone.now(), 'expires_at': expires_at},
+        )
+        with self._lock:
+            self._sets += 1
+            due = self._sets % self.cull_every == 0
+        if due:
+            self.cull()
+
+    def cull(self):
+        """期限切れ行と MAX_ENTRIES を超えた古い行を削除する"""
+        deleted, _ = ScoreCacheEntry.objects.filter(
+            Q(expires_at__isnull=False) & Q(expires_at__lte=timezone.now())
+        ).delete()
+        if self.max_entries:
+            overflow = ScoreCacheEntry.objects.count() - self.max_entries
+            if overflow > 0:
+                oldest_ids = list(
+                    ScoreCacheEntry.objects.order_by('created_at', 'id').values_list('id', flat=True)[:overflow]
+                )
+                deleted += ScoreCacheEntry.objects.filter(id__in=oldest_ids).delete()[0]
+        if deleted:
+            self.stats.incr('evictions', deleted)
+
+    def clear(self):
+        ScoreCacheEntry.objects.all().delete()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_score_cache():
+    """
+    settings.SCORE_CACHE に従ってプロセス共通のスコアキャッシュを返す
+
+    Returns:
+        BaseScoreCache: スコアキャッシュ
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = {**DEFAULT_SCORE_CACHE, **getattr(settings, 'SCORE_CACHE', {})}
+                cache_class = import_string(config['BACKEND'])
+                _cache = cache_class(
+                    timeout=config['TIMEOUT'],
+                    max_entries=config['MAX_ENTRIES'],
+                    **config['OPTIONS'],
+                )
+    return _cache
+
+
+def reset_score_cache():
+    """スコアキャッシュのインスタンスを破棄する（設定変更時・テスト用）"""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(setting, **kwargs):
+    if setting == 'SCORE_CACHE':
+        reset_score_cache()
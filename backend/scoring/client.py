@@ -0,0 +1,224 @@
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+DEFAULT_SCORING_CLIENT = 'backend.scoring.client.BedrockScoringClient'
+
+SCORE_PROMPT_TEMPLATE = """
+以下の質問と回答から、ストレス度とモチベーション度をそれぞれ0-100で採点し、JSON形式で出力してください。説明不要です。
+- ストレス度: ストレスが高い場合は数値を高く採点する
+- モチベーション度: モチベーションが高い場合は数値を高く採点する
+- 各項目について「reason」は30字以内で簡潔に
+
+質問:
+{questions}
+
+回答:
+{answers}
+
+出力形式:
+{{"stress_score": 数値, "stress_reason": "ストレス説明", "motivation_score": 数値, "motivation_reason": "モチベーション説明"}}
+"""
+
+
+def template_digest(*templates):
+    """プロンプトのテンプレートから短いハッシュを生成する（スコアキャッシュのキーに含める版として使う）"""
+    return hashlib.sha256(''.join(templates).encode('utf-8')).hexdigest()[:16]
+
+
+def format_qa(data):
+    """質問・回答の辞書を "key: value" 形式の行に変換する"""
+    return "\n".join([f"{k}: {v}" for k, v in (data or {}).items()])
+
+
+def build_score_prompt(questions, answers):
+    """エントリー1件分の採点プロンプトを生成する"""
+    return SCORE_PROMPT_TEMPLATE.format(
+        questions=format_qa(questions),
+        answers=format_qa(answers),
+    )
+
+
+class BaseScoringClient:
+    """
+    AIスコア計算クライアントの基底クラス
+
+    サブクラスは complete() でLLMへの問い合わせを実装する。
+    score() はプロンプト生成とJSONパースを共通で行う（スコアラーのインターフェース
+    backend.scoring.scorer.Scorer を満たす）。
+    """
+    model_id = None
+    # 採点プロンプトの版。テンプレートを変更するとキャッシュキーが変わり、以前のスコアを返さなくなる
+    prompt_version = template_digest(SCORE_PROMPT_TEMPLATE)
+
+    def complete(self, user_message, max_tokens=512):
+        """
+        ユーザーメッセージをLLMに送信し、応答テキストを返す
+
+        Args:
+            user_message (str): 送信するプロンプト
+            max_tokens (int): 最大出力トークン数
+
+        Returns:
+            str: 応答テキスト
+        """
+        raise NotImplementedError
+
+    def score(self, questions, answers):
+        """
+        質問と回答からストレス度・モチベーション度を採点する
+
+        Returns:
+            dict: stress_score / motivation_score / stress_reason / motivation_reason
+
+        Raises:
+            JSONDecodeError: レスポンスのJSONパースエラー
+        """
+        return json.loads(self.complete(build_score_prompt(questions, answers)))
+
+
+class BedrockScoringClient(BaseScoringClient):
+    """
+    AWS Bedrock (converse API) を使うスコア計算クライアント
+
+    boto3 クライアントは初回呼び出し時に1度だけ生成し、プロセス内で共有する。
+    boto3 のクライアントはスレッドセーフなので、ワーカースレッド間で
+    HTTPコネクションプールを使い回せる。
+
+    Settings:
+        AWS_BEDROCK_REGION: Bedrock のリージョン
+        AWS_BEDROCK_MODEL_ID: 使用するモデルID
+        AWS_BEDROCK_MAX_POOL_CONNECTIONS: HTTPコネクションプールの上限
+        AWS_BEDROCK_CONNECT_TIMEOUT: 接続タイムアウト（秒）
+        AWS_BEDROCK_READ_TIMEOUT: 応答の読み取りタイムアウト（秒）
+        AWS_BEDROCK_MAX_ATTEMPTS: boto3 内部の試行回数（スコア計算キューのリトライとは別）
+    """
+    def __init__(self, region=None, model_id=None, max_pool_connections=None,
+                 connect_timeout=None, read_timeout=None, max_attempts=None):
+        self.region = region or settings.AWS_BEDROCK_REGION
+        self.model_id = model_id or settings.AWS_BEDROCK_MODEL_ID
+        self.max_pool_connections = max_pool_connections or getattr(
+            settings, 'AWS_BEDROCK_MAX_POOL_CONNECTIONS', 10
+        )
+        self.connect_timeout = connect_timeout or getattr(settings, 'AWS_BEDROCK_CONNECT_TIMEOUT', 3)
+        self.read_timeout = read_timeout or getattr(settings, 'AWS_BEDROCK_READ_TIMEOUT', 15)
+        self.max_attempts = max_attempts or getattr(settings, 'AWS_BEDROCK_MAX_ATTEMPTS', 2)
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _build_client_config(self):
+        from botocore.config import Config
+
+        # boto3 の既定（読み取り60秒・最大5回の試行）では障害時に1件で数分待ちうるため、上限を設ける
+        return Config(
+            max_pool_connections=self.max_pool_connections,
+            tcp_keepalive=True,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            retries={'max_attempts': self.max_attempts, 'mode': 'standard'},
+        )
+
+    @property
+    def client(self):
+        """遅延生成した bedrock-runtime クライアント"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    # Session はスレッドセーフではないため、クライアント生成はロック内で行う
+                    from boto3.session import Session
+
+                    self._client = Session().client(
+                        'bedrock-runtime',
+                        region_name=self.region,
+                        config=self._build_client_config(),
+                    )
+        return self._client
+
+    def complete(self, user_message, max_tokens=512):
+        response = self.client.converse(
+            modelId=self.model_id,
+            messages=[
+                {
+                    "role": "user",
+                    "content": [{"text": user_message}],
+                }
+            ],
+            inferenceConfig={"maxTokens": max_tokens, "temperature": 0, "topP": 0.9},
+        )
+        return response["output"]["message"]["content"][0]["text"]
+
+
+class FakeScoringClient(BaseScoringClient):
+    """
+    テスト用のスコア計算クライアント
+
+    外部APIを呼び出さず、固定スコアまたは responder の戻り値を返す。
+    送信されたプロンプトは calls に記録される。
+    """
+    model_id = 'fake'
+
+    def __init__(self, scores=None, responder=None):
+        self.scores = scores or {
+            'stress_score': 50,
+            'motivation_score': 50,
+            'stress_reason': 'fake',
+            'motivation_reason': 'fake',
+        }
+        self.responder = responder
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def complete(self, user_message, max_tokens=512):
+        with self._lock:
+            self.calls.append(user_message)
+        if self.responder is not None:
+            return self.responder(user_message)
+        return json.dumps(self.scores, ensure_ascii=False)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_scoring_client():
+    """
+    プロセス共通のスコア計算クライアントを返す
+
+    settings.AI_SCORING_CLIENT（ドット区切りのクラスパス）から初回のみ生成する。
+
+    Returns:
+        BaseScoringClient: スコア計算クライアント
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                client_class = import_string(getattr(settings, 'AI_SCORING_CLIENT', DEFAULT_SCORING_CLIENT))
+                _client = client_class()
+    return _client
+
+
+def set_scoring_client(client):
+    """スコア計算クライアントを差し替える（テストでのフェイク注入用）"""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def reset_scoring_client():
+    """スコア計算クライアントを破棄し、次回呼び出し時に設定から再生成させる"""
+    set_scoring_client(None)
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(setting, **kwargs):
+    if setting in (
+        'AI_SCORING_CLIENT', 'AWS_BEDROCK_REGION', 'AWS_BEDROCK_MODEL_ID',
+        'AWS_BEDROCK_CONNECT_TIMEOUT', 'AWS_BEDROCK_READ_TIMEOUT', 'AWS_BEDROCK_MAX_ATTEMPTS',
+    ):
+        reset_scoring_client()
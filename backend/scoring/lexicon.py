@@ -0,0 +1,124 @@
+import re
+import threading
+import unicodedata
+
+# 語句と (ストレス度, モチベーション度) への加点。長い語句が優先して一致するため、
+# 「やる気が出ない」「眠れない」のような否定形は短い語句（やる気・眠れ）より先に評価される。
+LEXICON = {
+    # ストレスを示す語
+    'ストレス': (20, -5),
+    '疲れ': (15, -10),
+    'しんどい': (20, -10),
+    'つらい': (20, -10),
+    '辛い': (20, -10),
+    'きつい': (15, -5),
+    '忙しい': (10, 0),
+    '不安': (15, -5),
+    '心配': (10, 0),
+    'イライラ': (20, -5),
+    '焦': (10, 0),
+    '憂鬱': (20, -15),
+    '限界': (25, -15),
+    '眠れない': (15, -5),
+    '寝不足': (15, -5),
+    '残業': (10, -5),
+    '締め切り': (10, 0),
+    '大変': (10, 0),
+    '困': (10, -5),
+    '休みたい': (15, -10),
+    '体調不良': (15, -10),
+    # ストレスが低いことを示す語
+    '余裕': (-15, 5),
+    '落ち着': (-10, 0),
+    'リラックス': (-15, 5),
+    '休めた': (-15, 5),
+    '問題ない': (-10, 0),
+    '問題なし': (-10, 0),
+    '順調': (-10, 10),
+    '元気': (-10, 10),
+    # モチベーションを示す語
+    'やる気': (0, 20),
+    '意欲': (0, 20),
+    '楽しい': (-5, 20),
+    '楽しかった': (-5, 20),
+    '嬉しい': (-5, 15),
+    '充実': (-5, 20),
+    '達成': (-5, 15),
+    '成長': (0, 15),
+    '挑戦': (0, 15),
+    '前向き': (-5, 20),
+    '頑張': (0, 15),
+    '好調': (-5, 15),
+    '絶好調': (-10, 25),
+    '感謝': (-5, 10),
+    # モチベーションが低いことを示す語
+    'やる気が出ない': (5, -25),
+    'やる気がない': (5, -25),
+    '楽しくない': (5, -20),
+    'つまらない': (5, -20),
+    '退屈': (0, -15),
+    '億劫': (5, -15),
+    '辞めたい': (15, -30),
+    '無理': (15, -15),
+}
+
+BASE_SCORE = 50
+
+
+def _clamp(value):
+    return max(0, min(100, value))
+
+
+class LexiconScoringClient:
+    """
+    語句辞書による軽量なローカルスコアラー
+
+    回答文に含まれる語句の加点を基準値(50)に足し合わせてストレス度・モチベーション度を
+    推定する。外部APIを呼び出さず数十マイクロ秒で返るため、LLMのスコアが確定するまでの
+    仮の値、LLM障害時のフォールバック、テナント単位の主スコアラーとして使う。
+    LLMのクライアントではないため、プロンプトによる問い合わせ（complete()）は持たず、
+    スコアラーのインターフェース（backend.scoring.scorer.Scorer）の score() だけを実装する。
+
+    Args:
+        lexicon (dict|None): 語句と (ストレス度, モチベーション度) の加点（既定: LEXICON）
+    """
+    model_id = 'lexicon-v1'
+
+    def __init__(self, lexicon=None):
+        self.lexicon = lexicon if lexicon is not None else LEXICON
+        # 長い語句から順に並べ、同じ位置では最長の語句が一致するようにする
+        terms = sorted(self.lexicon, key=len, reverse=True)
+        self._pattern = re.compile('|'.join(re.escape(term) for term in terms))
+
+    def score(self, questions, answers):
+        text = unicodedata.normalize('NFKC', ' '.join(str(value) for value in (answers or {}).values()))
+        stress = motivation = BASE_SCORE
+        matched = []
+        for match in self._pattern.finditer(text):
+            term = match.group()
+            stress_delta, motivation_delta = self.lexicon[term]
+            stress += stress_delta
+            motivation += motivation_delta
+            matched.append(term)
+
+        reason = ('語句: ' + '、'.join(dict.fromkeys(matched)))[:30] if matched else '該当する語句なし'
+        return {
+            'stress_score': _clamp(stress),
+            'motivation_score': _clamp(motivation),
+            'stress_reason': reason,
+            'motivation_reason': reason,
+        }
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_lexicon_scorer():
+    """プロセス共通のローカルスコアラーを返す"""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = LexiconScoringClient()
+    return _scorer
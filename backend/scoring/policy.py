@@ -0,0 +1,89 @@
+import logging
+
+from django.conf import settings
+
+from backend.models import Tenant
+from backend.scoring.client import get_scoring_client
+from backend.scoring.lexicon import get_lexicon_scorer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCORING_POLICY = {
+    'SCORER': 'llm',
+    'PROVISIONAL': False,
+    'FALLBACK': False,
+}
+
+# スコアラー名とプロセス共通のスコアラー（Scorer を満たすもの）を返す関数の対応
+SCORERS = {
+    'llm': get_scoring_client,
+    'lexicon': get_lexicon_scorer,
+}
+
+
+def build_scoring_policy(domain_settings):
+    """
+    テナントの domain_settings からスコア計算の方針を組み立てる
+
+    domain_settings["scoring"] の値が settings.SCORING_POLICY の既定値を上書きする。
+
+        {"scoring": {"scorer": "lexicon", "provisional": true, "fallback": true}}
+
+    Args:
+        domain_settings (dict|None): Tenant.domain_settings
+
+    Returns:
+        dict:
+            - scorer (str): 主スコアラー（"llm" / "lexicon"）
+            - provisional (bool): LLMの計算待ちの間、ローカルスコアを仮の値として保存するか
+            - fallback (bool): LLMの計算を諦めた場合にローカルスコアで確定するか
+    """
+    config = {**DEFAULT_SCORING_POLICY, **getattr(settings, 'SCORING_POLICY', {})}
+    tenant_config = (domain_settings or {}).get('scoring') or {}
+
+    scorer = tenant_config.get('scorer', config['SCORER'])
+    if scorer not in SCORERS:
+        logger.warning(f"Unknown scorer {scorer!r} in tenant settings, using {config['SCORER']!r}")
+        scorer = config['SCORER']
+    return {
+        'scorer': scorer,
+        'provisional': bool(tenant_config.get('provisional', config['PROVISIONAL'])),
+        'fallback': bool(tenant_config.get('fallback', config['FALLBACK'])),
+    }
+
+
+def get_scoring_policies(tenant_ids):
+    """
+    テナントごとのスコア計算の方針をまとめて読み込む
+
+    Returns:
+        dict[int, dict]: テナントIDと build_scoring_policy() の結果
+    """
+    tenant_ids = set(tenant_ids)
+    policies = {
+        tenant_id: build_scoring_policy(domain_settings)
+        for tenant_id, domain_settings in Tenant.objects.filter(pk__in=tenant_ids).values_list('pk', 'domain_settings')
+    }
+    for tenant_id in tenant_ids - set(policies):
+        policies[tenant_id] = build_scoring_policy(None)
+    return policies
+
+
+def get_entry_scoring_policy(entry):
+    """エントリーのテナントのスコア計算の方針（読み込み済みの tenant があれば再利用する）"""
+    tenant = entry._state.fields_cache.get('tenant')
+    if tenant is not None:
+        return build_scoring_policy(tenant.domain_settings)
+    if entry.tenant_id is None:
+        return build_scoring_policy(None)
+    return get_scoring_policies([entry.tenant_id])[entry.tenant_id]
+
+
+def get_scorer(name):
+    """
+    スコアラー名に対応するプロセス共通のスコアラーを返す
+
+    Returns:
+        Scorer: score(questions, answers) を持つスコアラー（"llm" の場合は BaseScoringClient のサブクラス）
+    """
+    return SCORERS[name]()
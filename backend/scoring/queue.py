@@ -0,0 +1,380 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.db.models import F, Q
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from backend.models import ScoringJob
+from backend.models.scoring_job import ScoringJobStatus
+from backend.scoring.breaker import CircuitOpenError
+from backend.scoring.worker import (
+    backoff_delay,
+    mark_failed,
+    run_batch_scoring,
+    run_scoring,
+    run_scoring_with_retry,
+    score_pending_entries,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCORING_QUEUE = {
+    'BACKEND': 'backend.scoring.queue.ThreadScoringQueue',
+    'MAX_WORKERS': 4,
+    'MAX_RETRIES': 3,
+    'RETRY_BACKOFF': 1.0,
+    'BATCH_SIZE': 20,
+    'LEASE_TIMEOUT': 300,
+}
+
+
+class BaseScoringQueue:
+    """
+    AIスコア計算キューの基底クラス
+
+    Entry.save() から enqueue() でエントリーIDを受け取り、
+    各バックエンドがスコア計算の実行タイミングを決める。
+    一括登録からは enqueue_many() で複数のエントリーIDをまとめて受け取る。
+    """
+    def __init__(self, max_workers, max_retries, retry_backoff, batch_size=20, lease_timeout=300):
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.batch_size = batch_size
+        self.lease_timeout = lease_timeout
+
+    def enqueue(self, entry_id):
+        raise NotImplementedError
+
+    def enqueue_many(self, entry_ids):
+        for entry_id in entry_ids:
+            self.enqueue(entry_id)
+
+    def _batches(self, entry_ids):
+        entry_ids = list(entry_ids)
+        return [entry_ids[i:i + self.batch_size] for i in range(0, len(entry_ids), self.batch_size)]
+
+
+class SyncScoringQueue(BaseScoringQueue):
+    """
+    呼び出しスレッドで即時にスコア計算を実行するキュー（テスト・ローカル用）
+
+    サーキットブレーカーが開いている場合は計算せずに戻り、エントリーは "pending" のまま残る。
+    """
+    def enqueue(self, entry_id):
+        try:
+            run_scoring_with_retry(entry_id, self.max_retries, self.retry_backoff)
+        except CircuitOpenError as e:
+            logger.warning(f"Scoring skipped, entry left pending (entry={entry_id}): {e}")
+
+    def enqueue_many(self, entry_ids):
+        try:
+            for batch in self._batches(entry_ids):
+                run_batch_scoring(batch, self.max_retries, self.retry_backoff, self.batch_size)
+        except CircuitOpenError as e:
+            logger.warning(f"Scoring skipped, entries left pending: {e}")
+
+
+class ThreadScoringQueue(BaseScoringQueue):
+    """
+    プロセス内のスレッドプールでスコア計算を実行するキュー
+
+    同時実行数は MAX_WORKERS で制限され、リクエストスレッドは投入のみで戻る。
+    サーキットブレーカーが開いている間のエントリーは保留し、ブレーカーが
+    half_open になる時刻にまとめて再投入する。
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='scoring',
+        )
+        self._deferred = set()
+        self._deferred_lock = threading.Lock()
+        self._deferred_timer = None
+
+    def enqueue(self, entry_id):
+        self._executor.submit(self._run, entry_id)
+
+    def enqueue_many(self, entry_ids):
+        for batch in self._batches(entry_ids):
+            self._executor.submit(self._run_batch, batch)
+
+    def _run(self, entry_id):
+        try:
+            run_scoring_with_retry(entry_id, self.max_retries, self.retry_backoff)
+        except CircuitOpenError as e:
+            self._defer([entry_id], e.retry_after)
+        except Exception as e:
+            logger.critical(f"Unexpected error in scoring worker (entry={entry_id}): {e}")
+        finally:
+            # ワーカースレッドのDB接続を解放
+            close_old_connections()
+
+    def _run_batch(self, entry_ids):
+        try:
+            run_batch_scoring(entry_ids, self.max_retries, self.retry_backoff, self.batch_size)
+        except CircuitOpenError as e:
+            # バッチ内で採点済みのエントリーは再投入時に "pending" でないため読み飛ばされる
+            self._defer(entry_ids, e.retry_after)
+        except Exception as e:
+            logger.critical(f"Unexpected error in scoring worker (entries={len(entry_ids)}): {e}")
+        finally:
+            close_old_connections()
+
+    def _defer(self, entry_ids, delay):
+        """ブレーカーが開いている間のエントリーを保留し、delay 秒後にまとめて再投入する"""
+        with self._deferred_lock:
+            self._deferred.update(entry_ids)
+            if self._deferred_timer is None:
+                self._deferred_timer = threading.Timer(delay, self._flush_deferred)
+                self._deferred_timer.daemon = True
+                self._deferred_timer.start()
+
+    def _flush_deferred(self):
+        with self._deferred_lock:
+            entry_ids, self._deferred = sorted(self._deferred), set()
+            self._deferred_timer = None
+        if entry_ids:
+            self.enqueue_many(entry_ids)
+
+    def shutdown(self, wait=True):
+        with self._deferred_lock:
+            if self._deferred_timer is not None:
+                self._deferred_timer.cancel()
+                self._deferred_timer = None
+        self._executor.shutdown(wait=wait)
+
+
+class DatabaseScoringQueue(BaseScoringQueue):
+    """
+    ScoringJob テーブルを使う永続キュー
+
+    enqueue() はジョブ行を作成するだけで、実行は process_scoring_jobs
+    コマンドのワーカーが行う。プロセス再起動でもジョブが失われない。
+    取得した初回のジョブは BATCH_SIZE 件ずつ BatchScorer でまとめて採点し、
+    バッチで採点できなかったジョブと再試行のジョブは1件ずつ実行する。
+    取得したジョブには LEASE_TIMEOUT 秒のリース（claimed_at）を設定し、ワーカーの
+    異常終了などで running のまま期限を過ぎたジョブは別のワーカーが取得し直す。
+    """
+    def enqueue(self, entry_id):
+        ScoringJob.objects.create(entry_id=entry_id)
+
+    def enqueue_many(self, entry_ids):
+        ScoringJob.objects.bulk_create([ScoringJob(entry_id=entry_id) for entry_id in entry_ids])
+
+    def claim_due_jobs(self, limit):
+        """
+        実行可能なジョブを取得して running に遷移させる
+
+        実行時刻を過ぎた pending のジョブに加え、リースの期限が切れた running のジョブも
+        取得する。取得時の status / claimed_at を条件にした UPDATE で取得するため、
+        複数ワーカーが同時に動いても同じジョブを二重に実行しない。
+        期限切れのジョブは中断した前回の実行を試行回数に数える。
+        """
+        now = timezone.now()
+        lease_expired = Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - timedelta(seconds=self.lease_timeout))
+        candidates = ScoringJob.objects.filter(
+            Q(status=ScoringJobStatus.PENDING, next_attempt_at__lte=now)
+            | (Q(status=ScoringJobStatus.RUNNING) & lease_expired)
+        ).order_by('next_attempt_at', 'id').values_list('id', 'status', 'claimed_at')[:limit]
+
+        claimed = []
+        for job_id, status, claimed_at in candidates:
+            values = {'status': ScoringJobStatus.RUNNING, 'claimed_at': now}
+            if status == ScoringJobStatus.RUNNING:
+                values['attempts'] = F('attempts') + 1
+            updated = ScoringJob.objects.filter(
+                pk=job_id,
+                status=status,
+                claimed_at=claimed_at,
+            ).update(**values)
+            if updated:
+                if status == ScoringJobStatus.RUNNING:
+                    logger.warning(f"Scoring job {job_id} lease expired, reclaiming")
+                claimed.append(job_id)
+        return claimed
+
+    def run_job(self, job_id):
+        """
+        ジョブを1回実行し、失敗時はバックオフ付きで再スケジュールする
+
+        サーキットブレーカーが開いている場合は試行回数に数えず、
+        ブレーカーが half_open になる時刻に再スケジュールする。
+        """
+        job = ScoringJob.objects.get(pk=job_id)
+        if self._give_up_interrupted(job):
+            return job.status
+
+        job.attempts += 1
+        try:
+            run_scoring(job.entry_id)
+        except CircuitOpenError as e:
+            job.attempts -= 1
+            self._defer(job, e)
+        except Exception as e:
+            self._record_failure(job, f"{type(e).__name__}: {e}")
+        else:
+            job.status = ScoringJobStatus.DONE
+        job.save(update_fields=['attempts', 'status', 'next_attempt_at', 'last_error', 'updated_at'])
+        return job.status
+
+    def run_batch(self, job_ids):
+        """
+        初回のジョブを BatchScorer でまとめて実行する
+
+        再試行のジョブ（attempts > 0）は run_job() で1件ずつ実行する。バッチで採点できなかった
+        ジョブは1回の失敗として数え、バックオフ後に1件ずつ再試行する。サーキットブレーカーが
+        開いている場合は試行回数に数えず、ブレーカーが half_open になる時刻に再スケジュールする。
+
+        Args:
+            job_ids (list[int]): claim_due_jobs() で取得したジョブID
+
+        Returns:
+            list[str]: ジョブごとの実行後の status
+        """
+        jobs = list(ScoringJob.objects.filter(pk__in=job_ids).order_by('id'))
+        batch = [job for job in jobs if job.attempts == 0]
+        if len(batch) < 2:
+            return [self.run_job(job.pk) for job in jobs]
+
+        statuses = [self.run_job(job.pk) for job in jobs if job.attempts > 0]
+        try:
+            _, failed = score_pending_entries([job.entry_id for job in batch], self.batch_size)
+        except CircuitOpenError as e:
+            for job in batch:
+                self._defer(job, e)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            for job in batch:
+                job.attempts += 1
+                self._record_failure(job, error)
+        else:
+            for job in batch:
+                job.attempts += 1
+                if job.entry_id in failed:
+                    self._record_failure(job, 'batch scoring failed')
+                else:
+                    job.status = ScoringJobStatus.DONE
+        now = timezone.now()
+        for job in batch:
+            # bulk_update は auto_now を更新しないため明示的に設定する
+            job.updated_at = now
+        ScoringJob.objects.bulk_update(batch, ['attempts', 'status', 'next_attempt_at', 'last_error', 'updated_at'])
+        return statuses + [job.status for job in batch]
+
+    def _give_up_interrupted(self, job):
+        """実行中の中断（リース切れ）を繰り返して再試行上限を超えたジョブを失敗として確定する"""
+        if job.attempts <= self.max_retries:
+            return False
+        job.status = ScoringJobStatus.FAILED
+        job.last_error = job.last_error or 'lease expired'
+        mark_failed(job.entry_id)
+        logger.error(f"Scoring job {job.id} gave up after {job.attempts} interrupted attempts")
+        job.save(update_fields=['status', 'last_error', 'updated_at'])
+        return True
+
+    @staticmethod
+    def _defer(job, error):
+        """ブレーカーが開いている間のジョブを half_open になる時刻に再スケジュールする"""
+        job.status = ScoringJobStatus.PENDING
+        job.next_attempt_at = timezone.now() + timedelta(seconds=error.retry_after)
+
+    def _record_failure(self, job, error):
+        """失敗したジョブをバックオフ付きで再スケジュールし、再試行上限を超えた場合は確定する"""
+        job.last_error = error
+        if job.attempts > self.max_retries:
+            job.status = ScoringJobStatus.FAILED
+            mark_failed(job.entry_id)
+            logger.error(f"Scoring job {job.id} gave up: {job.last_error}")
+        else:
+            job.status = ScoringJobStatus.PENDING
+            job.next_attempt_at = timezone.now() + timedelta(
+                seconds=backoff_delay(job.attempts, self.retry_backoff)
+            )
+            logger.warning(f"Scoring job {job.id} failed (attempt={job.attempts}): {job.last_error}")
+
+    def drain(self, limit=None):
+        """
+        実行可能なジョブをスレッドプールで処理する
+
+        取得したジョブを BATCH_SIZE 件ずつに分け、バッチごとに run_batch() で実行する。
+
+        Args:
+            limit (int|None): 1回で取得する最大ジョブ数（Noneの場合 MAX_WORKERS × BATCH_SIZE）
+
+        Returns:
+            int: 処理したジョブ数
+        """
+        job_ids = self.claim_due_jobs(limit or self.max_workers * self.batch_size)
+        if not job_ids:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scoring') as executor:
+            wait([executor.submit(self._run_in_thread, batch) for batch in self._batches(job_ids)])
+        return len(job_ids)
+
+    def _run_in_thread(self, job_ids):
+        try:
+            return self.run_batch(job_ids)
+        finally:
+            close_old_connections()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_scoring_queue():
+    """
+    settings.SCORING_QUEUE に従ってプロセス共通のキューを返す
+
+    Returns:
+        BaseScoringQueue: 設定されたキューバックエンドのインスタンス
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                config = {**DEFAULT_SCORING_QUEUE, **getattr(settings, 'SCORING_QUEUE', {})}
+                queue_class = import_string(config['BACKEND'])
+                _queue = queue_class(
+                    max_workers=config['MAX_WORKERS'],
+                    max_retries=config['MAX_RETRIES'],
+                    retry_backoff=config['RETRY_BACKOFF'],
+                    batch_size=config['BATCH_SIZE'],
+                    lease_timeout=config['LEASE_TIMEOUT'],
+                )
+    return _queue
+
+
+def reset_scoring_queue():
+    """キューのインスタンスを破棄する（設定変更時・テスト用）"""
+    global _queue
+    with _queue_lock:
+        if isinstance(_queue, ThreadScoringQueue):
+            _queue.shutdown(wait=False)
+        _queue = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(setting, **kwargs):
+    if setting == 'SCORING_QUEUE':
+        reset_scoring_queue()
+
+
+def enqueue_scoring(entry_id):
+    """エントリーのスコア計算をキューに投入する"""
+    get_scoring_queue().enqueue(entry_id)
+
+
+def enqueue_scoring_many(entry_ids):
+    """複数エントリーのスコア計算をまとめてキューに投入する"""
+    get_scoring_queue().enqueue_many(entry_ids)
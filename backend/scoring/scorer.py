@@ -0,0 +1,23 @@
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class Scorer(Protocol):
+    """
+    スコア計算の方針（policy）が主スコアラーに求めるインターフェース
+
+    LLMのクライアント（BaseScoringClient のサブクラス）と語句辞書によるローカルスコアラー
+    （LexiconScoringClient）のどちらもこの形を満たす。プロンプトによる問い合わせ（complete()）は
+    LLMのクライアントだけが持つため、ここには含めない。
+    """
+    # スコアキャッシュのキー・ログに使うスコアラーの識別子
+    model_id: str
+
+    def score(self, questions, answers):
+        """
+        質問と回答からストレス度・モチベーション度を採点する
+
+        Returns:
+            dict: stress_score / motivation_score / stress_reason / motivation_reason
+        """
+        ...
@@ -0,0 +1,280 @@
+import logging
+import time
+
+from django.db import transaction
+
+from backend.models import Entry
+from backend.models.entry import ScoreStatus, score_fingerprint
+from backend.scoring.batch import BatchScorer
+from backend.scoring.breaker import CircuitOpenError, get_circuit_breaker
+from backend.scoring.lexicon import get_lexicon_scorer
+from backend.scoring.policy import get_entry_scoring_policy
+from backend.stats.cache import invalidate_for_rollup_keys
+from backend.stats.rollup import refresh_for_entries, refresh_for_keys
+
+logger = logging.getLogger(__name__)
+
+
+def apply_scores(entry, scores):
+    """
+    計算済みスコアをエントリーに書き戻す
+
+    save() を経由すると再度キュー投入されるため、UPDATE文で直接更新し、
+    チーム日次集計の再計算とレスポンスキャッシュの無効化を行う。
+    計算中にエントリーが再保存（質問・回答を変更）または確定された場合は、
+    古い回答のスコアで上書きしないよう書き込まない。
+
+    Args:
+        entry (Entry): スコアを計算したエントリー（計算に使った質問・回答を持つもの）
+        scores (dict): stress_score / motivation_score を含む辞書
+
+    Returns:
+        bool: 書き込んだ場合True
+    """
+    entry._assign_scores(scores, ScoreStatus.SCORED)
+    with transaction.atomic():
+        if not _unchanged_since_loaded([entry]):
+            return False
+        Entry.objects.filter(pk=entry.pk).update(
+            stress_score=entry.stress_score,
+            motivation_score=entry.motivation_score,
+            score_status=entry.score_status,
+        )
+    _after_scores_written(entry.pk)
+    return True
+
+
+def _unchanged_since_loaded(entries):
+    """
+    読み込み後に再保存・確定されていない（計算待ちのまま質問・回答が同じ）エントリーに絞り込む
+
+    呼び出し元のトランザクションの中で行をロックするため、書き込みまでの間に
+    再保存されることもない。ロックは値を変えない UPDATE で取る（SQLite では読み取りから
+    始めたトランザクションが後から書き込むと、他の書き込みのコミット後に失敗するため）。
+
+    Args:
+        entries (list[Entry]): スコアを計算したエントリー
+
+    Returns:
+        list[Entry]: スコアを書き込んでよいエントリー
+    """
+    fingerprints = {entry.pk: entry.score_fingerprint for entry in entries}
+    pending = Entry.objects.filter(pk__in=list(fingerprints), score_status=ScoreStatus.PENDING)
+    pending.update(score_status=ScoreStatus.PENDING)
+    current = pending.values_list('id', 'questions', 'answers')
+    unchanged = {pk for pk, questions, answers in current if score_fingerprint(questions, answers) == fingerprints[pk]}
+    for entry_id in fingerprints.keys() - unchanged:
+        logger.info(f"Discarding stale scores (entry={entry_id}): answers changed or scores finalized while scoring")
+    return [entry for entry in entries if entry.pk in unchanged]
+
+
+def mark_failed(entry_id):
+    """
+    リトライ上限に達したエントリーのスコアを確定する
+
+    テナントの fallback が有効な場合はローカルスコアラーの推定値（"estimated"）、
+    それ以外はデフォルト値(0)・"failed" で確定する。
+    """
+    entry = Entry.objects.select_related('tenant').filter(pk=entry_id).first()
+    if entry is not None and entry.answers and get_entry_scoring_policy(entry)['fallback']:
+        scores = get_lexicon_scorer().score(entry.questions, entry.answers)
+        values = {
+            'stress_score': scores['stress_score'],
+            'motivation_score': scores['motivation_score'],
+            'score_status': ScoreStatus.ESTIMATED,
+        }
+    else:
+        values = {'stress_score': 0, 'motivation_score': 0, 'score_status': ScoreStatus.FAILED}
+    Entry.objects.filter(pk=entry_id).update(**values)
+    _after_scores_written(entry_id)
+
+
+def _after_scores_written(entry_id):
+    """スコア書き込み後にチーム日次集計を再計算し、テナントのレスポンスキャッシュを無効化する"""
+    invalidate_for_rollup_keys(refresh_for_entries([entry_id]))
+
+
+def run_scoring(entry_id):
+    """
+    エントリー1件のスコア計算を1回だけ実行する
+
+    Args:
+        entry_id (int): エントリーID
+
+    Returns:
+        bool: 計算を実行した場合True（エントリーが削除済みの場合False）
+
+    Raises:
+        Exception: AI計算の失敗はそのまま呼び出し元に伝播する
+    """
+    entry = Entry.objects.select_related('tenant').filter(pk=entry_id).first()
+    if entry is None:
+        return False
+
+    scores = entry.calculate_scores()
+    apply_scores(entry, scores)
+    return True
+
+
+def backoff_delay(attempt, backoff):
+    """指数バックオフの待機秒数（attemptは1始まり）"""
+    return backoff * (2 ** (attempt - 1))
+
+
+def run_scoring_with_retry(entry_id, max_retries, backoff):
+    """
+    リトライ付きでスコア計算を実行する
+
+    失敗するたびに指数バックオフで待機し、max_retries 回の再試行後も
+    失敗した場合はエントリーを "failed" として確定する。
+    サーキットブレーカーが開いている場合は待機・確定せず、"pending" のまま
+    CircuitOpenError を呼び出し元（キュー）に伝播する。
+
+    Args:
+        entry_id (int): エントリーID
+        max_retries (int): 最大再試行回数
+        backoff (float): バックオフの基準秒数
+
+    Returns:
+        bool: スコア計算に成功した場合True
+
+    Raises:
+        CircuitOpenError: サーキットブレーカーが開いている場合
+    """
+    for attempt in range(1, max_retries + 2):
+        try:
+            return run_scoring(entry_id)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.warning(
+                f"AI score calculation failed (entry={entry_id}, attempt={attempt}): "
+                f"{type(e).__name__}: {e}"
+            )
+            if attempt > max_retries:
+                break
+            time.sleep(backoff_delay(attempt, backoff))
+
+    logger.error(f"AI score calculation gave up after {max_retries + 1} attempts (entry={entry_id})")
+    mark_failed(entry_id)
+    return False
+
+
+def run_batch_scoring(entry_ids, max_retries, backoff, batch_size=20):
+    """
+    複数エントリーのスコア計算を BatchScorer でまとめて実行する
+
+    一括登録のように同時に多数のエントリーが計算待ちになった場合に使う。
+    採点結果は bulk_update で書き戻し、該当する (team, date) の集計行を再計算する。
+    バッチで採点できなかったエントリーは1件ずつリトライ付きで計算する。
+    バッチの呼び出しもサーキットブレーカーを通し、開いている場合は "pending" のまま
+    CircuitOpenError を伝播する。
+
+    Args:
+        entry_ids (Iterable[int]): エントリーID
+        max_retries (int): 1件ずつの計算に切り替えた場合の最大再試行回数
+        backoff (float): バックオフの基準秒数
+        batch_size (int): 1回のAI呼び出しにまとめる件数
+
+    Returns:
+        int: バッチで採点できた件数
+
+    Raises:
+        CircuitOpenError: サーキットブレーカーが開いている場合
+    """
+    scored_count, failed = score_pending_entries(entry_ids, batch_size)
+    for entry_id in failed:
+        run_scoring_with_retry(entry_id, max_retries, backoff)
+    return scored_count
+
+
+def score_pending_entries(entry_ids, batch_size=20):
+    """
+    計算待ちのエントリーを BatchScorer でまとめて採点して書き戻す（リトライは呼び出し元が行う）
+
+    テナントの主スコアラーがローカルスコアラーのエントリーはLLMに送らずに採点する。
+    "pending" でないエントリー・回答のないエントリーは読み飛ばし、採点中に再保存された
+    エントリーには書き込まない（新しい回答の採点は再保存で投入されたジョブが行う）。
+
+    Args:
+        entry_ids (Iterable[int]): エントリーID
+        batch_size (int): 1回のAI呼び出しにまとめる件数
+
+    Returns:
+        tuple: (採点できた件数: int, 採点できなかったエントリーID: set[int])
+
+    Raises:
+        CircuitOpenError: サーキットブレーカーが開いている場合
+    """
+    entries = list(
+        Entry.objects.filter(pk__in=list(entry_ids), score_status=ScoreStatus.PENDING)
+        .select_related('tenant')
+        .only('id', 'tenant_id', 'team_id', 'reported_at', 'questions', 'answers', 'tenant__domain_settings')
+    )
+    scored, remote = score_locally([entry for entry in entries if entry.answers])
+
+    failed = set()
+    try:
+        if remote:
+            failed = score_batch_with_breaker(remote, batch_size)
+            scored.extend(entry for entry in remote if entry.pk not in failed)
+    finally:
+        # ブレーカーが開いていてもローカルで採点した分は書き戻す
+        if scored:
+            _write_scores(scored)
+    return len(scored), failed
+
+
+def _write_scores(entries):
+    """採点したエントリーのうち、計算中に再保存・確定されていないものだけを bulk_update で書き戻す"""
+    with transaction.atomic():
+        entries = _unchanged_since_loaded(entries)
+        if entries:
+            Entry.objects.bulk_update(entries, ['stress_score', 'motivation_score', 'score_status'])
+    if entries:
+        invalidate_for_rollup_keys(refresh_for_keys(entry.rollup_key for entry in entries))
+
+
+def score_locally(entries):
+    """
+    テナントの主スコアラーがローカルスコアラーのエントリーを採点する（LLMに送らない）
+
+    エントリーには読み込み済みの tenant（domain_settings）があることを想定している。
+
+    Returns:
+        tuple: (ローカルで採点したエントリー: list[Entry], LLMで採点するエントリー: list[Entry])
+    """
+    local, remote = [], []
+    for entry in entries:
+        if get_entry_scoring_policy(entry)['scorer'] == 'lexicon':
+            entry._assign_scores(get_lexicon_scorer().score(entry.questions, entry.answers), ScoreStatus.SCORED)
+            local.append(entry)
+        else:
+            remote.append(entry)
+    return local, remote
+
+
+def score_batch_with_breaker(entries, batch_size, cache=None):
+    """
+    BatchScorer をサーキットブレーカーを通して実行し、採点できなかったエントリーIDを返す
+
+    Args:
+        entries (list[Entry]): LLMで採点するエントリー
+        batch_size (int): 1回のAI呼び出しにまとめる件数
+        cache (BaseScoreCache|None): スコアキャッシュ（既定: プロセス共通）
+
+    Raises:
+        CircuitOpenError: サーキットブレーカーが開いている場合
+    """
+    breaker = get_circuit_breaker()
+    breaker.allow()
+    try:
+        failed = {entry.pk for entry in BatchScorer(cache=cache, batch_size=batch_size).score_entries(entries)}
+    except Exception:
+        breaker.record_failure()
+        raise
+    if len(failed) == len(entries):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return failed
@@ -0,0 +1,131 @@
+import csv
+import json
+
+# エクスポートの行の列（export_rows が返すタプルの順）
+EXPORT_COLUMNS = (
+    'id', 'reported_at', 'user_id', 'user__name', 'user__email', 'team_id', 'team__name',
+    'stress_score', 'motivation_score', 'score_status', 'questions', 'answers',
+)
+
+# 出力するエントリーの項目名（EXPORT_COLUMNS から questions / answers を除いたもの）
+ENTRY_FIELDS = (
+    'entry_id', 'reported_at', 'user_id', 'user_name', 'user_email', 'team_id', 'team_name',
+    'stress_score', 'motivation_score', 'score_status',
+)
+
+CSV_HEADER = (*ENTRY_FIELDS, 'question_key', 'question', 'answer')
+
+# 表計算ソフトが数式として解釈する先頭文字（CSVインジェクション対策でエスケープする）
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def export_rows(history, users, teams):
+    """
+    entry_history の辞書をエクスポートの行（EXPORT_COLUMNS の順のタプル）に変換する
+
+    アーカイブのエントリーは user / team を JOIN できないため、名前は事前に読み込んだ
+    辞書から引く。削除済みのユーザー・チームの名前は空にする。
+
+    Args:
+        history (Iterable[dict]): ARCHIVED_ENTRY_FIELDS のキーを持つ辞書
+        users (dict): user_id から (name, email) への辞書
+        teams (dict): team_id から name への辞書
+
+    Returns:
+        Iterator[tuple]: エクスポートの行
+    """
+    for row in history:
+        name, email = users.get(row['user_id'], ('', ''))
+        yield (
+            row['id'], row['reported_at'], row['user_id'], name, email, row['team_id'], teams.get(row['team_id'], ''),
+            row['stress_score'], row['motivation_score'], row['score_status'], row['questions'], row['answers'],
+        )
+
+
+class _Echo:
+    """csv.writer の書き込み先として、書き込まれた行をそのまま返す疑似バッファ"""
+    def write(self, value):
+        return value
+
+
+def _question_keys(questions, answers):
+    """質問・回答のキーを質問の定義順（回答のみのキーはその後）に並べる"""
+    return list(dict.fromkeys([*(questions or {}), *(answers or {})]))
+
+
+def _split(row):
+    values = dict(zip(ENTRY_FIELDS, row[:len(ENTRY_FIELDS)]))
+    values['reported_at'] = values['reported_at'].isoformat()
+    questions, answers = row[len(ENTRY_FIELDS):]
+    return values, _as_dict(questions), _as_dict(answers)
+
+
+def _as_dict(value):
+    return value if isinstance(value, dict) else {}
+
+
+def _escape_formula(value):
+    """数式として解釈される文字で始まる文字列の先頭に ' を付ける（数値はそのまま）"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(rows, bom=True):
+    """
+    export_rows の行を CSV の行に変換する
+
+    質問・回答は1問1行に展開する（縦持ち）。列をチームごとの質問数に依存させないため、
+    ヘッダーを出すために全件を先読みする必要がない。回答のないエントリーは質問の列を
+    空にした1行になる。=, +, -, @, タブ, CR で始まる文字列のセルは、表計算ソフトで
+    数式として実行されないよう先頭に ' を付ける。
+
+    Args:
+        rows (Iterable[tuple]): エントリーの行
+        bom (bool): 先頭に UTF-8 の BOM を付ける（Excel で文字化けさせないため）
+
+    Returns:
+        Iterator[str]: CSV の行
+    """
+    writer = csv.writer(_Echo())
+    yield ('\ufeff' if bom else '') + writer.writerow(CSV_HEADER)
+    for row in rows:
+        values, questions, answers = _split(row)
+        entry = [_escape_formula(values[field]) for field in ENTRY_FIELDS]
+        keys = _question_keys(questions, answers)
+        if not keys:
+            yield writer.writerow([*entry, '', '', ''])
+            continue
+        for key in keys:
+            cells = (key, questions.get(key, ''), answers.get(key, ''))
+            yield writer.writerow([*entry, *map(_escape_formula, cells)])
+
+
+def iter_ndjson(rows):
+    """
+    export_rows の行を NDJSON（1行1エントリー）に変換する
+
+    質問・回答は question_<キー> / answer_<キー> の項目に平坦化する。
+
+    Returns:
+        Iterator[str]: 改行で終わる JSON の行
+    """
+    for row in rows:
+        values, questions, answers = _split(row)
+        for key in _question_keys(questions, answers):
+            values[f'question_{key}'] = questions.get(key)
+            values[f'answer_{key}'] = answers.get(key)
+        yield json.dumps(values, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def buffered(chunks, size=64 * 1024):
+    """小さな文字列をまとめ、size 文字程度ごとに1つの文字列として返す（送信回数を減らすため）"""
+    buffer, length = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
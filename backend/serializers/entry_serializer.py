@@ -1,6 +1,12 @@
+import datetime
+
 from rest_framework import serializers
 
 from backend.models import Entry
+from backend.retention.archive import archived_days
+from backend.serializers.lean import LeanField, LeanNestedField, LeanSerializer
+
+ARCHIVED_DAY_ERROR = 'アーカイブ済みの日付のエントリーは登録・変更できません。'
 
 
 class EntrySerializer(serializers.ModelSerializer):
@@ -9,7 +15,15 @@ class EntrySerializer(serializers.ModelSerializer):
     class Meta:
         model = Entry
         fields = '__all__'
-        read_only_fields = ('tenant', 'user', 'stress_score', 'motivation_score')
+        read_only_fields = ('tenant', 'user', 'stress_score', 'motivation_score', 'score_status')
+
+    def validate(self, attrs):
+        # アーカイブ済みのチーム・記録日のエントリーは作成・変更しない（集計行とアーカイブが食い違うため）
+        team = attrs.get('team', getattr(self.instance, 'team', None))
+        reported_at = attrs.get('reported_at', getattr(self.instance, 'reported_at', None))
+        if team is not None and reported_at is not None and archived_days(team.tenant_id, [(team.pk, reported_at)]):
+            raise serializers.ValidationError({'reported_at': [ARCHIVED_DAY_ERROR]})
+        return attrs
     
 class EntryDetailSerializer(serializers.ModelSerializer):
     user = serializers.SerializerMethodField()
@@ -30,4 +44,34 @@ class EntryDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Entry
         fields = '__all__'
-        read_only_fields = ('tenant', 'user', 'stress_score', 'motivation_score')
\ No newline at end of file
+        read_only_fields = ('tenant', 'user', 'stress_score', 'motivation_score', 'score_status')
+
+
+class EntryBulkItemSerializer(serializers.Serializer):
+    """
+    一括登録（POST /entries/bulk/）・日次の上書き登録（PUT /entries/daily/...）の1件分の入力
+
+    チームの存在確認は全件まとめて1クエリで行うため、team は ID のまま受け取る。
+    """
+    team = serializers.IntegerField()
+    questions = serializers.JSONField(required=False, allow_null=True)
+    answers = serializers.JSONField(required=False, allow_null=True)
+    reported_at = serializers.DateField(input_formats=['%Y-%m-%d'], required=False)
+
+
+class EntryLeanSerializer(LeanSerializer):
+    """
+    EntryDetailSerializer と同じ形式を返す一覧・詳細表示用の軽量シリアライザー
+    """
+    model = Entry
+
+    id = LeanField()
+    user = LeanNestedField(id='user_id', name='user__name')
+    team = LeanNestedField(id='team_id', name='team__name')
+    questions = LeanField()
+    answers = LeanField()
+    stress_score = LeanField()
+    motivation_score = LeanField()
+    score_status = LeanField()
+    reported_at = LeanField(transform=datetime.date.isoformat)
+    tenant = LeanField(source='tenant_id')
@@ -0,0 +1,178 @@
+from functools import lru_cache
+from operator import attrgetter
+
+from rest_framework.exceptions import ValidationError
+
+# 保持するプランの上限（?fields= はクライアントが任意に組み合わせられるため、上限なしに増やさない）
+PLAN_CACHE_SIZE = 256
+
+
+class LeanField:
+    """
+    values() の列を1つ読み、必要に応じて変換して返すフィールド
+
+    Args:
+        source (str|None): values() の列名（省略時はフィールド名）。"user__name" のような
+                           リレーションの参照はインスタンスからは user.name として読む
+        transform (callable|None): None 以外の値に適用する変換（例: date.isoformat）
+    """
+    def __init__(self, source=None, transform=None):
+        self.source = source
+        self.transform = transform
+
+    def bind(self, name):
+        self.name = name
+        self.source = self.source or name
+        self.columns = (self.source,)
+        self._get_attr = attrgetter(self.source.replace('__', '.'))
+
+    def prefetch(self, rows, model):
+        pass
+
+    def from_row(self, row):
+        value = row[self.source]
+        return self.transform(value) if self.transform and value is not None else value
+
+    def from_instance(self, instance):
+        value = self._get_attr(instance)
+        return self.transform(value) if self.transform and value is not None else value
+
+
+class LeanNestedField(LeanField):
+    """
+    複数の列を {"id": ..., "name": ...} のような辞書にまとめるフィールド
+
+    Args:
+        **sources: 出力キーと values() の列名の対応
+    """
+    def __init__(self, **sources):
+        super().__init__()
+        self.sources = sources
+
+    def bind(self, name):
+        self.name = name
+        self.columns = tuple(self.sources.values())
+        self._getters = [
+            (key, source, attrgetter(source.replace('__', '.'))) for key, source in self.sources.items()
+        ]
+
+    def from_row(self, row):
+        return {key: row[source] for key, source, _ in self._getters}
+
+    def from_instance(self, instance):
+        return {key: get_attr(instance) for key, _, get_attr in self._getters}
+
+
+class LeanManyField(LeanField):
+    """
+    多対多のリレーションを辞書のリストで返すフィールド
+
+    values() の行に対しては、ページ内の全行の関連を1クエリでまとめて読み込む。
+
+    Args:
+        relation (str): モデルの多対多フィールド名（例: "teams"）
+        fields (tuple): 関連モデルから出力する列
+    """
+    def __init__(self, relation, fields=('id', 'name')):
+        super().__init__()
+        self.relation = relation
+        self.fields = fields
+
+    def bind(self, name):
+        self.name = name
+        self.columns = ()
+
+    def prefetch(self, rows, model):
+        field = model._meta.get_field(self.relation)
+        query_name = field.related_query_name()
+        related = {row['id']: [] for row in rows}
+        for item in field.related_model.objects.filter(**{f'{query_name}__in': list(related)}).values(
+            query_name, *self.fields
+        ).order_by('id'):
+            owner_id = item.pop(query_name)
+            related[owner_id].append(item)
+        for row in rows:
+            row[self.name] = related[row['id']]
+
+    def from_row(self, row):
+        return row[self.name]
+
+    def from_instance(self, instance):
+        return [
+            {field: getattr(item, field) for field in self.fields}
+            for item in getattr(instance, self.relation).all()
+        ]
+
+
+class LeanSerializer:
+    """
+    一覧・詳細表示用の軽量シリアライザーの基底クラス
+
+    DRF のフィールド機構を通さず、values() の行（またはインスタンス）から
+    宣言順のフィールドで辞書を組み立てる。要求されたフィールドの組ごとに
+    読み込む列と変換の手順（プラン）を1回だけ組み立てて使い回す。
+
+    サブクラスは model と LeanField のクラス属性を宣言する。
+
+    Args:
+        fields (str|None): カンマ区切りの出力フィールド（?fields= のスパースフィールドセット）
+        
+    Raises:
+        ValidationError: 未定義のフィールドが指定された場合
+    """
+    model = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        declared = {}
+        for base in reversed(cls.__mro__):
+            for name, value in vars(base).items():
+                if isinstance(value, LeanField):
+                    value.bind(name)
+                    declared[name] = value
+        cls._declared_fields = declared
+
+    def __init__(self, fields=None):
+        self.plan = self._get_plan(fields)
+
+    @classmethod
+    def _get_plan(cls, fields):
+        # 出力順は宣言順で決まるため、指定の順序・重複に依存しないキーにまとめる
+        names = frozenset(name.strip() for name in fields.split(',') if name.strip()) if fields else None
+        return cls._build_plan(names)
+
+    @classmethod
+    @lru_cache(maxsize=PLAN_CACHE_SIZE)
+    def _build_plan(cls, names):
+        if not names:
+            return tuple(cls._declared_fields.values())
+        unknown = sorted(names - cls._declared_fields.keys())
+        if unknown:
+            raise ValidationError({'fields': f'未定義のフィールドです: {", ".join(unknown)}'})
+        return tuple(field for name, field in cls._declared_fields.items() if name in names)
+
+    def values(self, queryset, *extra_columns):
+        """
+        プランに必要な列だけを読む values() クエリセットを返す
+
+        Args:
+            queryset (QuerySet): 元のクエリセット
+            *extra_columns: 出力しないが必要な列（ページネーションの並び順の列など）
+        """
+        columns = dict.fromkeys(('id', *extra_columns))
+        for field in self.plan:
+            columns.update(dict.fromkeys(field.columns))
+        # 多対多は LeanManyField が行単位でまとめて読み込むため prefetch_related は外す
+        return queryset.prefetch_related(None).values(*columns)
+
+    def to_representation(self, rows):
+        """values() の行のリストを出力用の辞書のリストに変換する"""
+        rows = list(rows)
+        for field in self.plan:
+            field.prefetch(rows, self.model)
+        plan = self.plan
+        return [{field.name: field.from_row(row) for field in plan} for row in rows]
+
+    def instance_to_representation(self, instance):
+        """モデルインスタンス1件を出力用の辞書に変換する"""
+        return {field.name: field.from_instance(instance) for field in self.plan}
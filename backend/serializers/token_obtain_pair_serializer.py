@@ -1,9 +1,15 @@
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from backend.authentication import add_user_claims
 from backend.serializers import user_serializer
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # ステートレス認証用に tenant_id / role / name をトークンに含める
+        return add_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         token = super().validate(attrs)
         
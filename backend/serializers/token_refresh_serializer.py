@@ -2,16 +2,23 @@ from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from backend.models import User
+from backend.serializers.token_obtain_pair_serializer import CustomTokenObtainPairSerializer
 from backend.serializers.user_serializer import UserSerializer
 
 
 class CustomTokenRefreshSerializer(TokenRefreshSerializer):
     def validate(self, attrs):
-        token = super().validate(attrs)
+        super().validate(attrs)
         refresh = RefreshToken(attrs['refresh'])
         user_id = refresh.payload.get('user_id')
         user = User.objects.get(id=user_id)
         user_data = UserSerializer(user).data
+        # ロール・テナント等の変更をクレームに反映するため、最新のユーザー情報で再発行する
+        refresh = CustomTokenObtainPairSerializer.get_token(user)
+        token = {
+            'access': str(refresh.access_token),
+            'refresh': str(refresh),
+        }
         return {
             'token': token,
             'user': user_data,
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from backend.models import User
+from backend.serializers.lean import LeanField, LeanManyField, LeanSerializer
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -40,3 +41,15 @@ class UserDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ('tenant',)
 
 
+class UserLeanSerializer(LeanSerializer):
+    """
+    UserDetailSerializer と同じ形式を返す一覧・詳細表示用の軽量シリアライザー
+    """
+    model = User
+
+    id = LeanField()
+    email = LeanField()
+    name = LeanField()
+    role = LeanField()
+    teams = LeanManyField('teams')
+    tenant = LeanField(source='tenant_id')
@@ -0,0 +1,91 @@
+import logging
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SQLITE_TUNING = {
+    'ENABLED': True,
+    # 読み取りが書き込みを待たないよう WAL にする（WAL ではコミットごとの fsync を NORMAL に減らしても壊れない）
+    'JOURNAL_MODE': 'WAL',
+    'SYNCHRONOUS': 'NORMAL',
+    # ロック待ちでエラーにせず待機するミリ秒数
+    'BUSY_TIMEOUT': 5000,
+    # ページキャッシュ（負の値は KiB 単位）とメモリマップの上限バイト数
+    'CACHE_SIZE': -64000,
+    'MMAP_SIZE': 256 * 1024 * 1024,
+    'TEMP_STORE': 'MEMORY',
+}
+
+# 設定キーと PRAGMA 名の対応（適用順）
+PRAGMAS = {
+    'JOURNAL_MODE': 'journal_mode',
+    'SYNCHRONOUS': 'synchronous',
+    'BUSY_TIMEOUT': 'busy_timeout',
+    'CACHE_SIZE': 'cache_size',
+    'MMAP_SIZE': 'mmap_size',
+    'TEMP_STORE': 'temp_store',
+}
+
+# PRAGMA の値はプレースホルダーを使えないため、識別子か整数のみ許可する
+_VALUE_PATTERN = re.compile(r'^(-?\d+|[A-Za-z_]+)$')
+
+
+def get_sqlite_tuning():
+    """settings.SQLITE_TUNING を既定値とマージして返す"""
+    return {**DEFAULT_SQLITE_TUNING, **getattr(settings, 'SQLITE_TUNING', {})}
+
+
+def pragma_statements(config):
+    """
+    設定から接続ごとに実行する PRAGMA 文を組み立てる
+
+    Args:
+        config (dict): get_sqlite_tuning() の形式の設定（値が None の項目は適用しない）
+
+    Returns:
+        list[str]: PRAGMA 文
+
+    Raises:
+        ImproperlyConfigured: 値が識別子・整数でない場合
+    """
+    statements = []
+    for key, pragma in PRAGMAS.items():
+        value = config.get(key)
+        if value is None or value == '':
+            continue
+        if not _VALUE_PATTERN.match(str(value)):
+            raise ImproperlyConfigured(f'SQLITE_TUNING[{key!r}] must be an integer or identifier: {value!r}')
+        statements.append(f'PRAGMA {pragma} = {value}')
+    return statements
+
+
+def apply_sqlite_pragmas(connection, config=None):
+    """
+    SQLite の接続に PRAGMA を適用する
+
+    Django の DatabaseWrapper と sqlite3.Connection のどちらも受け付ける。
+
+    Args:
+        connection: cursor() を持つ接続
+        config (dict|None): 設定（既定: get_sqlite_tuning()）
+    """
+    config = config if config is not None else get_sqlite_tuning()
+    if not config['ENABLED']:
+        return
+    cursor = connection.cursor()
+    try:
+        for statement in pragma_statements(config):
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """connection_created シグナルのハンドラ（SQLite の接続のみ対象）"""
+    if connection.vendor != 'sqlite':
+        return
+    apply_sqlite_pragmas(connection)
+    logger.debug(f'Applied SQLite PRAGMAs to connection {connection.alias!r}')
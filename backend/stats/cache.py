@@ -0,0 +1,193 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+from backend.scoring.cache import ScoreCacheStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEAM_ENTRY_CACHE = {
+    'ENABLED': None,
+    'ALIAS': 'default',
+    'TIMEOUT': 60 * 5,
+    'KEY_PREFIX': 'team-entries',
+}
+
+
+class ResponseCacheStats(ScoreCacheStats):
+    """レスポンスキャッシュのヒット・ミス・304応答回数（プロセス内カウンタ）"""
+    def __init__(self):
+        super().__init__()
+        self.not_modified = 0
+
+    @property
+    def hit_rate(self):
+        # 304 応答もキャッシュにより集計を省略できたリクエストとして数える
+        total = self.hits + self.not_modified + self.misses
+        return (self.hits + self.not_modified) / total if total else 0.0
+
+    def as_dict(self):
+        return {**super().as_dict(), 'not_modified': self.not_modified}
+
+
+class TeamEntryResponseCache:
+    """
+    チーム別エントリー集約APIのレスポンスキャッシュ
+
+    Django のキャッシュフレームワーク（settings.CACHES）にシリアライズ前の
+    レスポンスデータを保存する。キーにはテナントごとのバージョン番号を含め、
+    エントリーの書き込み時に bump() でバージョンを進めることで、
+    テナントの古いキャッシュをまとめて無効化する（古いキーは TIMEOUT で消える）。
+
+    バージョンは書き込みを行う全プロセス（API・スコア計算ワーカー）で共有する必要があるため、
+    プロセス間で共有されるキャッシュ（Redis / Memcached / DB など）を前提とする。
+    バージョンのキーも TIMEOUT で期限切れにし、無効化を経ない書き込みがあった場合でも
+    古いレスポンス・ETag が使われ続けるのは TIMEOUT 秒までとする。
+
+    Options:
+        ENABLED: キャッシュを使うかどうか（None の場合は ALIAS が共有キャッシュの場合のみ有効）
+        ALIAS: 使用する CACHES のエイリアス（既定: default）
+        TIMEOUT: レスポンスの保持秒数
+        KEY_PREFIX: キープレフィックス（既定: team-entries）
+    """
+    def __init__(self, enabled=True, alias='default', timeout=None, key_prefix='team-entries'):
+        self.enabled = enabled
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+        self.stats = ResponseCacheStats()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _version_key(self, tenant_id):
+        return f"{self.key_prefix}:version:{tenant_id}"
+
+    def version(self, tenant_id):
+        """
+        テナントの現在のバージョン番号を返す
+
+        バージョンが追い出されていた場合は時刻ベースの値で作り直し、
+        以前のバージョンのキーと衝突しないようにする。
+        """
+        key = self._version_key(tenant_id)
+        version = self.cache.get(key)
+        if version is None:
+            self.cache.add(key, time.time_ns(), timeout=self.timeout)
+            version = self.cache.get(key)
+        return version
+
+    def bump(self, tenant_id):
+        """テナントのバージョンを進め、既存のレスポンスキャッシュを無効化する"""
+        key = self._version_key(tenant_id)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.add(key, time.time_ns(), timeout=self.timeout)
+
+    def make_key(self, tenant_id, **params):
+        """
+        テナントの現在のバージョンとリクエスト条件からキャッシュキーを生成する
+
+        Args:
+            tenant_id (int): テナントID
+            **params: 権限スコープ・チーム・期間・形式など、レスポンスを決める条件
+
+        Returns:
+            str: キャッシュキー（ETag の生成にも使う）
+        """
+        payload = json.dumps(params, sort_keys=True, default=str, separators=(',', ':'))
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return f"{self.key_prefix}:{tenant_id}:{self.version(tenant_id)}:{digest}"
+
+    @staticmethod
+    def make_etag(key):
+        return f'"{hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]}"'
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        return self.cache.get(key)
+
+    def set(self, key, data):
+        if self.enabled:
+            self.cache.set(key, data, timeout=self.timeout)
+
+
+def is_shared_cache(alias):
+    """CACHES のエイリアスがプロセス間で共有されるキャッシュかどうかを返す"""
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_team_entry_cache():
+    """
+    settings.TEAM_ENTRY_CACHE に従ってプロセス共通のレスポンスキャッシュを返す
+
+    Returns:
+        TeamEntryResponseCache: レスポンスキャッシュ
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = {**DEFAULT_TEAM_ENTRY_CACHE, **getattr(settings, 'TEAM_ENTRY_CACHE', {})}
+                enabled = config['ENABLED']
+                if enabled is None:
+                    enabled = is_shared_cache(config['ALIAS'])
+                elif enabled and not is_shared_cache(config['ALIAS']):
+                    logger.warning(
+                        f"TEAM_ENTRY_CACHE uses process-local cache alias '{config['ALIAS']}'; "
+                        "writes from other processes will not invalidate it"
+                    )
+                _cache = TeamEntryResponseCache(
+                    enabled=enabled,
+                    alias=config['ALIAS'],
+                    timeout=config['TIMEOUT'],
+                    key_prefix=config['KEY_PREFIX'],
+                )
+    return _cache
+
+
+def reset_team_entry_cache():
+    """レスポンスキャッシュのインスタンスを破棄する（設定変更時・テスト用）"""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(setting, **kwargs):
+    if setting in ('TEAM_ENTRY_CACHE', 'CACHES'):
+        reset_team_entry_cache()
+
+
+def invalidate_team_entries(tenant_id):
+    """
+    テナントのチーム別エントリー集約キャッシュを無効化する
+
+    トランザクション確定後にバージョンを進める（確定前に進めると、
+    並行するリクエストが変更前のデータを新しいバージョンで保存しうるため）。
+    """
+    transaction.on_commit(partial(get_team_entry_cache().bump, tenant_id))
+
+
+def invalidate_for_rollup_keys(keys):
+    """(tenant_id, team_id, reported_at) の組に含まれるテナントのキャッシュを無効化する"""
+    for tenant_id in {key[0] for key in keys}:
+        invalidate_team_entries(tenant_id)
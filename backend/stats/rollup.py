@@ -0,0 +1,159 @@
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, Max, Min, OuterRef, Sum
+
+from backend.models import ArchivedEntry, Entry, TeamDailyStats
+from backend.models.entry import ScoreStatus
+
+# TeamDailyStats のフィールドと Entry に対する集計式の対応
+ROLLUP_AGGREGATES = {
+    'count': Count('id'),
+    'stress_sum': Sum('stress_score'),
+    'stress_avg': Avg('stress_score'),
+    'stress_min': Min('stress_score'),
+    'stress_max': Max('stress_score'),
+    'motivation_sum': Sum('motivation_score'),
+    'motivation_avg': Avg('motivation_score'),
+    'motivation_min': Min('motivation_score'),
+    'motivation_max': Max('motivation_score'),
+}
+
+
+def scored_entries():
+    """集計対象のエントリー（AIスコアが確定したもの、またはLLM障害時のローカル推定値で確定したもの）"""
+    return Entry.objects.filter(score_status__in=[ScoreStatus.SCORED, ScoreStatus.ESTIMATED])
+
+
+def refresh_team_daily_stats(tenant_id, team_id, day):
+    """
+    1チーム・1日分の集計行を再計算する
+
+    該当日のエントリーのみを集計するため、コストはチームの人数に比例し、
+    過去の日数には依存しない。集計対象がなくなった場合は行を削除する。
+    集計行をロックしてから集計・書き込みを1トランザクションで行うため、
+    複数のワーカーが同じ (team, date) を同時に再計算しても最後の結果が最新の集計になる。
+
+    Args:
+        tenant_id (int): テナントID
+        team_id (int): チームID
+        day (date): 集計日
+    """
+    with transaction.atomic():
+        stats = _lock_stats_row(tenant_id, team_id, day)
+        # tenant_id も指定し、(tenant, team, reported_at) のインデックスで該当日の行のみを読む
+        values = scored_entries().filter(
+            tenant_id=tenant_id, team_id=team_id, reported_at=day,
+        ).aggregate(**ROLLUP_AGGREGATES)
+        if not values['count']:
+            stats.delete()
+            return
+
+        for field, value in values.items():
+            setattr(stats, field, value)
+        stats.save()
+
+
+def _lock_stats_row(tenant_id, team_id, day):
+    """
+    (team, date) の集計行を（なければ作成して）ロックする
+
+    同じ (team, date) の再計算を直列化し、後から書く側が必ず先の書き込みのコミット後に
+    集計し直すようにする（ロックなしでは古い集計結果が後から上書きすることがある）。
+    SQLite では最初の INSERT でデータベースの書き込みロックを取るため、同じく直列化される。
+    """
+    while True:
+        TeamDailyStats.objects.bulk_create(
+            [TeamDailyStats(tenant_id=tenant_id, team_id=team_id, date=day)], ignore_conflicts=True,
+        )
+        stats = TeamDailyStats.objects.select_for_update().filter(team_id=team_id, date=day).first()
+        # 作成とロックの間に他の処理が行を削除した場合は作り直す
+        if stats is not None:
+            return stats
+
+
+def refresh_for_keys(keys):
+    """
+    (tenant_id, team_id, reported_at) の組ごとに集計行を再計算する
+
+    Args:
+        keys (Iterable[tuple]): 再計算する (tenant_id, team_id, reported_at) の組
+
+    Returns:
+        set[tuple]: 再計算した組
+    """
+    keys = set(keys)
+    for tenant_id, team_id, day in keys:
+        refresh_team_daily_stats(tenant_id, team_id, day)
+    return keys
+
+
+def refresh_for_entries(entry_ids):
+    """
+    エントリーが属する (team, date) の集計行を再計算する
+
+    スコアを UPDATE 文や bulk_update で書き戻した後に呼び出す。
+
+    Args:
+        entry_ids (Iterable[int]): スコアを書き込んだエントリーID
+
+    Returns:
+        set[tuple]: 再計算した (tenant_id, team_id, reported_at) の組
+    """
+    return refresh_for_keys(
+        Entry.objects.filter(pk__in=list(entry_ids)).values_list('tenant_id', 'team_id', 'reported_at')
+    )
+
+
+def _archived(team_field, date_field):
+    """(team, date) がアーカイブ済みの期間に含まれるかの条件（OuterRef で外側の行の列を参照する）"""
+    return Exists(ArchivedEntry.objects.filter(
+        team_id=OuterRef(team_field), date_from__lte=OuterRef(date_field), date_to__gte=OuterRef(date_field),
+    ))
+
+
+def rebuild_team_daily_stats(tenant_id=None, date_from=None, date_to=None, batch_size=1000):
+    """
+    条件に一致する範囲の集計行を Entry から作り直す
+
+    範囲内の既存行を削除し、(team, date) 単位の GROUP BY 結果を
+    bulk_create する。全体を1トランザクションで実行する。
+    アーカイブ済みの (team, date) の集計行は Entry から作り直せないため、削除せずに残す。
+
+    Args:
+        tenant_id (int|None): 対象テナントID（Noneの場合は全テナント）
+        date_from (date|None): 対象開始日
+        date_to (date|None): 対象終了日
+        batch_size (int): bulk_create の単位件数
+
+    Returns:
+        int: 作成した集計行の数
+    """
+    entry_filters = {}
+    stats_filters = {}
+    if tenant_id:
+        entry_filters['tenant_id'] = stats_filters['tenant_id'] = tenant_id
+    if date_from:
+        entry_filters['reported_at__gte'] = stats_filters['date__gte'] = date_from
+    if date_to:
+        entry_filters['reported_at__lte'] = stats_filters['date__lte'] = date_to
+
+    rows = (
+        scored_entries()
+        .filter(**entry_filters)
+        .filter(~_archived('team_id', 'reported_at'))
+        .values('tenant_id', 'team_id', 'reported_at')
+        .annotate(**ROLLUP_AGGREGATES)
+        .order_by()
+    )
+
+    created = 0
+    with transaction.atomic():
+        TeamDailyStats.objects.filter(**stats_filters).filter(~_archived('team_id', 'date')).delete()
+        batch = []
+        for row in rows.iterator():
+            batch.append(TeamDailyStats(date=row.pop('reported_at'), **row))
+            if len(batch) >= batch_size:
+                created += len(TeamDailyStats.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            created += len(TeamDailyStats.objects.bulk_create(batch))
+    return created
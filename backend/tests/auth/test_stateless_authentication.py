@@ -0,0 +1,99 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from backend.authentication import CustomJWTAuthentication, TenantTokenUser
+from backend.models import Entry, Team, Tenant
+from backend.models.user import UserRole
+from backend.serializers.token_obtain_pair_serializer import CustomTokenObtainPairSerializer
+
+STATELESS = {'STATELESS': True, 'USER_CACHE_ALIAS': 'default', 'USER_CACHE_TIMEOUT': 60}
+
+
+class TestStatelessAuthentication(TestCase):
+    """
+    トークンのクレームからユーザーを組み立てるステートレス認証をテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant)
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="testpass123", name="User",
+            role=UserRole.MANAGER.value, tenant=cls.tenant
+        )
+        cls.team.managers.add(cls.user)
+
+    def setUp(self):
+        caches['default'].clear()
+        self.access_token = str(CustomTokenObtainPairSerializer.get_token(self.user).access_token)
+
+    def _authenticate(self):
+        request = APIRequestFactory().get('/')
+        request.COOKIES['access_token'] = self.access_token
+        return CustomJWTAuthentication().authenticate(request)
+
+    def test_token_contains_user_claims(self):
+        """アクセストークンに tenant_id / role / name が含まれることをテスト"""
+        _, token = self._authenticate()
+
+        self.assertEqual(token['tenant_id'], self.tenant.id)
+        self.assertEqual(token['role'], UserRole.MANAGER.value)
+        self.assertEqual(token['name'], 'User')
+
+    @override_settings(TOKEN_AUTH=STATELESS)
+    def test_authenticate_without_queries(self):
+        """ステートレスモードではユーザー行を読まずに認証できることをテスト"""
+        with self.assertNumQueries(0):
+            user, _ = self._authenticate()
+            self.assertIsInstance(user, TenantTokenUser)
+            self.assertEqual((user.id, user.tenant_id, user.role), (self.user.id, self.tenant.id, self.user.role))
+            self.assertEqual(user, self.user)
+
+        # トークンにない属性はキャッシュしたユーザー行から返す
+        self.assertEqual(user.email, 'user@test.com')
+        with self.assertNumQueries(0):
+            self.assertEqual(user.tenant.name, 'Test Tenant')
+
+    def test_default_mode_loads_user(self):
+        """既定ではDBのユーザーを返すことをテスト"""
+        user, _ = self._authenticate()
+
+        self.assertIsInstance(user, get_user_model())
+
+    @override_settings(TOKEN_AUTH=STATELESS)
+    def test_api_with_stateless_user(self):
+        """ステートレスユーザーでエントリー作成・一覧ができることをテスト"""
+        client = APIClient()
+        client.cookies['access_token'] = self.access_token
+        url = reverse('entries-list', kwargs={'tenants_pk': self.tenant.pk})
+
+        response = client.post(url, {'team': self.team.id, 'reported_at': '2025-01-01'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Entry.objects.filter(user=self.user, tenant=self.tenant).exists())
+
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    @override_settings(TOKEN_AUTH=STATELESS)
+    def test_team_entries_with_stateless_user(self):
+        """ステートレスユーザー（一般ユーザー）でチーム別エントリーを取得できることをテスト"""
+        member = get_user_model().objects.create_user(
+            email="member@test.com", password="testpass123", name="Member", tenant=self.tenant
+        )
+        Entry.objects.create(tenant=self.tenant, user=member, team=self.team, reported_at=date.today())
+        Entry.objects.create(tenant=self.tenant, user=self.user, team=self.team, reported_at=date.today())
+
+        client = APIClient()
+        client.cookies['access_token'] = str(CustomTokenObtainPairSerializer.get_token(member).access_token)
+        response = client.get(reverse('team-entries-list', kwargs={'tenants_pk': self.tenant.pk}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([user['id'] for team in response.data for user in team['users']], [member.id])
@@ -0,0 +1,82 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient, APIRequestFactory
+
+from backend.authentication import (
+    CustomJWTAuthentication,
+    VerifiedTokenCache,
+    get_verified_token_cache,
+    reset_verified_token_cache,
+)
+from backend.models import Tenant
+from backend.serializers.token_obtain_pair_serializer import CustomTokenObtainPairSerializer
+
+
+class TestVerifiedTokenCache(TestCase):
+    """
+    検証済みアクセストークンのキャッシュをテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="testpass123", name="User", tenant=cls.tenant
+        )
+
+    def setUp(self):
+        reset_verified_token_cache()
+        self.access_token = str(CustomTokenObtainPairSerializer.get_token(self.user).access_token)
+
+    def tearDown(self):
+        reset_verified_token_cache()
+
+    def _authenticate(self):
+        request = APIRequestFactory().get('/')
+        request.COOKIES['access_token'] = self.access_token
+        return CustomJWTAuthentication().authenticate(request)
+
+    def test_second_request_skips_verification(self):
+        """2回目以降は署名検証を行わないことをテスト"""
+        user, token = self._authenticate()
+        with mock.patch('rest_framework_simplejwt.backends.TokenBackend.decode') as decode:
+            cached_user, cached_token = self._authenticate()
+
+        decode.assert_not_called()
+        self.assertIs(cached_token, token)
+        self.assertEqual(cached_user, user)
+
+    def test_expired_entry_is_dropped(self):
+        """exp を過ぎたエントリーは返さないことをテスト"""
+        cache = VerifiedTokenCache(max_entries=10)
+        cache.set('token', {'exp': time.time() - 1})
+
+        self.assertIsNone(cache.get('token'))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        """最大件数を超えると最も古く使われたトークンから追い出されることをテスト"""
+        cache = VerifiedTokenCache(max_entries=2)
+        exp = time.time() + 60
+        cache.set('a', {'exp': exp})
+        cache.set('b', {'exp': exp})
+        cache.get('a')
+        cache.set('c', {'exp': exp})
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_logout_evicts_token(self):
+        """ログアウトでキャッシュから取り除かれることをテスト"""
+        self._authenticate()
+        self.assertEqual(len(get_verified_token_cache()), 1)
+
+        client = APIClient()
+        client.cookies['access_token'] = self.access_token
+        client.post('/api/auth/logout/')
+
+        self.assertEqual(len(get_verified_token_cache()), 0)
@@ -0,0 +1,176 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.models import ArchivedEntry, Entry, Team, TeamDailyStats, Tenant
+from backend.retention.archive import archive_entries, archived_days, entry_history
+from backend.retention.policy import build_retention_policy, get_retention_cutoff
+from backend.stats.rollup import rebuild_team_daily_stats
+
+TODAY = date(2025, 6, 30)
+
+
+class TestRetentionPolicy(TestCase):
+    """テナントの保持期間の設定をテストするクラス"""
+
+    def test_default_does_not_archive(self):
+        self.assertEqual(build_retention_policy({}), {'days': None})
+        self.assertIsNone(get_retention_cutoff(build_retention_policy(None), TODAY))
+
+    @override_settings(ENTRY_RETENTION={'DAYS': 365})
+    def test_tenant_overrides_default(self):
+        self.assertEqual(build_retention_policy({}), {'days': 365})
+        self.assertEqual(build_retention_policy({'retention': {'days': 120}}), {'days': 120})
+        self.assertEqual(build_retention_policy({'retention': {'days': None}}), {'days': None})
+
+    def test_invalid_and_short_windows(self):
+        with self.assertLogs('backend.retention.policy', level='WARNING'):
+            self.assertEqual(build_retention_policy({'retention': {'days': 'forever'}}), {'days': None})
+        with self.assertLogs('backend.retention.policy', level='WARNING'):
+            self.assertEqual(build_retention_policy({'retention': {'days': 7}}), {'days': 90})
+
+    def test_cutoff(self):
+        self.assertEqual(get_retention_cutoff({'days': 90}, TODAY), date(2025, 4, 1))
+
+
+class TestArchiveEntries(TestCase):
+    """archive_entries コマンドと ArchivedEntry の読み取りをテストするクラス"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant", domain_settings={'retention': {'days': 90}})
+        cls.other_tenant = Tenant.objects.create(name="Other Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant)
+        cls.other_team = Team.objects.create(name="Other Team", tenant=cls.other_tenant)
+        cls.user1 = User.objects.create_user(
+            email="user1@test.com", password="testpass123", name="User 1", tenant=cls.tenant
+        )
+        cls.user2 = User.objects.create_user(
+            email="user2@test.com", password="testpass123", name="User 2", tenant=cls.tenant
+        )
+        cls.other_user = User.objects.create_user(
+            email="other@test.com", password="testpass123", name="Other", tenant=cls.other_tenant
+        )
+        days = [date(2025, 2, 10), date(2025, 3, 5), date(2025, 3, 31), date(2025, 4, 1), date(2025, 6, 1)]
+        for day in days:
+            for user in (cls.user1, cls.user2):
+                Entry.objects.create(
+                    tenant=cls.tenant, user=user, team=cls.team, reported_at=day,
+                    questions={'q1': '調子は？'}, answers={'q1': f'{day} の回答'},
+                )
+        Entry.objects.create(
+            tenant=cls.other_tenant, user=cls.other_user, team=cls.other_team, reported_at=date(2024, 1, 1),
+        )
+        Entry.objects.filter(tenant=cls.tenant).update(stress_score=30, motivation_score=70, score_status='scored')
+        rebuild_team_daily_stats(tenant_id=cls.tenant.pk)
+
+    def test_archive_moves_old_entries_by_month(self):
+        out = StringIO()
+        call_command('archive_entries', '--today', TODAY.isoformat(), stdout=out)
+
+        # 境界日 2025-04-01 より前の 3日 × 2人 を移し、他テナント（保持期間の設定なし）は残す
+        self.assertEqual(Entry.objects.filter(tenant=self.tenant).count(), 4)
+        self.assertFalse(Entry.objects.filter(tenant=self.tenant, reported_at__lt=date(2025, 4, 1)).exists())
+        self.assertEqual(Entry.objects.filter(tenant=self.other_tenant).count(), 1)
+
+        chunks = ArchivedEntry.objects.order_by('month')
+        self.assertEqual(
+            [(chunk.month, chunk.date_from, chunk.date_to, chunk.entry_count) for chunk in chunks],
+            [
+                (date(2025, 2, 1), date(2025, 2, 10), date(2025, 2, 10), 2),
+                (date(2025, 3, 1), date(2025, 3, 5), date(2025, 3, 31), 4),
+            ],
+        )
+        self.assertIn('6 件のエントリーをアーカイブしました', out.getvalue())
+
+    def test_archived_rows_round_trip(self):
+        archive_entries(self.tenant.pk, date(2025, 4, 1))
+
+        rows = list(ArchivedEntry.objects.filter(tenant=self.tenant).entries(user_id=self.user1.pk))
+        self.assertEqual([row['reported_at'] for row in rows], [date(2025, 2, 10), date(2025, 3, 5), date(2025, 3, 31)])
+        self.assertEqual(rows[0]['answers'], {'q1': '2025-02-10 の回答'})
+        self.assertEqual(rows[0]['stress_score'], 30)
+        self.assertEqual(rows[0]['score_status'], 'scored')
+
+        rows = list(ArchivedEntry.objects.entries(date_from=date(2025, 3, 10), date_to=date(2025, 3, 31)))
+        self.assertEqual([row['reported_at'] for row in rows], [date(2025, 3, 31)] * 2)
+
+    def test_entry_history_spans_archive_and_hot_table(self):
+        archive_entries(self.tenant.pk, date(2025, 4, 1))
+
+        rows = entry_history(self.tenant.pk, user_id=self.user2.pk, date_from=date(2025, 3, 1))
+        self.assertEqual(
+            [row['reported_at'] for row in rows],
+            [date(2025, 3, 5), date(2025, 3, 31), date(2025, 4, 1), date(2025, 6, 1)],
+        )
+
+    def test_rollups_are_kept(self):
+        before = TeamDailyStats.objects.filter(team=self.team).count()
+        self.assertEqual(before, 5)
+        archive_entries(self.tenant.pk, date(2025, 4, 1))
+        self.assertEqual(TeamDailyStats.objects.filter(team=self.team).count(), before)
+
+    def test_rebuild_keeps_archived_rollups(self):
+        """範囲を指定しない再構築でもアーカイブ済みの (team, date) の集計行を残すことをテスト"""
+        archive_entries(self.tenant.pk, date(2025, 4, 1))
+        before = {stats.date: (stats.count, stats.stress_sum) for stats in TeamDailyStats.objects.filter(team=self.team)}
+
+        self.assertEqual(rebuild_team_daily_stats(tenant_id=self.tenant.pk), 2)
+        after = {stats.date: (stats.count, stats.stress_sum) for stats in TeamDailyStats.objects.filter(team=self.team)}
+        self.assertEqual(after, before)
+        self.assertEqual(after[date(2025, 2, 10)], (2, 60))
+
+    def test_archived_days(self):
+        archive_entries(self.tenant.pk, date(2025, 4, 1))
+        keys = {(self.team.pk, date(2025, 2, 10)), (self.team.pk, date(2025, 3, 20)),
+                (self.team.pk, date(2025, 2, 20)), (self.team.pk, date(2025, 4, 1))}
+        # 3月は 3/5〜3/31 のアーカイブに含まれ、2月はエントリーのあった 2/10 のみ
+        self.assertEqual(
+            archived_days(self.tenant.pk, keys),
+            {(self.team.pk, date(2025, 2, 10)), (self.team.pk, date(2025, 3, 20))},
+        )
+        self.assertEqual(archived_days(self.other_tenant.pk, keys), set())
+
+    def test_writes_to_archived_days_are_rejected(self):
+        """アーカイブ済みのチーム・記録日へのエントリーの登録を拒否し、集計行とエクスポートを変えないことをテスト"""
+        archive_entries(self.tenant.pk, date(2025, 4, 1))
+        client = APIClient()
+        client.force_authenticate(user=self.user1)
+        answers = {'answers': {'q1': '追加の回答'}}
+
+        response = client.put(reverse('entries-daily', kwargs={
+            'tenants_pk': self.tenant.pk, 'team_pk': self.team.pk, 'reported_at': '2025-03-05',
+        }), answers, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('reported_at', response.json())
+
+        response = client.post(reverse('entries-bulk', kwargs={'tenants_pk': self.tenant.pk}), [
+            {'team': self.team.pk, 'reported_at': '2025-03-05', **answers},
+            {'team': self.team.pk, 'reported_at': '2025-06-02', **answers},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result['status'] for result in response.json()['results']], ['error', 'created'])
+
+        response = client.post(reverse('entries-list', kwargs={'tenants_pk': self.tenant.pk}), {
+            'team': self.team.pk, 'reported_at': '2025-02-10', **answers,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertFalse(Entry.objects.filter(tenant=self.tenant, reported_at__lt=date(2025, 4, 1)).exists())
+        self.assertEqual(TeamDailyStats.objects.get(team=self.team, date=date(2025, 3, 5)).count, 2)
+
+    def test_dry_run_and_days_override(self):
+        out = StringIO()
+        call_command('archive_entries', '--tenant', str(self.tenant.pk), '--days', '100',
+                     '--today', TODAY.isoformat(), '--dry-run', stdout=out)
+        # 境界日 2025-03-22: 2/10・3/5 の 2日 × 2人
+        self.assertIn('4 件がアーカイブ対象です', out.getvalue())
+        self.assertEqual(Entry.objects.filter(tenant=self.tenant).count(), 10)
+        self.assertFalse(ArchivedEntry.objects.exists())
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from backend.models import Entry, Team, Tenant
+from backend.models.entry import ScoreStatus
+from backend.scoring.breaker import get_circuit_breaker, reset_circuit_breaker
+from backend.scoring.cache import reset_score_cache
+from backend.scoring.client import FakeScoringClient, reset_scoring_client, set_scoring_client
+
+
+class TestRescoreEntriesCommand(TestCase):
+    """
+    rescore_entries コマンドをテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.other_tenant = Tenant.objects.create(name="Other Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant)
+        cls.other_team = Team.objects.create(name="Other Team", tenant=cls.other_tenant)
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            email="user@test.com", password="testpass123", name="User", tenant=cls.tenant
+        )
+        cls.other_user = User.objects.create_user(
+            email="other@test.com", password="testpass123", name="Other", tenant=cls.other_tenant
+        )
+        for day in range(1, 6):
+            Entry.objects.create(
+                tenant=cls.tenant, user=cls.user, team=cls.team,
+                questions={'q1': '調子は？'}, answers={'q1': f'回答{day}'},
+                reported_at=date(2025, 1, day),
+            )
+        Entry.objects.create(
+            tenant=cls.other_tenant, user=cls.other_user, team=cls.other_team,
+            questions={'q1': '調子は？'}, answers={'q1': '回答'},
+            reported_at=date(2025, 1, 1),
+        )
+
+    def setUp(self):
+        self.client = FakeScoringClient(scores={'stress_score': 11, 'motivation_score': 22})
+        set_scoring_client(self.client)
+
+    def tearDown(self):
+        reset_scoring_client()
+        reset_score_cache()
+        reset_circuit_breaker()
+
+    def test_rescore_filtered_entries(self):
+        """条件に一致するエントリーのみ再計算されることをテスト"""
+        call_command(
+            'rescore_entries', '--tenant', str(self.tenant.pk), '--from', '2025-01-02',
+            '--batch-size', '1', '--workers', '2', '--no-cache', stdout=StringIO(),
+        )
+
+        rescored = Entry.objects.filter(tenant=self.tenant, reported_at__gte=date(2025, 1, 2))
+        self.assertTrue(all(e.stress_score == 11 and e.score_status == ScoreStatus.SCORED for e in rescored))
+        untouched = Entry.objects.exclude(pk__in=rescored)
+        self.assertTrue(all(e.score_status == ScoreStatus.PENDING for e in untouched))
+        self.assertEqual(len(self.client.calls), 4)
+
+    def test_checkpoint_resume(self):
+        """チェックポイントの最終IDより後のエントリーのみ処理されることをテスト"""
+        entries = list(Entry.objects.filter(tenant=self.tenant).order_by('id'))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'checkpoint.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'filters': {'tenant_id': str(self.tenant.pk)}, 'last_id': entries[2].pk}, f)
+
+            call_command(
+                'rescore_entries', '--tenant', str(self.tenant.pk), '--batch-size', '1',
+                '--chunk-size', '1', '--checkpoint', path, '--no-cache', stdout=StringIO(),
+            )
+
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['last_id'], entries[-1].pk)
+
+        self.assertEqual(len(self.client.calls), 2)
+        self.assertEqual(Entry.objects.get(pk=entries[0].pk).score_status, ScoreStatus.PENDING)
+        self.assertEqual(Entry.objects.get(pk=entries[4].pk).stress_score, 11)
+
+    def test_lexicon_tenant_skips_llm(self):
+        """主スコアラーがローカルスコアラーのテナントはLLMを呼ばずに再計算することをテスト"""
+        Tenant.objects.filter(pk=self.tenant.pk).update(domain_settings={'scoring': {'scorer': 'lexicon'}})
+
+        call_command('rescore_entries', '--tenant', str(self.tenant.pk), '--no-cache', stdout=StringIO())
+
+        self.assertEqual(self.client.calls, [])
+        self.assertFalse(Entry.objects.filter(tenant=self.tenant).exclude(score_status=ScoreStatus.SCORED).exists())
+
+    @override_settings(SCORING_CIRCUIT_BREAKER={'ENABLED': True, 'FAILURE_THRESHOLD': 1, 'RESET_TIMEOUT': 60})
+    def test_open_circuit_aborts(self):
+        """サーキットブレーカーが開いている場合はLLMを呼ばずに中断することをテスト"""
+        get_circuit_breaker().record_failure()
+
+        with self.assertRaises(CommandError):
+            call_command('rescore_entries', '--tenant', str(self.tenant.pk), '--no-cache', stdout=StringIO())
+
+        self.assertEqual(self.client.calls, [])
+        self.assertFalse(Entry.objects.filter(tenant=self.tenant).exclude(score_status=ScoreStatus.PENDING).exists())
@@ -0,0 +1,125 @@
+import re
+from datetime import date, timedelta
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, models
+from django.test import TestCase
+from django.test.utils import isolate_apps
+
+from backend.models import Entry, Team, TeamDailyStats, Tenant
+from backend.stats.rollup import scored_entries
+from backend.views.team_entry_view import TeamEntryViewSet
+
+
+class TestMigrations(TestCase):
+    """モデルとチェックイン済みのマイグレーションが一致していることをテストするクラス"""
+
+    def test_no_missing_migrations(self):
+        call_command('makemigrations', '--check', '--dry-run', verbosity=0)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'INCLUDE 非対応のデータベースの警告を検証する')
+class TestCoveringIndexChecks(TestCase):
+    """INCLUDE 付きインデックスの警告（models.W040）を Entry のみで抑制することをテストするクラス"""
+
+    def test_entry_covering_index_is_not_reported(self):
+        self.assertEqual([e.id for e in Entry.check(databases=['default']) if e.id == 'models.W040'], [])
+
+    @isolate_apps('backend')
+    def test_other_models_are_still_reported(self):
+        class Covered(models.Model):
+            name = models.CharField(max_length=10)
+            score = models.IntegerField()
+
+            class Meta:
+                indexes = [models.Index(fields=['name'], include=['score'], name='covered_idx')]
+
+        self.assertIn('models.W040', [e.id for e in Covered.check(databases=['default'])])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite の EXPLAIN QUERY PLAN の形式で検証する')
+class TestDashboardQueryPlans(TestCase):
+    """
+    ダッシュボード・一覧APIの主要なクエリがインデックスを使うことを EXPLAIN でテストするクラス
+
+    エントリー表の全件走査（SCAN backend_entry）や並べ替えの一時B-treeが現れないことを確認する。
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.teams = [Team.objects.create(name=f"Team {i}", tenant=cls.tenant) for i in range(3)]
+        cls.users = [
+            User.objects.create_user(email=f"user{i}@test.com", password="testpass123", name=f"User {i}", tenant=cls.tenant)
+            for i in range(3)
+        ]
+        today = date.today()
+        Entry.objects.bulk_create([
+            Entry(tenant=cls.tenant, user=user, team=team, reported_at=today - timedelta(days=days),
+                  stress_score=days % 100, motivation_score=50)
+            for user in cls.users for team in cls.teams for days in range(30)
+        ])
+        cls.date_from, cls.date_to = today - timedelta(days=14), today
+
+    def explain(self, queryset):
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name, ordered=True):
+        plan = self.explain(queryset)
+        self.assertRegex(plan, rf'SEARCH backend_entry USING (COVERING )?INDEX {index_name}\b', plan)
+        self.assertNotRegex(plan, r'SCAN backend_entry(?! USING)', plan)
+        if ordered:
+            self.assertNotIn('TEMP B-TREE FOR ORDER BY', plan)
+        return plan
+
+    def test_team_entries_by_team(self):
+        """チーム別エントリー集約（マネージャー・team_ids 指定）が (tenant, team, reported_at) を使う"""
+        entries = Entry.objects.filter(
+            tenant_id=self.tenant.pk, reported_at__gte=self.date_from, reported_at__lte=self.date_to,
+            team_id__in=[self.teams[0].pk, self.teams[1].pk],
+        )
+        self.assertUsesIndex(TeamEntryViewSet._aggregate_rows(entries, 'day'), 'entry_team_date_cover_idx', ordered=False)
+
+    def test_team_entries_for_user(self):
+        """一般ユーザーのチーム別エントリー集約が (tenant, user, -reported_at, id) を使う"""
+        entries = Entry.objects.filter(
+            tenant_id=self.tenant.pk, reported_at__gte=self.date_from, reported_at__lte=self.date_to,
+            user=self.users[0],
+        )
+        self.assertUsesIndex(TeamEntryViewSet._aggregate_rows(entries, 'day'), 'entry_user_recent_idx', ordered=False)
+
+    def test_entry_list_page(self):
+        """エントリー一覧のページが (tenant, user, -reported_at, id) の順に読まれ、並べ替えが発生しない"""
+        page = (
+            Entry.objects.filter(user_id=self.users[0].pk, tenant_id=self.tenant.pk)
+            .order_by('-reported_at', 'id')
+            .values('id', 'reported_at', 'stress_score', 'motivation_score')[:50]
+        )
+        self.assertUsesIndex(page, 'entry_user_recent_idx')
+
+    def test_entry_list_next_page(self):
+        """カーソルで次のページを読む場合も同じインデックスで並べ替えなしに読まれる"""
+        page = (
+            Entry.objects.filter(user_id=self.users[0].pk, tenant_id=self.tenant.pk, reported_at__lt=self.date_from)
+            .order_by('-reported_at', 'id')
+            .values('id', 'reported_at')[:50]
+        )
+        self.assertUsesIndex(page, 'entry_user_recent_idx')
+
+    def test_rollup_refresh(self):
+        """チーム日次集計の再計算（1チーム・1日）がインデックスで該当行のみを読む"""
+        entries = scored_entries().filter(
+            tenant_id=self.tenant.pk, team_id=self.teams[0].pk, reported_at=self.date_to,
+        )
+        self.assertUsesIndex(entries, 'entry_team_date_cover_idx', ordered=False)
+
+    def test_team_summary(self):
+        """チーム集計（summary）が team_daily_stats のインデックスを使う"""
+        stats = TeamDailyStats.objects.filter(
+            tenant_id=self.tenant.pk, date__gte=self.date_from, date__lte=self.date_to, team_id__in=[self.teams[0].pk],
+        ).order_by('team_id', 'date')
+        plan = self.explain(stats)
+        self.assertTrue(re.search(r'SEARCH team_daily_stats USING (COVERING )?INDEX', plan), plan)
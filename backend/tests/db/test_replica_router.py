@@ -0,0 +1,163 @@
+import os
+import tempfile
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.db_routers import (
+    PRIMARY_READS_COOKIE,
+    REPLICA_ALIAS,
+    PrimaryReplicaRouter,
+    primary_reads,
+    replica_reads,
+    replica_reads_enabled,
+)
+from backend.models import Entry, Team, Tenant
+from backend.models.user import UserRole
+from backend.stats.cache import reset_team_entry_cache
+
+TEAM_ENTRY_CACHE = {'ENABLED': True, 'ALIAS': 'default', 'TIMEOUT': 300, 'KEY_PREFIX': 'team-entries'}
+
+
+class ReplicaDatabaseTestCase(TestCase):
+    """
+    default とは別ファイルの SQLite を replica として追加し、実際の接続で振り分けを確認するテストの基底クラス
+
+    replica には default と異なる値（遅延したレプリカを想定）を入れ、レスポンスの値から
+    どちらのデータベースを読んだかを判定する。
+    """
+    @classmethod
+    def setUpClass(cls):
+        # テストランナーが準備する接続には含めず、このクラスの実行中だけ replica を定義する
+        cls._replica_dir = tempfile.TemporaryDirectory()
+        connections.settings[REPLICA_ALIAS] = {
+            **connections.settings['default'],
+            'NAME': os.path.join(cls._replica_dir.name, 'replica.sqlite3'),
+        }
+        cls.databases = {'default', REPLICA_ALIAS}
+        # マイグレーションはルーターが replica で実行しないため、テーブルを直接作成する
+        with connections[REPLICA_ALIAS].schema_editor() as editor:
+            for model in (Tenant, Team, get_user_model(), Entry):
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_ALIAS].close()
+        del connections[REPLICA_ALIAS]
+        del connections.settings[REPLICA_ALIAS]
+        cls.databases = {'default'}
+        cls._replica_dir.cleanup()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls._create_data('default', '', 50)
+        cls._create_data(REPLICA_ALIAS, ' (replica)', 10)
+        cls.tenant = Tenant.objects.get(pk=1)
+        cls.team = Team.objects.get(pk=1)
+        cls.admin = get_user_model().objects.get(pk=1)
+
+    @classmethod
+    def _create_data(cls, alias, suffix, score):
+        tenant = Tenant.objects.using(alias).create(pk=1, name="Test Tenant")
+        team = Team.objects.using(alias).create(pk=1, name=f"Team{suffix}", tenant=tenant)
+        user = get_user_model().objects.db_manager(alias).create_user(
+            email="admin@test.com", password="testpass123", name="Admin",
+            role=UserRole.ADMIN.value, tenant=tenant, pk=1,
+        )
+        Entry.objects.using(alias).bulk_create([
+            Entry(tenant=tenant, user=user, team=team, reported_at=date.today(),
+                  stress_score=score, motivation_score=score, score_status='scored'),
+        ])
+
+    def setUp(self):
+        caches['default'].clear()
+        reset_team_entry_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+
+class TestPrimaryReplicaRouter(ReplicaDatabaseTestCase):
+    """PrimaryReplicaRouter の振り分けをテストするクラス"""
+
+    def test_reads_go_to_default_outside_replica_reads(self):
+        self.assertEqual(Team.objects.get(pk=1).name, 'Team')
+
+    def test_reads_go_to_replica_inside_replica_reads(self):
+        with replica_reads():
+            self.assertEqual(Team.objects.get(pk=1).name, 'Team (replica)')
+            with primary_reads():
+                self.assertEqual(Team.objects.get(pk=1).name, 'Team')
+            Team.objects.filter(pk=1).update(name='Renamed')
+        self.assertEqual(Team.objects.get(pk=1).name, 'Renamed')
+        self.assertEqual(Team.objects.using(REPLICA_ALIAS).get(pk=1).name, 'Team (replica)')
+
+
+class TestReplicaMirror(SimpleTestCase):
+    """レプリカが default のミラー・未定義の場合の振り分けをテストするクラス"""
+
+    def test_reads_stay_on_default_when_replica_mirrors_default(self):
+        # テスト実行時の settings.DATABASES は replica を定義しないか、default のミラーにする
+        with replica_reads():
+            self.assertIsNone(PrimaryReplicaRouter().db_for_read(Entry))
+
+    def test_migrations_only_run_on_default(self):
+        router = PrimaryReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'backend'))
+        self.assertFalse(router.allow_migrate('replica', 'backend'))
+
+
+class TestReplicaReadViews(ReplicaDatabaseTestCase):
+    """ReplicaReadMixin を使うビューがどの読み取りをレプリカに振り分けるかをテストするクラス"""
+
+    def test_list_reads_use_replica_and_detail_reads_do_not(self):
+        """一覧APIはレプリカ、詳細APIは default を読むことをテスト"""
+        response = self.client.get(reverse('teams-list', kwargs={'tenants_pk': self.tenant.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['name'], 'Team (replica)')
+
+        response = self.client.get(reverse('teams-detail', kwargs={'tenants_pk': self.tenant.pk, 'pk': self.team.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Team')
+        self.assertFalse(replica_reads_enabled())
+
+    def test_team_entry_reads_use_replica_without_response_cache(self):
+        """レスポンスキャッシュを使わない場合はチーム別エントリー集約をレプリカから読むことをテスト"""
+        response = self.client.get(reverse('team-entries-list', kwargs={'tenants_pk': self.tenant.pk}))
+        self.assertEqual(response.data[0]['users'][0]['entries']['stress_values'], [10])
+
+    @override_settings(TEAM_ENTRY_CACHE=TEAM_ENTRY_CACHE)
+    def test_team_entry_cache_fill_reads_primary(self):
+        """キャッシュに保存する集約は default から読むことをテスト"""
+        with self.assertLogs('backend.stats.cache', level='WARNING'):
+            response = self.client.get(reverse('team-entries-list', kwargs={'tenants_pk': self.tenant.pk}))
+        self.assertIn('ETag', response)
+        self.assertEqual(response.data[0]['users'][0]['entries']['stress_values'], [50])
+
+    def test_reads_after_write_use_primary(self):
+        """書き込みに成功したクライアントの直後の読み取りは default に送ることをテスト"""
+        url = reverse('entries-list', kwargs={'tenants_pk': self.tenant.pk})
+        response = self.client.put(
+            reverse('entries-daily', kwargs={
+                'tenants_pk': self.tenant.pk, 'team_pk': self.team.pk, 'reported_at': '2024-01-01',
+            }),
+            {'answers': {'q1': '順調です'}}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(PRIMARY_READS_COOKIE, response.cookies)
+
+        # Cookie を持つクライアントは書き込んだエントリーを読める
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['results']), 2)
+
+        # 他のクライアントは引き続きレプリカを読む
+        other = APIClient()
+        other.force_authenticate(user=self.admin)
+        self.assertEqual(len(other.get(url).data['results']), 1)
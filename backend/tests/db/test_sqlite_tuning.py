@@ -0,0 +1,58 @@
+import os
+import sqlite3
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from backend.sqlite_tuning import apply_sqlite_pragmas, get_sqlite_tuning, pragma_statements
+
+
+class TestSqliteTuning(SimpleTestCase):
+    """SQLite の PRAGMA の組み立て・適用をテストするクラス"""
+
+    def test_pragma_statements(self):
+        statements = pragma_statements({'JOURNAL_MODE': 'WAL', 'BUSY_TIMEOUT': 3000, 'CACHE_SIZE': -2000, 'MMAP_SIZE': ''})
+        self.assertEqual(statements, [
+            'PRAGMA journal_mode = WAL',
+            'PRAGMA busy_timeout = 3000',
+            'PRAGMA cache_size = -2000',
+        ])
+
+    def test_rejects_values_that_are_not_identifiers_or_integers(self):
+        with self.assertRaises(ImproperlyConfigured):
+            pragma_statements({'JOURNAL_MODE': 'WAL; DROP TABLE entry'})
+
+    def test_applies_pragmas_to_file_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            raw = sqlite3.connect(os.path.join(directory, 'db.sqlite3'))
+            try:
+                apply_sqlite_pragmas(raw, get_sqlite_tuning())
+                self.assertEqual(raw.execute('PRAGMA journal_mode').fetchone(), ('wal',))
+                self.assertEqual(raw.execute('PRAGMA synchronous').fetchone(), (1,))
+                self.assertEqual(raw.execute('PRAGMA busy_timeout').fetchone(), (5000,))
+                self.assertEqual(raw.execute('PRAGMA temp_store').fetchone(), (2,))
+            finally:
+                raw.close()
+
+    @override_settings(SQLITE_TUNING={'ENABLED': False})
+    def test_disabled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            raw = sqlite3.connect(os.path.join(directory, 'db.sqlite3'))
+            try:
+                apply_sqlite_pragmas(raw)
+                self.assertEqual(raw.execute('PRAGMA journal_mode').fetchone(), ('delete',))
+            finally:
+                raw.close()
+
+
+class TestSqliteConnectionCreated(TestCase):
+    """Django の新しい接続に PRAGMA が適用されることをテストするクラス"""
+
+    def test_connection_has_busy_timeout(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], int(get_sqlite_tuning()['BUSY_TIMEOUT']))
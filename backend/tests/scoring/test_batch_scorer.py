@@ -0,0 +1,78 @@
+import json
+import re
+
+from django.test import SimpleTestCase
+
+from backend.models import Entry
+from backend.models.entry import ScoreStatus
+from backend.scoring.batch import BatchParseError, BatchScorer, parse_batch_response
+from backend.scoring.cache import LocMemScoreCache
+from backend.scoring.client import FakeScoringClient
+
+
+def batch_responder(prompt):
+    """プロンプト内の [番号] ごとに index を使ったスコアを返す"""
+    indexes = [int(i) for i in re.findall(r'^\[(\d+)\]$', prompt, re.MULTILINE)]
+    return json.dumps([
+        {'index': i, 'stress_score': i, 'motivation_score': 100 - i} for i in indexes
+    ])
+
+
+class TestBatchScorer(SimpleTestCase):
+    """
+    バッチ採点をテストするクラス
+    """
+
+    def _entries(self, count):
+        return [
+            Entry(pk=i + 1, questions={'q1': '調子は？'}, answers={'q1': f'回答{i}'})
+            for i in range(count)
+        ]
+
+    def test_packs_entries_into_batches(self):
+        """複数エントリーが batch_size ごとに1回の呼び出しで採点されることをテスト"""
+        client = FakeScoringClient(responder=batch_responder)
+        scorer = BatchScorer(client=client, cache=LocMemScoreCache(), batch_size=4)
+        entries = self._entries(10)
+
+        failed = scorer.score_entries(entries)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(len(client.calls), 3)
+        self.assertEqual([e.stress_score for e in entries[:4]], [0, 1, 2, 3])
+        self.assertEqual(entries[5].motivation_score, 99)
+        self.assertTrue(all(e.score_status == ScoreStatus.SCORED for e in entries))
+
+    def test_falls_back_to_per_entry_calls(self):
+        """バッチ応答が不正な場合に1件ずつの呼び出しへフォールバックすることをテスト"""
+        def responder(prompt):
+            if '件の質問と回答' in prompt:
+                return 'not json'
+            return json.dumps({'stress_score': 7, 'motivation_score': 8})
+
+        client = FakeScoringClient(responder=responder)
+        scorer = BatchScorer(client=client, cache=LocMemScoreCache(), batch_size=5)
+        entries = self._entries(3)
+
+        failed = scorer.score_entries(entries)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(len(client.calls), 4)
+        self.assertTrue(all(e.stress_score == 7 for e in entries))
+
+    def test_cached_entries_skip_client(self):
+        """キャッシュ済みのエントリーがLLMに送られないことをテスト"""
+        cache = LocMemScoreCache()
+        client = FakeScoringClient(responder=batch_responder)
+        BatchScorer(client=client, cache=cache).score_entries(self._entries(3))
+        BatchScorer(client=client, cache=cache).score_entries(self._entries(3))
+
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(cache.stats.hits, 3)
+
+    def test_parse_rejects_missing_index(self):
+        """件数が不足する応答がエラーになることをテスト"""
+        text = '```json\n[{"index": 0, "stress_score": 1, "motivation_score": 2}]\n```'
+        self.assertEqual(parse_batch_response(text, 1)[0]['stress_score'], 1)
+        with self.assertRaises(BatchParseError):
+            parse_batch_response(text, 2)
@@ -0,0 +1,169 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from backend.models import Entry, ScoringJob, Team, Tenant
+from backend.models.entry import ScoreStatus
+from backend.models.scoring_job import ScoringJobStatus
+from backend.scoring.breaker import CircuitBreaker, CircuitOpenError, CircuitState, reset_circuit_breaker
+from backend.scoring.cache import reset_score_cache
+from backend.scoring.client import (
+    BedrockScoringClient,
+    FakeScoringClient,
+    reset_scoring_client,
+    set_scoring_client,
+)
+from backend.scoring.queue import get_scoring_queue
+
+SYNC_QUEUE = {
+    'BACKEND': 'backend.scoring.queue.SyncScoringQueue',
+    'MAX_WORKERS': 1,
+    'MAX_RETRIES': 0,
+    'RETRY_BACKOFF': 0,
+}
+BREAKER = {'ENABLED': True, 'FAILURE_THRESHOLD': 2, 'RESET_TIMEOUT': 60}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail():
+    raise RuntimeError('down')
+
+
+class TestCircuitBreaker(SimpleTestCase):
+    """
+    サーキットブレーカーの状態遷移をテストするクラス
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=self.clock)
+
+    def _trip(self):
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                self.breaker.call(fail)
+
+    def test_opens_after_consecutive_failures(self):
+        """連続失敗で open になり、呼び出しを行わずに失敗することをテスト"""
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(fail)
+        self.breaker.call(lambda: 'ok')  # 成功で連続失敗回数がリセットされる
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+        self._trip()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        calls = []
+        self.clock.now = 4
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.call(lambda: calls.append(1))
+        self.assertEqual(calls, [])
+        self.assertEqual(raised.exception.retry_after, 6)
+        self.assertEqual(self.breaker.stats.short_circuited, 1)
+
+    def test_half_open_trial(self):
+        """cool-down 後は1件だけ試行し、成功で closed・失敗で open に戻ることをテスト"""
+        self._trip()
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+
+        self.breaker.allow()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.allow()  # 試行中は他の呼び出しを通さない
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        self.clock.now = 20
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.assertEqual(
+            {key: self.breaker.stats.as_dict()[key] for key in ('opened', 'half_opened', 'closed')},
+            {'opened': 2, 'half_opened': 2, 'closed': 1},
+        )
+
+    def test_disabled_breaker_passes_through(self):
+        """無効化したブレーカーは失敗が続いても呼び出しを通すことをテスト"""
+        self.breaker.enabled = False
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                self.breaker.call(fail)
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+
+    @override_settings(AWS_BEDROCK_CONNECT_TIMEOUT=2, AWS_BEDROCK_READ_TIMEOUT=5, AWS_BEDROCK_MAX_ATTEMPTS=1)
+    def test_bedrock_client_timeouts(self):
+        """Bedrock クライアントに接続・読み取りタイムアウトと試行回数が設定されることをテスト"""
+        config = BedrockScoringClient(region='ap-northeast-1', model_id='test-model')._build_client_config()
+        self.assertEqual(config.connect_timeout, 2)
+        self.assertEqual(config.read_timeout, 5)
+        self.assertEqual(config.retries['max_attempts'], 1)
+
+
+@override_settings(SCORING_CIRCUIT_BREAKER=BREAKER)
+class TestCircuitBreakerQueue(TestCase):
+    """
+    サーキットブレーカーとスコア計算キューの連携をテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant)
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="testpass123", name="User", tenant=cls.tenant
+        )
+
+    def setUp(self):
+        reset_circuit_breaker()
+        self.client = FakeScoringClient(responder=lambda message: fail())
+        set_scoring_client(self.client)
+
+    def tearDown(self):
+        reset_circuit_breaker()
+        reset_scoring_client()
+        reset_score_cache()
+
+    def _create_entry(self, day):
+        return Entry.objects.create(
+            tenant=self.tenant, user=self.user, team=self.team,
+            questions={'q1': '調子は？'}, answers={'q1': f'回答{day}'}, reported_at=date(2025, 1, day),
+        )
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_open_circuit_leaves_entries_pending(self):
+        """ブレーカーが開いた後の保存はAIを呼び出さず pending のまま残ることをテスト"""
+        for day in (1, 2):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._create_entry(day)
+        self.assertEqual(len(self.client.calls), 2)
+        self.assertEqual(Entry.objects.filter(score_status=ScoreStatus.FAILED).count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = self._create_entry(3)
+
+        self.assertEqual(len(self.client.calls), 2)
+        entry.refresh_from_db()
+        self.assertEqual(entry.score_status, ScoreStatus.PENDING)
+
+    @override_settings(SCORING_QUEUE={**SYNC_QUEUE, 'BACKEND': 'backend.scoring.queue.DatabaseScoringQueue'})
+    def test_database_queue_reschedules_without_attempt(self):
+        """データベースキューは試行回数を増やさずにブレーカーの再開時刻へ再スケジュールすることをテスト"""
+        for day in (1, 2, 3):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._create_entry(day)
+        queue = get_scoring_queue()
+        for job_id in queue.claim_due_jobs(10):
+            queue.run_job(job_id)
+
+        self.assertEqual(len(self.client.calls), 2)
+        jobs = list(ScoringJob.objects.order_by('id'))
+        self.assertEqual([job.attempts for job in jobs], [1, 1, 0])
+        self.assertEqual(jobs[2].status, ScoringJobStatus.PENDING)
+        self.assertGreater(jobs[2].next_attempt_at, jobs[1].next_attempt_at)
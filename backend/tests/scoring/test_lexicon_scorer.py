@@ -0,0 +1,143 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from backend.models import Entry, Team, TeamDailyStats, Tenant
+from backend.models.entry import ScoreStatus
+from backend.scoring.breaker import reset_circuit_breaker
+from backend.scoring.cache import reset_score_cache
+from backend.scoring.client import FakeScoringClient, reset_scoring_client, set_scoring_client
+from backend.scoring.lexicon import LexiconScoringClient
+from backend.scoring.policy import SCORERS, build_scoring_policy
+from backend.scoring.scorer import Scorer
+
+SYNC_QUEUE = {
+    'BACKEND': 'backend.scoring.queue.SyncScoringQueue',
+    'MAX_WORKERS': 1,
+    'MAX_RETRIES': 0,
+    'RETRY_BACKOFF': 0,
+}
+
+
+class TestLexiconScoringClient(SimpleTestCase):
+    """
+    語句辞書によるローカルスコアラーをテストするクラス
+    """
+
+    def setUp(self):
+        self.scorer = LexiconScoringClient()
+
+    def test_positive_and_negative_answers(self):
+        """前向きな回答と疲れた回答でスコアが逆方向に動くことをテスト"""
+        positive = self.scorer.score({'q1': '調子は？'}, {'q1': '仕事が楽しいし、やる気も充実しています'})
+        negative = self.scorer.score({'q1': '調子は？'}, {'q1': '残業続きで疲れて、眠れない日が多い'})
+
+        self.assertGreater(positive['motivation_score'], 50)
+        self.assertLess(positive['stress_score'], 50)
+        self.assertGreater(negative['stress_score'], 50)
+        self.assertLess(negative['motivation_score'], 50)
+        self.assertIn('疲れ', negative['stress_reason'])
+
+    def test_longest_phrase_wins(self):
+        """否定形の語句が短い語句より優先して一致することをテスト"""
+        scores = self.scorer.score(None, {'q1': 'やる気が出ない'})
+        self.assertLess(scores['motivation_score'], 50)
+
+    def test_neutral_and_clamped(self):
+        """該当語がない場合は基準値、加点が大きい場合は0-100に収まることをテスト"""
+        self.assertEqual(self.scorer.score(None, {'q1': '特になし'})['stress_score'], 50)
+        self.assertEqual(self.scorer.score(None, None)['motivation_score'], 50)
+        scores = self.scorer.score(None, {'q1': '限界 ' * 10})
+        self.assertEqual(scores['stress_score'], 100)
+
+    def test_scorers_implement_scorer_protocol(self):
+        """方針が選ぶスコアラーはどちらも score() を持ち、ローカルスコアラーはLLMの問い合わせを持たないことをテスト"""
+        set_scoring_client(FakeScoringClient())
+        self.addCleanup(reset_scoring_client)
+        for name, factory in SCORERS.items():
+            with self.subTest(scorer=name):
+                self.assertIsInstance(factory(), Scorer)
+        self.assertFalse(hasattr(self.scorer, 'complete'))
+
+    @override_settings(SCORING_POLICY={'SCORER': 'llm', 'PROVISIONAL': True, 'FALLBACK': False})
+    def test_policy_from_domain_settings(self):
+        """テナントの domain_settings が既定の方針を上書きし、未知のスコアラーは無視されることをテスト"""
+        self.assertEqual(
+            build_scoring_policy({'scoring': {'scorer': 'lexicon', 'fallback': True}}),
+            {'scorer': 'lexicon', 'provisional': True, 'fallback': True},
+        )
+        self.assertEqual(build_scoring_policy({'scoring': {'scorer': 'unknown'}})['scorer'], 'llm')
+
+
+@override_settings(SCORING_QUEUE=SYNC_QUEUE)
+class TestTenantScoringPolicy(TestCase):
+    """
+    テナントごとのスコア計算の方針とエントリー保存の連携をテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant)
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="testpass123", name="User", tenant=cls.tenant
+        )
+
+    def setUp(self):
+        self.client = FakeScoringClient(scores={'stress_score': 11, 'motivation_score': 22})
+        set_scoring_client(self.client)
+
+    def tearDown(self):
+        reset_scoring_client()
+        reset_score_cache()
+        reset_circuit_breaker()
+
+    def _set_policy(self, **scoring):
+        Tenant.objects.filter(pk=self.tenant.pk).update(domain_settings={'scoring': scoring})
+
+    def _create_entry(self, execute=True):
+        with self.captureOnCommitCallbacks(execute=execute):
+            entry = Entry.objects.create(
+                tenant_id=self.tenant.pk, user=self.user, team=self.team,
+                questions={'q1': '調子は？'}, answers={'q1': '毎日楽しいです'}, reported_at=date(2025, 1, 1),
+            )
+        return entry
+
+    def test_lexicon_scorer_scores_on_save(self):
+        """主スコアラーがローカルの場合は保存時に確定し、LLMを呼び出さないことをテスト"""
+        self._set_policy(scorer='lexicon')
+        entry = self._create_entry(execute=False)
+
+        self.assertEqual(entry.score_status, ScoreStatus.SCORED)
+        self.assertGreater(entry.motivation_score, 50)
+        self.assertEqual(self.client.calls, [])
+        self.assertTrue(TeamDailyStats.objects.filter(team=self.team).exists())
+
+    def test_provisional_scores_until_llm(self):
+        """provisional ではLLMの計算待ちの間ローカルの仮の値を持ち、計算後に置き換わることをテスト"""
+        self._set_policy(provisional=True)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            entry = self._create_entry(execute=False)
+        self.assertEqual(entry.score_status, ScoreStatus.PENDING)
+        self.assertGreater(entry.motivation_score, 50)
+
+        for callback in callbacks:
+            callback()
+        entry.refresh_from_db()
+        self.assertEqual(entry.score_status, ScoreStatus.SCORED)
+        self.assertEqual(entry.motivation_score, 22)
+
+    def test_fallback_estimates_after_failure(self):
+        """fallback ではLLMの計算を諦めたエントリーをローカルの推定値で確定することをテスト"""
+        self._set_policy(fallback=True)
+        self.client.responder = lambda message: (_ for _ in ()).throw(RuntimeError('down'))
+
+        entry = self._create_entry()
+        entry.refresh_from_db()
+
+        self.assertEqual(entry.score_status, ScoreStatus.ESTIMATED)
+        self.assertGreater(entry.motivation_score, 50)
+        self.assertEqual(TeamDailyStats.objects.get(team=self.team).count, 1)
+        # 推定値のエントリーは同じ回答で保存しても再計算の対象になる
+        self.assertTrue(entry.needs_scoring())
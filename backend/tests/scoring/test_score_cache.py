@@ -0,0 +1,169 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from backend.models import Entry, ScoreCacheEntry
+from backend.scoring.cache import (
+    DatabaseScoreCache,
+    DjangoScoreCache,
+    LocMemScoreCache,
+    make_score_cache_key,
+    reset_score_cache,
+)
+from backend.scoring.client import FakeScoringClient, reset_scoring_client, set_scoring_client
+
+SCORES = {'stress_score': 30, 'motivation_score': 80}
+
+
+class TestScoreCacheKey(SimpleTestCase):
+    """
+    キャッシュキー生成をテストするクラス
+    """
+
+    def test_key_is_stable_across_formatting(self):
+        """キー順・空白・全角半角の揺れで同じキーになることをテスト"""
+        key1 = make_score_cache_key({'q1': '調子は？', 'q2': '睡眠'}, {'q1': '元気 です', 'q2': '７時間'}, 'model')
+        key2 = make_score_cache_key({'q2': '睡眠', 'q1': '調子は？'}, {'q2': '7時間', 'q1': ' 元気  です '}, 'model')
+        self.assertEqual(key1, key2)
+
+    def test_key_depends_on_model(self):
+        """モデルIDが異なる場合は別のキーになることをテスト"""
+        self.assertNotEqual(
+            make_score_cache_key({}, {'q1': 'a'}, 'model-a'),
+            make_score_cache_key({}, {'q1': 'a'}, 'model-b'),
+        )
+
+    def test_key_depends_on_prompt_version(self):
+        """プロンプトの版が異なる場合は別のキーになることをテスト"""
+        self.assertNotEqual(
+            make_score_cache_key({}, {'q1': 'a'}, 'model', 'prompt-1'),
+            make_score_cache_key({}, {'q1': 'a'}, 'model', 'prompt-2'),
+        )
+
+
+class TestLocMemScoreCache(SimpleTestCase):
+    """
+    プロセス内LRUキャッシュをテストするクラス
+    """
+
+    def test_hit_and_miss_counters(self):
+        """2回目の計算がキャッシュから返されることをテスト"""
+        cache = LocMemScoreCache(timeout=60, max_entries=10)
+        compute = mock.Mock(return_value=SCORES)
+
+        cache.get_or_compute({}, {'q1': 'a'}, 'model', compute)
+        result = cache.get_or_compute({}, {'q1': 'a'}, 'model', compute)
+
+        self.assertEqual(result, SCORES)
+        compute.assert_called_once()
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.hit_rate, 0.5)
+
+    def test_lru_eviction(self):
+        """MAX_ENTRIES を超えると最も古く使われたキーが追い出されることをテスト"""
+        cache = LocMemScoreCache(timeout=None, max_entries=2)
+        cache.set('a', SCORES)
+        cache.set('b', SCORES)
+        cache.get('a')
+        cache.set('c', SCORES)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_ttl_expiry(self):
+        """TTLを過ぎたエントリーが返されないことをテスト"""
+        cache = LocMemScoreCache(timeout=10, max_entries=None)
+        with mock.patch('backend.scoring.cache.time.monotonic', return_value=100.0):
+            cache.set('a', SCORES)
+        with mock.patch('backend.scoring.cache.time.monotonic', return_value=111.0):
+            self.assertIsNone(cache.get('a'))
+
+    def test_failed_compute_not_cached(self):
+        """計算失敗時は何も保存されないことをテスト"""
+        cache = LocMemScoreCache(timeout=60, max_entries=10)
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute({}, {'q1': 'a'}, 'model', mock.Mock(side_effect=RuntimeError))
+        self.assertEqual(len(cache), 0)
+
+
+class TestDatabaseScoreCache(TestCase):
+    """
+    DBテーブルキャッシュをテストするクラス
+    """
+
+    def test_set_and_cull(self):
+        """保存・取得と MAX_ENTRIES 超過時の削除をテスト"""
+        cache = DatabaseScoreCache(timeout=60, max_entries=2, CULL_EVERY=1)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, SCORES)
+
+        self.assertEqual(ScoreCacheEntry.objects.count(), 2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), SCORES)
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_cull_runs_every_n_sets(self):
+        """削除処理が CULL_EVERY 回の保存ごとにだけ実行されることをテスト"""
+        cache = DatabaseScoreCache(timeout=60, max_entries=2, CULL_EVERY=3)
+        with mock.patch.object(cache, 'cull', wraps=cache.cull) as cull:
+            for key in ('a', 'b', 'c', 'd'):
+                cache.set(key, SCORES)
+        self.assertEqual(cull.call_count, 1)
+        self.assertEqual(ScoreCacheEntry.objects.count(), 3)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'score-cache-test'},
+})
+class TestDjangoScoreCache(SimpleTestCase):
+    """
+    Django キャッシュフレームワークを使うキャッシュをテストするクラス
+    """
+
+    def test_clear_keeps_other_keys(self):
+        """clear() がこのキャッシュのキーだけを無効化することをテスト"""
+        cache = DjangoScoreCache(timeout=60)
+        cache.set('a', SCORES)
+        cache.cache.set('other', 'value')
+
+        cache.clear()
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.cache.get('other'), 'value')
+        cache.set('a', SCORES)
+        self.assertEqual(cache.get('a'), SCORES)
+
+
+@override_settings(SCORE_CACHE={'BACKEND': 'backend.scoring.cache.LocMemScoreCache'})
+class TestEntryScoreCache(SimpleTestCase):
+    """
+    Entry.calculate_scores() とキャッシュの連携をテストするクラス
+    """
+
+    def tearDown(self):
+        reset_scoring_client()
+        reset_score_cache()
+
+    def test_repeat_submission_skips_client(self):
+        """同じ回答の再提出でクライアントが呼ばれないことをテスト"""
+        fake = FakeScoringClient(scores=SCORES)
+        set_scoring_client(fake)
+
+        Entry(questions={'q1': '調子は？'}, answers={'q1': '元気'}).calculate_scores()
+        scores = Entry(questions={'q1': '調子は？'}, answers={'q1': '元気'}).calculate_scores()
+
+        self.assertEqual(scores['stress_score'], 30)
+        self.assertEqual(len(fake.calls), 1)
+
+    def test_prompt_change_skips_cached_scores(self):
+        """採点プロンプトを変更した後はキャッシュ済みのスコアを使わないことをテスト"""
+        fake = FakeScoringClient(scores=SCORES)
+        set_scoring_client(fake)
+
+        Entry(questions={'q1': '調子は？'}, answers={'q1': '元気'}).calculate_scores()
+        with mock.patch.object(FakeScoringClient, 'prompt_version', 'changed'):
+            Entry(questions={'q1': '調子は？'}, answers={'q1': '元気'}).calculate_scores()
+
+        self.assertEqual(len(fake.calls), 2)
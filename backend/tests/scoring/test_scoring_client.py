@@ -0,0 +1,77 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from backend.models import Entry
+from backend.scoring.cache import reset_score_cache
+from backend.scoring.client import (
+    BedrockScoringClient,
+    FakeScoringClient,
+    build_score_prompt,
+    get_scoring_client,
+    reset_scoring_client,
+    set_scoring_client,
+)
+
+
+class TestScoringClient(SimpleTestCase):
+    """
+    スコア計算クライアント層をテストするクラス
+    """
+
+    def tearDown(self):
+        reset_scoring_client()
+        reset_score_cache()
+
+    @override_settings(AI_SCORING_CLIENT='backend.scoring.client.FakeScoringClient')
+    def test_get_scoring_client_is_process_wide(self):
+        """設定から生成したクライアントが使い回されることをテスト"""
+        client = get_scoring_client()
+        self.assertIsInstance(client, FakeScoringClient)
+        self.assertIs(get_scoring_client(), client)
+
+    def test_injected_client_used_by_entry(self):
+        """注入したフェイククライアントが Entry.calculate_scores() で使われることをテスト"""
+        fake = FakeScoringClient(scores={'stress_score': 10, 'motivation_score': 90})
+        set_scoring_client(fake)
+
+        entry = Entry(questions={'q1': '調子は？'}, answers={'q1': '絶好調'})
+        scores = entry.calculate_scores()
+
+        self.assertEqual(scores['stress_score'], 10)
+        self.assertEqual(len(fake.calls), 1)
+        self.assertIn('q1: 絶好調', fake.calls[0])
+
+    @override_settings(AWS_BEDROCK_REGION='ap-northeast-1', AWS_BEDROCK_MODEL_ID='test-model')
+    def test_bedrock_client_created_once(self):
+        """boto3 クライアントが遅延生成され、スレッド間で1度だけ生成されることをテスト"""
+        bedrock = BedrockScoringClient()
+        self.assertEqual(bedrock.model_id, 'test-model')
+
+        with mock.patch('boto3.session.Session') as session_class:
+            boto_client = session_class.return_value.client.return_value
+            boto_client.converse.return_value = {
+                'output': {'message': {'content': [{'text': '{"stress_score": 1, "motivation_score": 2}'}]}}
+            }
+            threads = [
+                threading.Thread(target=bedrock.score, args=({'q': 'a'}, {'q': 'b'}))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        session_class.return_value.client.assert_called_once()
+        self.assertEqual(
+            session_class.return_value.client.call_args.kwargs['region_name'],
+            'ap-northeast-1',
+        )
+        self.assertEqual(boto_client.converse.call_count, 8)
+        self.assertEqual(boto_client.converse.call_args.kwargs['modelId'], 'test-model')
+
+    def test_build_score_prompt_handles_missing_questions(self):
+        """質問がない場合でもプロンプトを生成できることをテスト"""
+        prompt = build_score_prompt(None, {'q1': '元気'})
+        self.assertIn('q1: 元気', prompt)
@@ -0,0 +1,342 @@
+import json
+import re
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from backend.models import Entry, ScoringJob, Team, Tenant
+from backend.models.entry import ScoreStatus
+from backend.models.scoring_job import ScoringJobStatus
+from backend.scoring.cache import reset_score_cache
+from backend.scoring.client import FakeScoringClient, reset_scoring_client, set_scoring_client
+from backend.scoring.queue import enqueue_scoring, get_scoring_queue
+from backend.scoring.worker import run_scoring, score_pending_entries
+
+SYNC_QUEUE = {
+    'BACKEND': 'backend.scoring.queue.SyncScoringQueue',
+    'MAX_WORKERS': 1,
+    'MAX_RETRIES': 2,
+    'RETRY_BACKOFF': 0,
+}
+DATABASE_QUEUE = {**SYNC_QUEUE, 'BACKEND': 'backend.scoring.queue.DatabaseScoringQueue'}
+
+SCORES = {'stress_score': 40, 'motivation_score': 70}
+
+
+class TestScoringQueue(TestCase):
+    """
+    Entry.save() とAIスコア計算キューの連携をテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant)
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="testpass123", name="User", tenant=cls.tenant
+        )
+
+    def _create_entry(self, answers=None):
+        return Entry.objects.create(
+            tenant=self.tenant,
+            user=self.user,
+            team=self.team,
+            questions={'q1': '調子はどうですか'},
+            answers=answers,
+        )
+
+    @staticmethod
+    def _enqueue_callbacks(callbacks):
+        # コミット時にはレスポンスキャッシュの無効化も登録されるため、キュー投入のみを数える
+        return [callback for callback in callbacks if getattr(callback, 'func', None) is enqueue_scoring]
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_save_returns_pending_before_commit(self):
+        """保存直後はスコア未計算（pending）であることをテスト"""
+        with mock.patch.object(Entry, 'calculate_scores', return_value=SCORES) as calculate:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                entry = self._create_entry({'q1': '元気です'})
+
+        self.assertEqual(entry.score_status, ScoreStatus.PENDING)
+        self.assertIsNone(entry.stress_score)
+        self.assertEqual(len(self._enqueue_callbacks(callbacks)), 1)
+        calculate.assert_not_called()
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_scores_written_back_after_commit(self):
+        """コミット後にキューがスコアを書き戻すことをテスト"""
+        with mock.patch.object(Entry, 'calculate_scores', return_value=SCORES):
+            with self.captureOnCommitCallbacks(execute=True):
+                entry = self._create_entry({'q1': '元気です'})
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.score_status, ScoreStatus.SCORED)
+        self.assertEqual(entry.stress_score, 40)
+        self.assertEqual(entry.motivation_score, 70)
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_retry_then_success(self):
+        """一時的な失敗後にリトライで成功することをテスト"""
+        with mock.patch.object(Entry, 'calculate_scores', side_effect=[RuntimeError('throttled'), SCORES]) as calculate:
+            with self.captureOnCommitCallbacks(execute=True):
+                entry = self._create_entry({'q1': '元気です'})
+
+        entry.refresh_from_db()
+        self.assertEqual(calculate.call_count, 2)
+        self.assertEqual(entry.score_status, ScoreStatus.SCORED)
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_retry_exhausted_marks_failed(self):
+        """リトライ上限を超えるとデフォルト値で確定することをテスト"""
+        with mock.patch.object(Entry, 'calculate_scores', side_effect=RuntimeError('down')) as calculate:
+            with self.captureOnCommitCallbacks(execute=True):
+                entry = self._create_entry({'q1': '元気です'})
+
+        entry.refresh_from_db()
+        self.assertEqual(calculate.call_count, 3)
+        self.assertEqual(entry.score_status, ScoreStatus.FAILED)
+        self.assertEqual(entry.stress_score, 0)
+        self.assertEqual(entry.motivation_score, 0)
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_no_answers_skips_queue(self):
+        """回答がない場合はキューに投入しないことをテスト"""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            entry = self._create_entry()
+
+        self.assertEqual(len(self._enqueue_callbacks(callbacks)), 0)
+        self.assertEqual(entry.score_status, ScoreStatus.SCORED)
+        self.assertEqual(entry.stress_score, 0)
+
+    @override_settings(SCORING_QUEUE=DATABASE_QUEUE)
+    def test_database_queue_reschedules_failed_job(self):
+        """データベースキューが失敗ジョブをバックオフ付きで再実行することをテスト"""
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = self._create_entry({'q1': '元気です'})
+
+        job = ScoringJob.objects.get(entry=entry)
+        self.assertEqual(job.status, ScoringJobStatus.PENDING)
+
+        queue = get_scoring_queue()
+        with mock.patch.object(Entry, 'calculate_scores', side_effect=RuntimeError('down')):
+            queue.run_job(queue.claim_due_jobs(10)[0])
+        job.refresh_from_db()
+        self.assertEqual(job.status, ScoringJobStatus.PENDING)
+        self.assertEqual(job.attempts, 1)
+
+        with mock.patch.object(Entry, 'calculate_scores', return_value=SCORES):
+            queue.run_job(queue.claim_due_jobs(10)[0])
+        job.refresh_from_db()
+        entry.refresh_from_db()
+        self.assertEqual(job.status, ScoringJobStatus.DONE)
+        self.assertEqual(entry.stress_score, 40)
+
+    @override_settings(SCORING_QUEUE={**DATABASE_QUEUE, 'LEASE_TIMEOUT': 60})
+    def test_database_queue_reclaims_expired_lease(self):
+        """running のままリースが切れたジョブを取得し直すことをテスト"""
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = self._create_entry({'q1': '元気です'})
+        job = ScoringJob.objects.get(entry=entry)
+
+        queue = get_scoring_queue()
+        self.assertEqual(queue.claim_due_jobs(10), [job.pk])
+        # 取得したワーカーが実行せずに停止した状態: リースの期限内は他のワーカーが取得しない
+        self.assertEqual(queue.claim_due_jobs(10), [])
+
+        ScoringJob.objects.filter(pk=job.pk).update(claimed_at=timezone.now() - timedelta(seconds=61))
+        with self.assertLogs('backend.scoring.queue', level='WARNING'):
+            self.assertEqual(queue.claim_due_jobs(10), [job.pk])
+        job.refresh_from_db()
+        self.assertEqual(job.status, ScoringJobStatus.RUNNING)
+        self.assertEqual(job.attempts, 1)
+
+        with mock.patch.object(Entry, 'calculate_scores', return_value=SCORES):
+            queue.run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ScoringJobStatus.DONE)
+        self.assertEqual(job.attempts, 2)
+
+    @override_settings(SCORING_QUEUE={**DATABASE_QUEUE, 'LEASE_TIMEOUT': 60})
+    def test_database_queue_gives_up_on_repeatedly_interrupted_job(self):
+        """中断を繰り返したジョブは再試行上限で失敗扱いにすることをテスト"""
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = self._create_entry({'q1': '元気です'})
+        ScoringJob.objects.filter(entry=entry).update(
+            status=ScoringJobStatus.RUNNING,
+            attempts=2,
+            claimed_at=timezone.now() - timedelta(seconds=61),
+        )
+
+        queue = get_scoring_queue()
+        with self.assertLogs('backend.scoring.queue', level='WARNING'):
+            job_id = queue.claim_due_jobs(10)[0]
+        with mock.patch.object(Entry, 'calculate_scores') as calculate_scores:
+            queue.run_job(job_id)
+        calculate_scores.assert_not_called()
+
+        job = ScoringJob.objects.get(pk=job_id)
+        entry.refresh_from_db()
+        self.assertEqual(job.status, ScoringJobStatus.FAILED)
+        self.assertEqual(entry.score_status, ScoreStatus.FAILED)
+
+    @override_settings(SCORING_QUEUE={**DATABASE_QUEUE, 'BATCH_SIZE': 20})
+    def test_database_queue_drains_jobs_in_batches(self):
+        """データベースキューが初回のジョブを BatchScorer でまとめて採点することをテスト"""
+        def responder(prompt):
+            indexes = re.findall(r'^\[(\d+)\]$', prompt, re.MULTILINE)
+            return json.dumps([{'index': int(i), 'stress_score': 10, 'motivation_score': 90} for i in indexes])
+
+        client = FakeScoringClient(responder=responder)
+        set_scoring_client(client)
+        reset_score_cache()
+        self.addCleanup(reset_scoring_client)
+        with self.captureOnCommitCallbacks(execute=True):
+            entries = [
+                Entry.objects.create(
+                    tenant=self.tenant, user=self.user, team=self.team, reported_at=date(2025, 1, day),
+                    questions={'q1': '調子はどうですか'}, answers={'q1': f'回答{day}'},
+                )
+                for day in (1, 2, 3)
+            ]
+
+        queue = get_scoring_queue()
+        queue.run_batch(queue.claim_due_jobs(10))
+
+        self.assertEqual(len(client.calls), 1)
+        jobs = ScoringJob.objects.filter(entry__in=entries)
+        self.assertEqual({(job.status, job.attempts) for job in jobs}, {(ScoringJobStatus.DONE, 1)})
+        self.assertEqual({entry.motivation_score for entry in Entry.objects.filter(pk__in=[e.pk for e in entries])}, {90})
+
+    @override_settings(SCORING_QUEUE={**DATABASE_QUEUE, 'BATCH_SIZE': 20})
+    def test_database_queue_reschedules_failed_batch(self):
+        """バッチで採点できなかったジョブは失敗1回として再スケジュールされることをテスト"""
+        with self.captureOnCommitCallbacks(execute=True):
+            entries = [
+                Entry.objects.create(
+                    tenant=self.tenant, user=self.user, team=self.team, reported_at=date(2025, 1, day),
+                    questions={'q1': '調子はどうですか'}, answers={'q1': f'回答{day}'},
+                )
+                for day in (1, 2)
+            ]
+
+        queue = get_scoring_queue()
+        with mock.patch('backend.scoring.queue.score_pending_entries', return_value=(1, {entries[1].pk})):
+            queue.run_batch(queue.claim_due_jobs(10))
+
+        jobs = {job.entry_id: job for job in ScoringJob.objects.all()}
+        self.assertEqual(jobs[entries[0].pk].status, ScoringJobStatus.DONE)
+        self.assertEqual(jobs[entries[1].pk].status, ScoringJobStatus.PENDING)
+        self.assertEqual(jobs[entries[1].pk].attempts, 1)
+
+    def _resave(self, entry_id, answers):
+        """スコア計算中にユーザーが回答を変更して再保存した状態を作る"""
+        entry = Entry.objects.get(pk=entry_id)
+        entry.answers = answers
+        with self.captureOnCommitCallbacks(execute=False):
+            entry.save()
+
+    def test_stale_job_does_not_overwrite_resaved_answers(self):
+        """計算中に再保存されたエントリーに古い回答のスコアを書き込まないことをテスト"""
+        with self.captureOnCommitCallbacks(execute=False):
+            entry = self._create_entry({'q1': '元気です'})
+
+        def calculate_then_resave(entry_self):
+            self._resave(entry.pk, {'q1': '疲れています'})
+            return SCORES
+
+        with mock.patch.object(Entry, 'calculate_scores', calculate_then_resave):
+            self.assertTrue(run_scoring(entry.pk))
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.answers, {'q1': '疲れています'})
+        self.assertEqual(entry.score_status, ScoreStatus.PENDING)
+        self.assertIsNone(entry.stress_score)
+
+        # 新しい回答のジョブは書き込める
+        with mock.patch.object(Entry, 'calculate_scores', return_value=SCORES):
+            run_scoring(entry.pk)
+        entry.refresh_from_db()
+        self.assertEqual(entry.score_status, ScoreStatus.SCORED)
+
+    def test_stale_batch_does_not_overwrite_resaved_answers(self):
+        """バッチ採点中に再保存されたエントリーだけ書き込まないことをテスト"""
+        with self.captureOnCommitCallbacks(execute=False):
+            entries = [
+                Entry.objects.create(
+                    tenant=self.tenant, user=self.user, team=self.team, reported_at=date(2025, 1, day),
+                    questions={'q1': '調子はどうですか'}, answers={'q1': f'回答{day}'},
+                )
+                for day in (1, 2)
+            ]
+
+        def responder(prompt):
+            self._resave(entries[1].pk, {'q1': '変更後の回答'})
+            indexes = re.findall(r'^\[(\d+)\]$', prompt, re.MULTILINE)
+            return json.dumps([{'index': int(i), 'stress_score': 10, 'motivation_score': 90} for i in indexes])
+
+        set_scoring_client(FakeScoringClient(responder=responder))
+        reset_score_cache()
+        self.addCleanup(reset_scoring_client)
+        score_pending_entries([entry.pk for entry in entries])
+
+        statuses = dict(Entry.objects.filter(pk__in=[e.pk for e in entries]).values_list('pk', 'score_status'))
+        self.assertEqual(statuses, {entries[0].pk: ScoreStatus.SCORED, entries[1].pk: ScoreStatus.PENDING})
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_save_without_answer_changes_skips_queue(self):
+        """質問・回答が変わらない保存では再計算しないことをテスト"""
+        with mock.patch.object(Entry, 'calculate_scores', return_value=SCORES):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._create_entry({'q1': '元気です'})
+
+        entry = Entry.objects.get(user=self.user)
+        entry.reported_at = entry.reported_at.replace(year=2024)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            entry.save()
+
+        self.assertEqual(len(self._enqueue_callbacks(callbacks)), 0)
+        entry.refresh_from_db()
+        self.assertEqual(entry.score_status, ScoreStatus.SCORED)
+        self.assertEqual(entry.stress_score, 40)
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_answer_change_requeues(self):
+        """回答が変わった保存、スコアが失敗した保存では再計算することをテスト"""
+        with mock.patch.object(Entry, 'calculate_scores', return_value=SCORES):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._create_entry({'q1': '元気です'})
+
+        entry = Entry.objects.get(user=self.user)
+        entry.answers = {'q1': '疲れています'}
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            entry.save()
+        self.assertEqual(len(self._enqueue_callbacks(callbacks)), 1)
+        self.assertEqual(entry.score_status, ScoreStatus.PENDING)
+
+        Entry.objects.filter(pk=entry.pk).update(score_status=ScoreStatus.FAILED, stress_score=0)
+        entry = Entry.objects.get(pk=entry.pk)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            entry.save()
+        self.assertEqual(len(self._enqueue_callbacks(callbacks)), 1)
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_update_fields_save_never_scores(self):
+        """update_fields 指定の保存では回答が変わっても再計算しないことをテスト"""
+        with mock.patch.object(Entry, 'calculate_scores', return_value=SCORES):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._create_entry({'q1': '元気です'})
+
+        entry = Entry.objects.get(user=self.user)
+        entry.answers = {'q1': '疲れています'}
+        with mock.patch.object(Entry, 'calculate_scores') as calculate:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                entry.save(update_fields=['answers'])
+
+        calculate.assert_not_called()
+        self.assertEqual(len(self._enqueue_callbacks(callbacks)), 0)
+        entry.refresh_from_db()
+        self.assertEqual(entry.answers, {'q1': '疲れています'})
+        self.assertEqual(entry.stress_score, 40)
@@ -0,0 +1,127 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.models import Entry, Team, Tenant
+from backend.models.user import UserRole
+from backend.serializers.entry_serializer import EntryDetailSerializer, EntryLeanSerializer
+from backend.serializers.lean import PLAN_CACHE_SIZE, LeanSerializer
+from backend.serializers.user_serializer import UserDetailSerializer
+
+
+class TestLeanSerializer(TestCase):
+    """
+    一覧・詳細APIの軽量シリアライザーをテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.teams = [Team.objects.create(name=f"Team {i}", tenant=cls.tenant) for i in range(2)]
+        cls.admin = User.objects.create_user(
+            email="admin@test.com", password="testpass123", name="Admin",
+            role=UserRole.ADMIN.value, tenant=cls.tenant
+        )
+        cls.member = User.objects.create_user(
+            email="member@test.com", password="testpass123", name="Member", tenant=cls.tenant
+        )
+        cls.member.teams.set(cls.teams)
+        Entry.objects.bulk_create([
+            Entry(
+                tenant=cls.tenant, user=cls.member, team=team, questions={'q1': '調子は？'},
+                answers={'q1': '元気です'}, stress_score=30, motivation_score=60, reported_at=date(2025, 1, day),
+            )
+            for day in range(1, 4) for team in cls.teams
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_entry_list_matches_detail_serializer(self):
+        """エントリー一覧・詳細が EntryDetailSerializer と同じ内容を返すことをテスト"""
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(reverse('entries-list', kwargs={'tenants_pk': self.tenant.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        entries = Entry.objects.filter(tenant=self.tenant).order_by('-reported_at', 'id')
+        expected = EntryDetailSerializer(entries, many=True).data
+        self.assertEqual(response.json()['results'], [dict(item) for item in expected])
+
+        detail = self.client.get(
+            reverse('entries-detail', kwargs={'tenants_pk': self.tenant.pk, 'pk': entries[0].pk})
+        )
+        self.assertEqual(detail.json(), dict(EntryDetailSerializer(entries[0]).data))
+
+    def test_user_list_matches_detail_serializer(self):
+        """ユーザー一覧・詳細が UserDetailSerializer と同じ内容を返すことをテスト"""
+        response = self.client.get(reverse('users-list', kwargs={'tenants_pk': self.tenant.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        users = get_user_model().objects.filter(tenant=self.tenant).order_by('id')
+        expected = [dict(item) for item in UserDetailSerializer(users, many=True).data]
+        self.assertEqual(response.json()['results'], expected)
+
+        detail = self.client.get(
+            reverse('users-detail', kwargs={'tenants_pk': self.tenant.pk, 'pk': self.member.pk})
+        )
+        self.assertEqual(detail.json(), dict(UserDetailSerializer(self.member).data))
+
+    def test_sparse_fieldset(self):
+        """?fields= で指定したフィールドのみ返すことをテスト"""
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(
+            reverse('entries-list', kwargs={'tenants_pk': self.tenant.pk}), {'fields': 'id,reported_at'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'reported_at'})
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(
+            reverse('users-list', kwargs={'tenants_pk': self.tenant.pk}), {'fields': 'name,teams'}
+        )
+        self.assertEqual(
+            response.json()['results'][1],
+            {'name': 'Member', 'teams': [{'id': team.pk, 'name': team.name} for team in self.teams]},
+        )
+
+    def test_unknown_field_rejected(self):
+        """未定義のフィールドを指定すると400を返すことをテスト"""
+        response = self.client.get(
+            reverse('entries-list', kwargs={'tenants_pk': self.tenant.pk}), {'fields': 'id,password'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.json())
+
+    def test_benchmark_command(self):
+        """ベンチマークコマンドが両方のシリアライザーの計測結果を出力することをテスト"""
+        out = StringIO()
+        call_command('benchmark_read_serializers', '--tenant', str(self.tenant.pk), '--repeat', '1', stdout=out)
+        self.assertIn('entries: drf=', out.getvalue())
+        self.assertIn('users: drf=', out.getvalue())
+
+    def test_benchmark_command_fields(self):
+        """ベンチマークコマンドがエントリー・ユーザーに別々のフィールドを渡し、未定義のフィールドはエラーにすることをテスト"""
+        out = StringIO()
+        call_command(
+            'benchmark_read_serializers', '--tenant', str(self.tenant.pk), '--repeat', '1',
+            '--entry-fields', 'id,reported_at', '--user-fields', 'id,name', stdout=out,
+        )
+        self.assertIn('users: drf=', out.getvalue())
+        with self.assertRaisesMessage(CommandError, 'users: 未定義のフィールドです: reported_at'):
+            call_command('benchmark_read_serializers', '--repeat', '1', '--user-fields', 'reported_at', stdout=out)
+
+    def test_plans_are_shared_across_field_order(self):
+        """?fields= の順序・重複が違っても同じプランを使い、プランのキャッシュが上限を超えないことをテスト"""
+        self.assertIs(EntryLeanSerializer(fields='id,reported_at').plan, EntryLeanSerializer(fields='reported_at,id,id').plan)
+        self.assertEqual([field.name for field in EntryLeanSerializer(fields='reported_at,id').plan], ['id', 'reported_at'])
+        for count in range(1, 10):
+            EntryLeanSerializer(fields=','.join(['id'] * count))
+        self.assertLessEqual(LeanSerializer._build_plan.cache_info().currsize, PLAN_CACHE_SIZE)
@@ -0,0 +1,171 @@
+import os
+import tempfile
+import threading
+from datetime import date
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase
+
+from backend.models import Entry, Team, TeamDailyStats, Tenant
+from backend.scoring.worker import apply_scores, mark_failed
+
+
+class TestTeamDailyStats(TestCase):
+    """
+    チーム日次集計（TeamDailyStats）の増分更新と再構築をテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant)
+        cls.other_team = Team.objects.create(name="Other Team", tenant=cls.tenant)
+        User = get_user_model()
+        cls.user1 = User.objects.create_user(
+            email="user1@test.com", password="testpass123", name="User 1", tenant=cls.tenant
+        )
+        cls.user2 = User.objects.create_user(
+            email="user2@test.com", password="testpass123", name="User 2", tenant=cls.tenant
+        )
+        cls.day = date(2025, 1, 10)
+
+    def _create_entry(self, user, answers=None, day=None):
+        with self.captureOnCommitCallbacks(execute=False):
+            return Entry.objects.create(
+                tenant=self.tenant, user=user, team=self.team,
+                questions={'q1': '調子は？'}, answers=answers, reported_at=day or self.day,
+            )
+
+    def _stats(self, team=None, day=None):
+        return TeamDailyStats.objects.get(team=team or self.team, date=day or self.day)
+
+    def test_scores_written_updates_rollup(self):
+        """スコアの書き戻しで該当日の集計行が更新されることをテスト"""
+        entry1 = self._create_entry(self.user1, {'q1': '元気'})
+        entry2 = self._create_entry(self.user2, {'q1': '疲れた'})
+        self.assertFalse(TeamDailyStats.objects.exists())
+
+        apply_scores(entry1, {'stress_score': 20, 'motivation_score': 90})
+        apply_scores(entry2, {'stress_score': 60, 'motivation_score': 30})
+
+        stats = self._stats()
+        self.assertEqual(stats.count, 2)
+        self.assertEqual((stats.stress_sum, stats.stress_avg), (80, 40))
+        self.assertEqual((stats.stress_min, stats.stress_max), (20, 60))
+        self.assertEqual((stats.motivation_min, stats.motivation_max), (30, 90))
+
+        # 失敗確定したエントリーは集計から外れる
+        mark_failed(entry2.pk)
+        self.assertEqual(self._stats().count, 1)
+
+    def test_entry_moved_and_deleted(self):
+        """チーム変更・削除で変更前の集計行も更新されることをテスト"""
+        entry = self._create_entry(self.user1)
+        self.assertEqual(self._stats().count, 1)
+
+        entry = Entry.objects.get(pk=entry.pk)
+        entry.team = self.other_team
+        entry.save()
+        self.assertFalse(TeamDailyStats.objects.filter(team=self.team).exists())
+        self.assertEqual(self._stats(team=self.other_team).count, 1)
+
+        entry.delete()
+        self.assertFalse(TeamDailyStats.objects.exists())
+
+    def test_rebuild_command(self):
+        """rebuild_team_daily_stats コマンドで集計行を作り直せることをテスト"""
+        entry = self._create_entry(self.user1, {'q1': '元気'})
+        self._create_entry(self.user2, day=date(2025, 1, 11))
+        Entry.objects.filter(pk=entry.pk).update(stress_score=50, motivation_score=50, score_status='scored')
+        TeamDailyStats.objects.all().delete()
+
+        call_command('rebuild_team_daily_stats', '--tenant', str(self.tenant.pk), stdout=StringIO())
+
+        self.assertEqual(TeamDailyStats.objects.count(), 2)
+        self.assertEqual(self._stats().stress_avg, 50)
+        self.assertEqual(self._stats(day=date(2025, 1, 11)).stress_sum, 0)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'テスト用のファイルの SQLite に切り替えて検証する')
+class TestConcurrentRefresh(TransactionTestCase):
+    """
+    同じ (team, date) の集計行を2つのワーカーが同時に再計算する場合をテストするクラス
+
+    先に集計したワーカーの書き込みを、後からスコアを書き込んだワーカーの集計の後まで遅らせ、
+    古い集計結果で上書きされないことを確認する。インメモリの SQLite（共有キャッシュ）は
+    別スレッドのロック待ちをせずにエラーにするため、このクラスの間だけファイルの SQLite を使う。
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._tmpdir = tempfile.TemporaryDirectory()
+        settings_dict = connection.settings_dict
+        cls._memory_db = (settings_dict['NAME'], connection.connection)
+        # インメモリのデータベースは接続を閉じると消えるため、閉じずに退避する
+        connection.connection = None
+        settings_dict['NAME'] = os.path.join(cls._tmpdir.name, 'concurrency.sqlite3')
+        call_command('migrate', verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connection.close()
+        connection.settings_dict['NAME'], connection.connection = cls._memory_db
+        cls._tmpdir.cleanup()
+
+    def setUp(self):
+        tenant = Tenant.objects.create(name="Test Tenant")
+        self.team = Team.objects.create(name="Team", tenant=tenant)
+        User = get_user_model()
+        users = [
+            User.objects.create_user(email=f"user{i}@test.com", password="testpass123", name=f"User {i}", tenant=tenant)
+            for i in range(2)
+        ]
+        # save() を経由せず（スコア計算キューに投入せず）計算待ちのエントリーを作成する
+        self.entries = Entry.objects.bulk_create([
+            Entry(tenant=tenant, user=user, team=self.team, reported_at=date(2025, 1, 10),
+                  questions={'q1': '調子は？'}, answers={'q1': '元気'}, score_status='pending')
+            for user in users
+        ])
+
+    def test_concurrent_refreshes_keep_latest_rollup(self):
+        first_aggregated, release_first = threading.Event(), threading.Event()
+        aggregate = QuerySet.aggregate
+
+        def slow_aggregate(queryset, *args, **kwargs):
+            result = aggregate(queryset, *args, **kwargs)
+            if threading.current_thread().name == 'first':
+                first_aggregated.set()
+                release_first.wait(5)
+            return result
+
+        def write(entry, scores):
+            try:
+                apply_scores(entry, scores)
+            finally:
+                connection.close()
+
+        with mock.patch.object(QuerySet, 'aggregate', slow_aggregate):
+            first = threading.Thread(
+                target=write, args=(self.entries[0], {'stress_score': 20, 'motivation_score': 80}), name='first',
+            )
+            second = threading.Thread(
+                target=write, args=(self.entries[1], {'stress_score': 60, 'motivation_score': 40}), name='second',
+            )
+            first.start()
+            self.assertTrue(first_aggregated.wait(5))
+            second.start()
+            # ロックがなければ second はここで再計算を終え、first が古い集計結果で上書きする
+            second.join(0.5)
+            release_first.set()
+            first.join(10)
+            second.join(10)
+
+        stats = TeamDailyStats.objects.get(team=self.team, date=date(2025, 1, 10))
+        self.assertEqual((stats.count, stats.stress_sum), (2, 80))
@@ -0,0 +1,148 @@
+import json
+import re
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.models import Entry, ScoringJob, Team, TeamDailyStats, Tenant
+from backend.models.entry import ScoreStatus
+from backend.scoring.cache import reset_score_cache
+from backend.scoring.client import FakeScoringClient, reset_scoring_client, set_scoring_client
+from backend.scoring.queue import enqueue_scoring_many
+
+SYNC_QUEUE = {
+    'BACKEND': 'backend.scoring.queue.SyncScoringQueue',
+    'MAX_WORKERS': 1,
+    'MAX_RETRIES': 0,
+    'RETRY_BACKOFF': 0,
+    'BATCH_SIZE': 20,
+}
+
+
+class TestEntryBulkAPI(TestCase):
+    """
+    エントリー一括登録APIをテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.other_tenant = Tenant.objects.create(name="Other Tenant")
+        cls.teams = [Team.objects.create(name=f"Team {i}", tenant=cls.tenant) for i in range(2)]
+        cls.other_team = Team.objects.create(name="Other Team", tenant=cls.other_tenant)
+        cls.user = User.objects.create_user(
+            email="user@test.com", password="testpass123", name="User", tenant=cls.tenant
+        )
+        cls.url = reverse('entries-bulk', kwargs={'tenants_pk': cls.tenant.pk})
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        reset_scoring_client()
+        reset_score_cache()
+
+    def _item(self, team, day, answers=None):
+        return {
+            'team': team.pk, 'questions': {'q1': '調子は？'}, 'answers': answers,
+            'reported_at': date(2025, 1, day).isoformat(),
+        }
+
+    def test_bulk_create_and_upsert(self):
+        """新規作成と同じチーム・日付の上書きを項目ごとに報告することをテスト"""
+        existing = Entry.objects.create(
+            tenant=self.tenant, user=self.user, team=self.teams[0],
+            questions={'q1': '調子は？'}, reported_at=date(2025, 1, 1),
+        )
+        payload = [
+            self._item(self.teams[0], 1, {'q1': '更新'}),
+            self._item(self.teams[1], 1),
+            self._item(self.teams[0], 2),
+        ]
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual((body['created'], body['updated'], body['error']), (2, 1, 0))
+        self.assertEqual(body['results'][0], {'index': 0, 'status': 'updated', 'id': existing.pk, 'rescored': True})
+        self.assertEqual([result['status'] for result in body['results'][1:]], ['created', 'created'])
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.answers, {'q1': '更新'})
+        self.assertEqual(existing.score_status, ScoreStatus.PENDING)
+        self.assertEqual(Entry.objects.filter(user=self.user).count(), 3)
+        # 回答なしで上書き前に集計されていた行は、計算待ちになったため削除される
+        self.assertFalse(TeamDailyStats.objects.filter(team=self.teams[0], date=date(2025, 1, 1)).exists())
+        self.assertTrue(TeamDailyStats.objects.filter(team=self.teams[1], date=date(2025, 1, 1)).exists())
+
+        # 計算待ちのエントリーのみ、1回の投入でまとめてキューに渡される
+        enqueued = [callback for callback in callbacks if getattr(callback, 'func', None) is enqueue_scoring_many]
+        self.assertEqual(len(enqueued), 1)
+        self.assertEqual(enqueued[0].args[0], [existing.pk])
+
+    def test_item_errors_reported(self):
+        """不正な項目・他テナントのチーム・重複する項目をエラーとして報告することをテスト"""
+        payload = [
+            self._item(self.teams[0], 1),
+            {'team': 'x'},
+            self._item(self.other_team, 1),
+            self._item(self.teams[0], 1),
+        ]
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual((body['created'], body['error']), (1, 3))
+        self.assertIn('team', body['results'][1]['errors'])
+        self.assertIn('team', body['results'][2]['errors'])
+        self.assertIn('non_field_errors', body['results'][3]['errors'])
+        self.assertFalse(Entry.objects.filter(team=self.other_team).exists())
+
+    def test_all_invalid_returns_400(self):
+        """全件が不正な場合・リストでない場合は400を返すことをテスト"""
+        response = self.client.post(self.url, [{'team': 'x'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {'team': self.teams[0].pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SCORING_QUEUE=SYNC_QUEUE)
+    def test_batched_scoring_after_commit(self):
+        """コミット後に計算待ちのエントリーをまとめて採点することをテスト"""
+        def responder(prompt):
+            indexes = re.findall(r'^\[(\d+)\]$', prompt, re.MULTILINE)
+            return json.dumps([{'index': int(i), 'stress_score': 10, 'motivation_score': 90} for i in indexes])
+
+        client = FakeScoringClient(responder=responder)
+        set_scoring_client(client)
+        payload = [self._item(team, day, {'q1': f'回答{day}'}) for team in self.teams for day in (1, 2)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.json()['created'], 4)
+        entries = Entry.objects.filter(user=self.user)
+        self.assertTrue(all(entry.score_status == ScoreStatus.SCORED for entry in entries))
+        self.assertEqual({entry.motivation_score for entry in entries}, {90})
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(TeamDailyStats.objects.filter(tenant=self.tenant).count(), 4)
+
+    @override_settings(SCORING_QUEUE={**SYNC_QUEUE, 'BACKEND': 'backend.scoring.queue.DatabaseScoringQueue'})
+    def test_database_queue_creates_jobs_in_bulk(self):
+        """データベースキューでは計算待ちのエントリーごとにジョブを作成することをテスト"""
+        payload = [self._item(self.teams[0], day, {'q1': '回答'}) for day in (1, 2, 3)]
+        with mock.patch.object(ScoringJob.objects, 'create') as create:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(self.url, payload, format='json')
+
+        create.assert_not_called()
+        self.assertEqual(ScoringJob.objects.count(), 3)
@@ -0,0 +1,105 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.models import Entry, Team, Tenant
+from backend.models.entry import ScoreStatus
+from backend.scoring.queue import enqueue_scoring_many
+
+
+class TestEntryDailyUpsertAPI(TestCase):
+    """
+    チーム・記録日を指定したエントリーの上書き登録APIをテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.other_tenant = Tenant.objects.create(name="Other Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant)
+        cls.other_team = Team.objects.create(name="Other Team", tenant=cls.other_tenant)
+        cls.user = User.objects.create_user(
+            email="user@test.com", password="testpass123", name="User", tenant=cls.tenant
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _url(self, team, day=date(2025, 1, 1)):
+        return reverse('entries-daily', kwargs={
+            'tenants_pk': self.tenant.pk, 'team_pk': team.pk, 'reported_at': day.isoformat(),
+        })
+
+    def _put(self, answers, questions=None):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.put(
+                self._url(self.team), {'questions': questions or {'q1': '調子は？'}, 'answers': answers}, format='json'
+            )
+        enqueued = [callback for callback in callbacks if getattr(callback, 'func', None) is enqueue_scoring_many]
+        return response, enqueued
+
+    def test_create_then_overwrite(self):
+        """初回は201で作成し、再送は同じエントリーを200で上書きすることをテスト"""
+        response, enqueued = self._put({'q1': '元気です'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['team'], {'id': self.team.pk, 'name': 'Team'})
+        self.assertEqual(response.json()['reported_at'], '2025-01-01')
+        self.assertEqual(len(enqueued), 1)
+
+        response, enqueued = self._put({'q1': '疲れています'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Entry.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(Entry.objects.get(user=self.user).answers, {'q1': '疲れています'})
+        self.assertEqual(len(enqueued), 1)
+
+    def test_unchanged_answers_keep_scores(self):
+        """質問・回答が同じ上書きではスコアを引き継ぎ、再計算しないことをテスト"""
+        self._put({'q1': '元気です', 'q2': '普通'})
+        Entry.objects.filter(user=self.user).update(
+            stress_score=20, motivation_score=80, score_status=ScoreStatus.SCORED
+        )
+
+        # キーの順序が異なっても同じ内容とみなす
+        response, enqueued = self._put({'q2': '普通', 'q1': '元気です'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(enqueued, [])
+        self.assertEqual(response.json()['stress_score'], 20)
+        self.assertEqual(response.json()['score_status'], ScoreStatus.SCORED)
+
+    def test_failed_scores_are_retried(self):
+        """スコア計算に失敗したエントリーは同じ回答でも再計算することをテスト"""
+        self._put({'q1': '元気です'})
+        Entry.objects.filter(user=self.user).update(
+            stress_score=0, motivation_score=0, score_status=ScoreStatus.FAILED
+        )
+
+        response, enqueued = self._put({'q1': '元気です'})
+
+        self.assertEqual(response.json()['score_status'], ScoreStatus.PENDING)
+        self.assertEqual(len(enqueued), 1)
+
+    def test_multipart_input(self):
+        """フォーム（multipart）の JSON 文字列の質問・回答も受け付けることをテスト"""
+        response = self.client.put(
+            self._url(self.team),
+            {'questions': '{"q1": "調子は？"}', 'answers': '{"q1": "元気です"}', 'team': self.other_team.pk},
+            format='multipart',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        entry = Entry.objects.get(user=self.user)
+        self.assertEqual(entry.answers, {'q1': '元気です'})
+        # チーム・記録日は URL の値を使う
+        self.assertEqual(entry.team_id, self.team.pk)
+
+    def test_other_tenant_team_not_found(self):
+        """他テナントのチームを指定すると404を返すことをテスト"""
+        response = self.client.put(self._url(self.other_team), {'answers': {'q1': 'x'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Entry.objects.exists())
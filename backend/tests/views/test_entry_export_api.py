@@ -0,0 +1,210 @@
+import csv
+import io
+import json
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.models import Entry, Team, Tenant
+from backend.models.user import UserRole
+from backend.retention.archive import archive_entries
+
+
+class TestEntryExportAPI(TestCase):
+    """
+    エントリーのエクスポートAPI（CSV / NDJSON のストリーミング出力）をテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.other_tenant = Tenant.objects.create(name="Other Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant, questions={'1': '調子は？', '2': '一言'})
+        cls.other_team = Team.objects.create(name="Other Team", tenant=cls.other_tenant)
+        cls.admin = User.objects.create_user(
+            email="admin@test.com", password="testpass123", name="Admin",
+            role=UserRole.ADMIN.value, tenant=cls.tenant
+        )
+        cls.member = User.objects.create_user(
+            email="member@test.com", password="testpass123", name="Member", tenant=cls.tenant
+        )
+        other_user = User.objects.create_user(
+            email="other@test.com", password="testpass123", name="Other", tenant=cls.other_tenant
+        )
+        Entry.objects.bulk_create([
+            Entry(tenant=cls.tenant, user=cls.member, team=cls.team, reported_at=date(2025, 1, 2),
+                  questions={'1': '調子は？', '2': '一言'}, answers={'1': '順調', '2': 'カンマ, と "引用符"'},
+                  stress_score=30, motivation_score=70, score_status='scored'),
+            Entry(tenant=cls.tenant, user=cls.admin, team=cls.team, reported_at=date(2025, 1, 1),
+                  stress_score=0, motivation_score=0, score_status='scored'),
+            Entry(tenant=cls.tenant, user=cls.member, team=cls.team, reported_at=date(2025, 1, 3),
+                  questions={'1': '調子は？'}, answers={'1': 'まあまあ'}, score_status='pending'),
+            Entry(tenant=cls.other_tenant, user=other_user, team=cls.other_team, reported_at=date(2025, 1, 1)),
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.url = reverse('entries-export', kwargs={'tenants_pk': self.tenant.pk})
+
+    @staticmethod
+    def content(response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_export(self):
+        response = self.client.get(self.url, {'format': 'csv'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="entries-', response['Content-Disposition'])
+
+        body = self.content(response)
+        self.assertTrue(body.startswith('\ufeff'))
+        rows = list(csv.DictReader(io.StringIO(body.lstrip('\ufeff'))))
+        # 記録日順、質問・回答は1問1行（回答のないエントリーは1行）、他テナントは含まない
+        self.assertEqual(
+            [(row['reported_at'], row['user_email'], row['question_key'], row['answer']) for row in rows],
+            [
+                ('2025-01-01', 'admin@test.com', '', ''),
+                ('2025-01-02', 'member@test.com', '1', '順調'),
+                ('2025-01-02', 'member@test.com', '2', 'カンマ, と "引用符"'),
+                ('2025-01-03', 'member@test.com', '1', 'まあまあ'),
+            ],
+        )
+        self.assertEqual(rows[1]['question'], '調子は？')
+        self.assertEqual(rows[1]['team_name'], 'Team')
+        self.assertEqual(rows[1]['stress_score'], '30')
+        self.assertEqual(rows[3]['stress_score'], '')
+
+    def test_csv_escapes_formula_cells(self):
+        """数式として解釈される文字で始まるセルの先頭に ' を付けることをテスト（CSVインジェクション対策）"""
+        self.member.name = '=HYPERLINK("http://example.com")'
+        self.member.save()
+        Entry.objects.filter(reported_at=date(2025, 1, 2)).update(
+            answers={'1': '+1', '2': '@SUM(A1)'}, questions={'1': '-調子は？', '2': '\t一言'},
+        )
+
+        body = self.content(self.client.get(self.url, {'format': 'csv'}))
+        rows = [row for row in csv.DictReader(io.StringIO(body.lstrip('\ufeff'))) if row['reported_at'] == '2025-01-02']
+        self.assertEqual(rows[0]['user_name'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(
+            [(row['question'], row['answer']) for row in rows],
+            [("'-調子は？", "'+1"), ("'\t一言", "'@SUM(A1)")],
+        )
+        # 数値のセルはエスケープしない
+        self.assertEqual(rows[0]['stress_score'], '30')
+
+        # NDJSON は数式として解釈されないためそのまま出力する
+        lines = [json.loads(line) for line in self.content(self.client.get(self.url, {'format': 'ndjson'})).splitlines()]
+        self.assertEqual(lines[1]['answer_1'], '+1')
+
+    def test_csv_is_default_format(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+    def test_ndjson_export(self):
+        response = self.client.get(self.url, {'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        lines = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([line['reported_at'] for line in lines], ['2025-01-01', '2025-01-02', '2025-01-03'])
+        self.assertEqual(lines[1]['question_1'], '調子は？')
+        self.assertEqual(lines[1]['answer_2'], 'カンマ, と "引用符"')
+        self.assertEqual(lines[1]['user_name'], 'Member')
+        self.assertNotIn('question_1', lines[0])
+
+    def test_filters(self):
+        response = self.client.get(self.url, {'format': 'ndjson', 'from': '2025-01-02', 'to': '2025-01-02'})
+        lines = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([line['reported_at'] for line in lines], ['2025-01-02'])
+
+        response = self.client.get(self.url, {'format': 'ndjson', 'team_ids': str(self.other_team.pk)})
+        self.assertEqual(self.content(response), '')
+
+        response = self.client.get(self.url, {'from': '2025/01/01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_archived_entries_are_included(self):
+        """保持期間を過ぎてアーカイブしたエントリーも記録日順に含めることをテスト"""
+        archive_entries(self.tenant.pk, date(2025, 1, 3))
+        self.assertEqual(Entry.objects.filter(tenant=self.tenant).count(), 1)
+        # アーカイブ後に同じ月へ遡って登録したエントリーも記録日順に並ぶ
+        Entry.objects.create(tenant=self.tenant, user=self.admin, team=self.team, reported_at=date(2025, 1, 2))
+
+        response = self.client.get(self.url, {'format': 'ndjson'})
+        lines = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(
+            [(line['reported_at'], line['user_email']) for line in lines],
+            [('2025-01-01', 'admin@test.com'), ('2025-01-02', 'member@test.com'),
+             ('2025-01-02', 'admin@test.com'), ('2025-01-03', 'member@test.com')],
+        )
+        self.assertEqual(lines[1]['user_name'], 'Member')
+        self.assertEqual(lines[1]['team_name'], 'Team')
+        self.assertEqual(lines[1]['answer_2'], 'カンマ, と "引用符"')
+        self.assertEqual(lines[1]['stress_score'], 30)
+
+        response = self.client.get(self.url, {'format': 'ndjson', 'from': '2025-01-02', 'to': '2025-01-02'})
+        lines = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([line['reported_at'] for line in lines], ['2025-01-02', '2025-01-02'])
+
+    def test_query_count_is_constant(self):
+        """送信中のクエリ数はエントリー数に依存しない（Entry は1本、アーカイブは月ごと）"""
+        response = self.client.get(self.url, {'format': 'csv'})
+        with CaptureQueriesContext(connection) as queries:
+            self.content(response)
+        # アーカイブの月の一覧と Entry の読み込み
+        self.assertEqual(len(queries), 2)
+
+    def test_non_admin_forbidden(self):
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(self.url, {'format': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_other_tenant_forbidden(self):
+        url = reverse('entries-export', kwargs={'tenants_pk': self.other_tenant.pk})
+        response = self.client.get(url, {'format': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TestEntryAdmin(TestCase):
+    """管理画面のエントリー一覧のクエリ数が件数に依存しないことをテストするクラス"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.team = Team.objects.create(name="Team", tenant=cls.tenant)
+        cls.superuser = User.objects.create_superuser(
+            email="root@test.com", password="testpass123", name="Root", tenant=cls.tenant
+        )
+        cls.users = [
+            User.objects.create_user(email=f"user{i}@test.com", password="testpass123", name=f"User {i}", tenant=cls.tenant)
+            for i in range(10)
+        ]
+
+    def changelist_queries(self):
+        self.client.force_login(self.superuser)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:backend_entry_changelist'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_query_count_is_constant(self):
+        Entry.objects.bulk_create([
+            Entry(tenant=self.tenant, user=self.users[0], team=self.team, reported_at=date(2025, 1, 1)),
+        ])
+        baseline = self.changelist_queries()
+        Entry.objects.bulk_create([
+            Entry(tenant=self.tenant, user=user, team=self.team, reported_at=date(2025, 1, 2))
+            for user in self.users
+        ])
+        self.assertEqual(self.changelist_queries(), baseline)
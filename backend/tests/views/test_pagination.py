@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.models import Entry, Team, Tenant
+from backend.models.user import UserRole
+
+
+class TestCursorPagination(TestCase):
+    """
+    一覧APIのカーソルページネーションをテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.teams = [Team.objects.create(name=f"Team {i}", tenant=cls.tenant) for i in range(2)]
+        cls.admin = User.objects.create_user(
+            email="admin@test.com", password="testpass123", name="Admin",
+            role=UserRole.ADMIN.value, tenant=cls.tenant
+        )
+        # 同じ記録日に複数チームのエントリーがある場合も id で順序が決まる
+        start = date(2025, 1, 1)
+        Entry.objects.bulk_create([
+            Entry(tenant=cls.tenant, user=cls.admin, team=team, reported_at=start + timedelta(days=day))
+            for day in range(3) for team in cls.teams
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _collect(self, url, params):
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data['results'])
+            if not response.data['next']:
+                return pages
+            response = self.client.get(response.data['next'])
+
+    def test_entries_follow_cursor(self):
+        """カーソルを辿ると (-reported_at, id) 順に重複なく全件を取得できることをテスト"""
+        url = reverse('entries-list', kwargs={'tenants_pk': self.tenant.pk})
+        pages = self._collect(url, {'page_size': 4})
+
+        self.assertEqual([len(page) for page in pages], [4, 2])
+        ids = [entry['id'] for page in pages for entry in page]
+        expected = list(
+            Entry.objects.filter(user=self.admin).order_by('-reported_at', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    @override_settings(API_PAGINATION={'PAGE_SIZE': 1, 'MAX_PAGE_SIZE': 2})
+    def test_page_size_is_capped(self):
+        """page_size は MAX_PAGE_SIZE を超えないことをテスト"""
+        url = reverse('teams-list', kwargs={'tenants_pk': self.tenant.pk})
+
+        self.assertEqual(len(self.client.get(url).data['results']), 1)
+        self.assertEqual(len(self.client.get(url, {'page_size': 100}).data['results']), 2)
@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.authentication import reset_verified_token_cache
+from backend.models import Entry, Team, Tenant
+from backend.models.user import UserRole
+from backend.serializers.token_obtain_pair_serializer import CustomTokenObtainPairSerializer
+
+
+class TestQueryCounts(TestCase):
+    """
+    主要エンドポイントのクエリ数の上限をテストするクラス
+
+    Cookie の JWT で認証し、認証・権限チェックを含めたリクエスト全体のクエリ数を検証する。
+    件数を増やしてもクエリ数が変わらない（N+1 がない）ことを前提に固定値で比較する。
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.teams = [Team.objects.create(name=f"Team {i}", tenant=cls.tenant) for i in range(3)]
+        cls.admin = User.objects.create_user(
+            email="admin@test.com", password="testpass123", name="Admin",
+            role=UserRole.ADMIN.value, tenant=cls.tenant
+        )
+        cls.manager = User.objects.create_user(
+            email="manager@test.com", password="testpass123", name="Manager",
+            role=UserRole.MANAGER.value, tenant=cls.tenant
+        )
+        cls.users = [
+            User.objects.create_user(
+                email=f"user{i}@test.com", password="testpass123", name=f"User {i}", tenant=cls.tenant
+            )
+            for i in range(5)
+        ]
+        for team in cls.teams:
+            team.managers.add(cls.manager, cls.admin)
+            team.members.add(*cls.users)
+
+        today = date.today()
+        Entry.objects.bulk_create([
+            Entry(tenant=cls.tenant, user=user, team=team, reported_at=today - timedelta(days=day),
+                  stress_score=10, motivation_score=20)
+            for user in cls.users for team in cls.teams for day in range(1, 4)
+        ])
+
+    def setUp(self):
+        caches['default'].clear()
+        reset_verified_token_cache()
+
+    def _client(self, user):
+        client = APIClient()
+        client.cookies['access_token'] = str(CustomTokenObtainPairSerializer.get_token(user).access_token)
+        return client
+
+    def _assert_budget(self, client, url, queries):
+        with self.assertNumQueries(queries):
+            response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_entries_list(self):
+        """エントリー一覧: 認証（ユーザー＋テナント）・エントリー"""
+        url = reverse('entries-list', kwargs={'tenants_pk': self.tenant.pk})
+        self._assert_budget(self._client(self.users[0]), url, 2)
+
+    def test_entry_detail(self):
+        """エントリー詳細: 認証・エントリー（オブジェクト権限でテナントを読まない）"""
+        entry = Entry.objects.filter(user=self.users[0]).first()
+        url = reverse('entries-detail', kwargs={'tenants_pk': self.tenant.pk, 'pk': entry.pk})
+        self._assert_budget(self._client(self.users[0]), url, 2)
+
+    def test_users_list(self):
+        """ユーザー一覧: 認証・ユーザー・所属チーム"""
+        url = reverse('users-list', kwargs={'tenants_pk': self.tenant.pk})
+        self._assert_budget(self._client(self.admin), url, 3)
+
+    def test_teams_list(self):
+        """チーム一覧: 認証・チーム・マネージャー・マネージャーの所属チーム"""
+        url = reverse('teams-list', kwargs={'tenants_pk': self.tenant.pk})
+        self._assert_budget(self._client(self.admin), url, 4)
+
+    def test_team_entries_list(self):
+        """チーム別エントリー（マネージャー）: 認証・管理チームID・エントリー"""
+        url = reverse('team-entries-list', kwargs={'tenants_pk': self.tenant.pk})
+        self._assert_budget(self._client(self.manager), url, 3)
+
+    @override_settings(TOKEN_AUTH={'STATELESS': True, 'USER_CACHE_ALIAS': 'default', 'USER_CACHE_TIMEOUT': 60})
+    def test_entries_list_stateless(self):
+        """ステートレス認証ではユーザー行を読まずにエントリーのみ読み込む"""
+        url = reverse('entries-list', kwargs={'tenants_pk': self.tenant.pk})
+        self._assert_budget(self._client(self.users[0]), url, 1)
@@ -102,8 +102,8 @@ class TestTeamAPI(TestCase):
         response = self.client.get(self.teams_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)  # tenant1のチームのみ
-        self.assertEqual(response.data[0]['name'], 'Team 1')
+        self.assertEqual(len(response.data['results']), 1)  # tenant1のチームのみ
+        self.assertEqual(response.data['results'][0]['name'], 'Team 1')
         
     def test_list_teams_with_admin(self):
         """ADMINでのチーム一覧取得テスト"""
@@ -111,7 +111,7 @@ class TestTeamAPI(TestCase):
         response = self.client.get(self.teams_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
         
     def test_list_teams_with_manager(self):
         """MANAGERでのチーム一覧取得テスト"""
@@ -119,7 +119,7 @@ class TestTeamAPI(TestCase):
         response = self.client.get(self.teams_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
         
     def test_list_teams_with_regular_user(self):
         """一般USERでのチーム一覧取得テスト"""
@@ -127,7 +127,7 @@ class TestTeamAPI(TestCase):
         response = self.client.get(self.teams_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
         
     def test_list_teams_with_different_tenant_user(self):
         """異なるテナントのユーザーでのチーム一覧取得テスト"""
@@ -136,8 +136,8 @@ class TestTeamAPI(TestCase):
         response = self.client.get(self.tenant2_teams_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)  # tenant2のチームのみ
-        self.assertEqual(response.data[0]['name'], 'Team 2')
+        self.assertEqual(len(response.data['results']), 1)  # tenant2のチームのみ
+        self.assertEqual(response.data['results'][0]['name'], 'Team 2')
         
     def test_list_teams_with_orphaned_user(self):
         """孤立したテナントのユーザーでのチーム一覧取得テスト"""
@@ -147,7 +147,7 @@ class TestTeamAPI(TestCase):
         response = self.client.get(orphaned_teams_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)  # そのテナントにはチームがないので空
+        self.assertEqual(len(response.data['results']), 0)  # そのテナントにはチームがないので空
         
     def test_create_team_with_superuser(self):
         """SUPERUSERでのチーム作成テスト"""
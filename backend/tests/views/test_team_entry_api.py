@@ -0,0 +1,283 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.models import Entry, Team, Tenant
+from backend.models.entry import ScoreStatus
+from backend.models.user import UserRole
+from backend.stats.cache import get_team_entry_cache, reset_team_entry_cache
+
+
+# テストの CACHES は LocMem のため、レスポンスキャッシュを明示的に有効にする
+TEAM_ENTRY_CACHE = {'ENABLED': True, 'ALIAS': 'default', 'TIMEOUT': 300, 'KEY_PREFIX': 'team-entries'}
+
+
+@override_settings(TEAM_ENTRY_CACHE=TEAM_ENTRY_CACHE)
+class TestTeamEntryAPI(TestCase):
+    """
+    TeamEntry API の集約結果と権限をテストするクラス
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.tenant = Tenant.objects.create(name="Test Tenant")
+        cls.team1 = Team.objects.create(name="Team 1", tenant=cls.tenant)
+        cls.team2 = Team.objects.create(name="Team 2", tenant=cls.tenant)
+
+        cls.admin = User.objects.create_user(
+            email="admin@test.com", password="testpass123", name="Admin",
+            role=UserRole.ADMIN.value, tenant=cls.tenant
+        )
+        cls.manager = User.objects.create_user(
+            email="manager@test.com", password="testpass123", name="Manager",
+            role=UserRole.MANAGER.value, tenant=cls.tenant
+        )
+        cls.user1 = User.objects.create_user(
+            email="user1@test.com", password="testpass123", name="User 1", tenant=cls.tenant
+        )
+        cls.user2 = User.objects.create_user(
+            email="user2@test.com", password="testpass123", name="User 2", tenant=cls.tenant
+        )
+        cls.team1.managers.add(cls.manager)
+
+        today = date.today()
+        cls.day1 = today - timedelta(days=2)
+        cls.day2 = today - timedelta(days=1)
+        Entry.objects.bulk_create([
+            Entry(tenant=cls.tenant, user=cls.user1, team=cls.team1, reported_at=cls.day2,
+                  stress_score=20, motivation_score=80),
+            Entry(tenant=cls.tenant, user=cls.user1, team=cls.team1, reported_at=cls.day1,
+                  stress_score=10, motivation_score=90),
+            Entry(tenant=cls.tenant, user=cls.user2, team=cls.team1, reported_at=cls.day1,
+                  stress_score=None, motivation_score=None),
+            Entry(tenant=cls.tenant, user=cls.user1, team=cls.team2, reported_at=cls.day1,
+                  stress_score=50, motivation_score=50),
+            Entry(tenant=cls.tenant, user=cls.user1, team=cls.team1, reported_at=today - timedelta(days=120),
+                  stress_score=99, motivation_score=1),
+        ])
+
+    def setUp(self):
+        caches['default'].clear()
+        reset_team_entry_cache()
+        with self.assertLogs('backend.stats.cache', level='WARNING'):
+            get_team_entry_cache()
+        self.client = APIClient()
+        self.url = reverse('team-entries-list', kwargs={'tenants_pk': self.tenant.pk})
+
+    def test_admin_gets_all_teams(self):
+        """ADMINが全チーム・全ユーザーの時系列を取得できることをテスト"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([team['id'] for team in response.data], [self.team1.id, self.team2.id])
+
+        team1_users = response.data[0]['users']
+        self.assertEqual([u['name'] for u in team1_users], ['User 1', 'User 2'])
+        self.assertEqual(team1_users[0]['entries'], {
+            'labels': [self.day1.strftime('%m/%d'), self.day2.strftime('%m/%d')],
+            'stress_values': [10, 20],
+            'motivation_values': [90, 80],
+        })
+        # 未計算のスコアは 0（ストレスなし）と区別できるよう null として返す
+        self.assertEqual(team1_users[1]['entries']['stress_values'], [None])
+
+    def test_manager_gets_managed_teams_only(self):
+        """MANAGERが管理チームのデータのみ取得できることをテスト"""
+        self.client.force_authenticate(user=self.manager)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([team['id'] for team in response.data], [self.team1.id])
+
+    def test_user_gets_own_entries_only(self):
+        """一般USERが自分のエントリーのみ取得できることをテスト"""
+        self.client.force_authenticate(user=self.user2)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual([u['id'] for u in response.data[0]['users']], [self.user2.id])
+
+    def test_compact_format(self):
+        """?format=compact でチーム共通の日付軸と欠損付き配列が返ることをテスト"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {'format': 'compact'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        team1 = response.json()[0]
+        self.assertEqual(team1['start'], self.day1.isoformat())
+        self.assertEqual(team1['offsets'], [0, 1])
+        self.assertEqual(team1['users'][0]['stress'], [10, 20])
+        # 未計算のスコアもエントリーのない日と同じく欠損（null）になる
+        self.assertEqual(team1['users'][1]['stress'], [None, None])
+        self.assertNotIn('entries', team1['users'][0])
+
+    def test_compact_format_via_accept_header_packed(self):
+        """Accept ヘッダーでコンパクト形式を選択し、int8 でパックできることをテスト"""
+        import base64
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(
+            self.url, {'pack': 'int8'}, HTTP_ACCEPT='application/vnd.wellboard.compact+json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.wellboard.compact+json')
+        packed = response.json()[0]['users'][1]['motivation']
+        # 未計算のスコア・エントリーのない日はどちらも -1（符号なしで読むと 255）
+        self.assertEqual(list(base64.b64decode(packed)), [255, 255])
+
+    def test_team_ids_filter(self):
+        """team_ids で指定したチームのみ返ることをテスト"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {'team_ids': f'{self.team2.id}'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([team['id'] for team in response.data], [self.team2.id])
+
+    def test_date_window(self):
+        """from / to で表示期間を指定できることをテスト"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {
+            'team_ids': f'{self.team1.id}',
+            'from': (date.today() - timedelta(days=150)).isoformat(),
+            'to': self.day1.isoformat(),
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user1_entries = response.data[0]['users'][0]['entries']
+        # 既定の90日より前のエントリーも含まれ、終了日より後のエントリーは除外される
+        self.assertEqual(user1_entries['stress_values'], [99, 10])
+
+    def test_month_bucket_averages_scores(self):
+        """bucket=month で月単位に平均したスコアが返ることをテスト"""
+        Entry.objects.bulk_create([
+            Entry(tenant=self.tenant, user=self.user2, team=self.team2, reported_at=date(2024, 3, 5),
+                  stress_score=10, motivation_score=60),
+            Entry(tenant=self.tenant, user=self.user2, team=self.team2, reported_at=date(2024, 3, 20),
+                  stress_score=21, motivation_score=None),
+            Entry(tenant=self.tenant, user=self.user2, team=self.team2, reported_at=date(2024, 4, 1),
+                  stress_score=40, motivation_score=40),
+        ])
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {
+            'team_ids': f'{self.team2.id}', 'from': '2024-03-01', 'to': '2024-04-30', 'bucket': 'month',
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['users'][0]['entries'], {
+            'labels': ['03/01', '04/01'],
+            'stress_values': [16, 40],
+            # 未計算のスコアは平均から除外される
+            'motivation_values': [60, 40],
+        })
+
+    def test_invalid_query_params(self):
+        """不正な bucket / 日付 / team_ids で400が返ることをテスト"""
+        self.client.force_authenticate(user=self.admin)
+
+        for params in ({'bucket': 'year'}, {'from': '2024/01/01'}, {'team_ids': 'a,b'},
+                       {'from': '2024-02-01', 'to': '2024-01-01'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_summary_reads_team_daily_stats(self):
+        """summary がチーム日次集計を読んで返すことをテスト"""
+        from backend.stats.rollup import rebuild_team_daily_stats
+
+        Entry.objects.filter(stress_score__isnull=False).update(score_status=ScoreStatus.SCORED)
+        rebuild_team_daily_stats(tenant_id=self.tenant.pk)
+        self.client.force_authenticate(user=self.manager)
+        response = self.client.get(
+            reverse('team-entries-summary', kwargs={'tenants_pk': self.tenant.pk}),
+            {'from': self.day1.isoformat(), 'to': self.day1.isoformat()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        stats = response.data[0]['stats']
+        self.assertEqual(response.data[0]['id'], self.team1.id)
+        # スコア未計算（pending）のエントリーは集計されない
+        self.assertEqual(stats['stress_avg'], [10.0])
+        self.assertEqual(stats['count'], [1])
+
+    def test_summary_forbidden_for_user(self):
+        """一般USERは summary にアクセスできないことをテスト"""
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get(reverse('team-entries-summary', kwargs={'tenants_pk': self.tenant.pk}))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_response_cached_and_invalidated_on_save(self):
+        """2回目はキャッシュから返り、エントリー保存で無効化されることをテスト"""
+        self.client.force_authenticate(user=self.admin)
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(get_team_entry_cache().stats.hits, 1)
+
+        entry = Entry.objects.get(user=self.user1, team=self.team2)
+        entry.stress_score = 0
+        with self.captureOnCommitCallbacks(execute=True):
+            entry.save()
+        response = self.client.get(self.url)
+
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(response.data[1]['users'][0]['entries']['stress_values'], [0])
+
+    def test_if_none_match_returns_304(self):
+        """ETag が一致する場合に304が返ることをテスト"""
+        self.client.force_authenticate(user=self.manager)
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(get_team_entry_cache().stats.not_modified, 1)
+
+        # 権限スコープが異なるユーザーとは ETag を共有しない
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cache_stats_admin_only(self):
+        """cache-stats が管理者のみ閲覧できることをテスト"""
+        url = reverse('team-entries-cache-stats', kwargs={'tenants_pk': self.tenant.pk})
+        self.client.force_authenticate(user=self.manager)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        self.client.get(self.url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['misses'], 1)
+
+    def test_version_key_expires_with_timeout(self):
+        """テナントのバージョンも TIMEOUT で期限切れになることをテスト"""
+        response_cache = get_team_entry_cache()
+        with mock.patch.object(response_cache.cache, 'add', wraps=response_cache.cache.add) as add:
+            response_cache.version(self.tenant.pk)
+        add.assert_called_once_with(f'team-entries:version:{self.tenant.pk}', mock.ANY, timeout=300)
+
+    @override_settings(TEAM_ENTRY_CACHE={**TEAM_ENTRY_CACHE, 'ENABLED': None})
+    def test_disabled_by_default_on_process_local_cache(self):
+        """共有キャッシュでない場合は既定でキャッシュ・ETag を使わないことをテスト"""
+        self.assertFalse(get_team_entry_cache().enabled)
+
+        self.client.force_authenticate(user=self.admin)
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertEqual(first.data, second.data)
+        self.assertNotIn('ETag', second)
+        self.assertEqual(get_team_entry_cache().stats.hits, 0)
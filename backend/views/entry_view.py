@@ -1,14 +1,38 @@
-from drf_spectacular.utils import extend_schema
+import datetime
+
+from django.http import QueryDict, StreamingHttpResponse
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from backend.models import Entry
-from backend.permissions import IsOwnerOrAdmin
-from backend.serializers.entry_serializer import EntryDetailSerializer, EntrySerializer
+from backend.db_routers import ReplicaReadMixin
+from backend.models import Entry, Team, User
+from backend.pagination import EntryCursorPagination
+from backend.permissions import IsAdmin, IsOwnerOrAdmin
+from backend.renderers import CSVExportRenderer, NDJSONExportRenderer
+from backend.retention.archive import archived_days, entry_history
+from backend.serializers.entry_serializer import (
+    ARCHIVED_DAY_ERROR,
+    EntryBulkItemSerializer,
+    EntryDetailSerializer,
+    EntryLeanSerializer,
+    EntrySerializer,
+)
+from backend.serializers.entry_export import buffered, export_rows, iter_csv, iter_ndjson
+
+# 一括登録で1リクエストに含められる最大件数
+MAX_BULK_ENTRIES = 1000
+
+# エクスポートで1回にDBから読み込む件数
+EXPORT_CHUNK_SIZE = 2000
 
 
 @extend_schema(tags=["entry"])
-class EntryViewSet(ModelViewSet):
+class EntryViewSet(ReplicaReadMixin, ModelViewSet):
     """
     エントリー管理API ViewSet
     
@@ -23,16 +47,35 @@ class EntryViewSet(ModelViewSet):
         - 日次エントリー作成
         - AWS Bedrock による自動スコア計算
         - チーム固有質問への回答記録
+        - (-reported_at, id) 順のカーソルページネーション
+        - 一覧・詳細は EntryLeanSerializer による軽量な読み取り（?fields= で出力フィールドを指定可能）
+        - bulk: 複数エントリーの一括登録（同じチーム・日付の既存エントリーは上書き）
+        - daily: チーム・記録日を指定した1件の上書き登録（PUT、冪等）
+        - export: テナント全体のエントリーの CSV / NDJSON ストリーミング出力（管理者のみ）
+        - 一覧・エクスポートの読み取りはレプリカ（設定時）に振り分け（詳細・書き込み後の読み直しは default）
         
     Security:
         - 作成時にuser・tenantを自動設定
     """
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
     serializer_class = EntrySerializer
+    pagination_class = EntryCursorPagination
+    replica_read_actions = ('list', 'export')
 
     def get_queryset(self):
         # 自分のデータのみ
-        return Entry.objects.filter(user=self.request.user, tenant=self.request.user.tenant).order_by('-reported_at').select_related('user', 'team')
+        return Entry.objects.filter(user_id=self.request.user.id, tenant_id=self.request.user.tenant_id).order_by('-reported_at', 'id').select_related('user', 'team')
+    
+    def list(self, request, *args, **kwargs):
+        # values() の行を DRF のフィールド機構を通さずに辞書へ変換する
+        lean = EntryLeanSerializer(fields=request.query_params.get('fields'))
+        rows = lean.values(self.filter_queryset(self.get_queryset()), 'reported_at')
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(lean.to_representation(page))
+    
+    def retrieve(self, request, *args, **kwargs):
+        lean = EntryLeanSerializer(fields=request.query_params.get('fields'))
+        return Response(lean.instance_to_representation(self.get_object()))
     
     def get_serializer_class(self):
         if self.action in ['retrieve', 'list']:
@@ -41,5 +84,198 @@ class EntryViewSet(ModelViewSet):
     
     def perform_create(self, serializer):
         # チーム作成時に現在のユーザーのテナントを自動設定
-        serializer.save(user=self.request.user, tenant=self.request.user.tenant)
-    
\ No newline at end of file
+        serializer.save(user_id=self.request.user.id, tenant_id=self.request.user.tenant_id)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, tenants_pk):
+        """
+        複数エントリーを一括登録するAPI
+
+        リクエストボディはエントリー（team / questions / answers / reported_at）のリスト。
+        有効な項目は1トランザクション・1回の INSERT ... ON CONFLICT DO UPDATE で保存し、
+        同じチーム・日付の既存エントリーは上書きする。AIスコア計算はコミット後に
+        まとめてキューへ投入する。アーカイブ済みのチーム・日付の項目は error にする。
+
+        Returns:
+            Response: 件数の集計と、リクエスト順の項目ごとの結果
+                - results[i].status: "created" / "updated" / "error"
+                - results[i].id: 保存したエントリーID（error の場合は errors）
+                - results[i].rescored: AIスコアを再計算するか（質問・回答が変わらない上書きは False）
+                - 全件が不正な場合は400
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({'non_field_errors': ['エントリーのリストを指定してください。']})
+        if len(items) > MAX_BULK_ENTRIES:
+            raise ValidationError({'non_field_errors': [f'一度に登録できるのは{MAX_BULK_ENTRIES}件までです。']})
+
+        user_id, tenant_id = request.user.id, request.user.tenant_id
+        results = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            serializer = EntryBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+
+        team_ids = set(
+            Team.objects.filter(tenant_id=tenant_id, pk__in={data['team'] for _, data in valid})
+            .values_list('pk', flat=True)
+        )
+        for _, data in valid:
+            data.setdefault('reported_at', datetime.date.today())
+        archived = archived_days(tenant_id, ((data['team'], data['reported_at']) for _, data in valid))
+        entries, indexes, seen = [], [], {}
+        for index, data in valid:
+            reported_at = data['reported_at']
+            key = (data['team'], reported_at)
+            if data['team'] not in team_ids:
+                errors = {'team': ['指定されたチームは存在しません。']}
+            elif key in archived:
+                errors = {'reported_at': [ARCHIVED_DAY_ERROR]}
+            elif key in seen:
+                errors = {'non_field_errors': [f'index={seen[key]} と同じチーム・日付のエントリーです。']}
+            else:
+                seen[key] = index
+                indexes.append(index)
+                entries.append(Entry(
+                    tenant_id=tenant_id, user_id=user_id, team_id=data['team'],
+                    questions=data.get('questions'), answers=data.get('answers'), reported_at=reported_at,
+                ))
+                continue
+            results[index] = {'index': index, 'status': 'error', 'errors': errors}
+
+        outcomes = Entry.bulk_upsert(entries)
+        for index, entry, (created, rescored) in zip(indexes, entries, outcomes):
+            results[index] = {
+                'index': index, 'status': 'created' if created else 'updated', 'id': entry.pk, 'rescored': rescored,
+            }
+
+        counts = {'created': 0, 'updated': 0, 'error': 0}
+        for result in results:
+            counts[result['status']] += 1
+        return Response(
+            {**counts, 'results': results},
+            status=status.HTTP_200_OK if entries else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(
+        detail=False,
+        methods=['put'],
+        url_path=r'daily/(?P<team_pk>\d+)/(?P<reported_at>\d{4}-\d{2}-\d{2})',
+    )
+    def daily(self, request, tenants_pk, team_pk, reported_at):
+        """
+        チーム・記録日を指定してその日のエントリーを登録・上書きするAPI
+
+        1日1エントリーの制約の自然キー (team, reported_at) で1回の
+        INSERT ... ON CONFLICT DO UPDATE を行うため、再送しても IntegrityError にならない。
+        質問・回答が既存のエントリーと同じ場合はAIスコアを再計算しない。
+        アーカイブ済みのチーム・記録日は400を返す。
+
+        Returns:
+            Response: 保存したエントリー（新規作成は201、上書きは200）
+        """
+        # 入力は質問・回答のみ受け付ける（フォーム・multipart の QueryDict は JSON 文字列として解釈させるため型を保つ）
+        payload = QueryDict(mutable=True) if isinstance(request.data, QueryDict) else {}
+        for name in ('questions', 'answers'):
+            if name in request.data:
+                payload[name] = request.data[name]
+        payload['team'] = team_pk
+        payload['reported_at'] = reported_at
+        serializer = EntryBulkItemSerializer(data=payload)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        tenant_id = request.user.tenant_id
+        if not Team.objects.filter(tenant_id=tenant_id, pk=data['team']).exists():
+            raise NotFound('指定されたチームは存在しません。')
+        if archived_days(tenant_id, [(data['team'], data['reported_at'])]):
+            raise ValidationError({'reported_at': [ARCHIVED_DAY_ERROR]})
+
+        entry = Entry(
+            tenant_id=tenant_id, user_id=request.user.id, team_id=data['team'],
+            questions=data.get('questions'), answers=data.get('answers'), reported_at=data['reported_at'],
+        )
+        [(created, _)] = Entry.bulk_upsert([entry])
+
+        lean = EntryLeanSerializer()
+        [body] = lean.to_representation(lean.values(Entry.objects.filter(pk=entry.pk)))
+        return Response(body, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='format', type=str, enum=['csv', 'ndjson'], location=OpenApiParameter.QUERY,
+                             description='出力形式（省略時は csv）', required=False),
+            OpenApiParameter(name='from', type=datetime.date, location=OpenApiParameter.QUERY,
+                             description='記録日の開始日 YYYY-MM-DD', required=False),
+            OpenApiParameter(name='to', type=datetime.date, location=OpenApiParameter.QUERY,
+                             description='記録日の終了日 YYYY-MM-DD', required=False),
+            OpenApiParameter(name='team_ids', type={'type': 'array', 'items': {'type': 'number'}},
+                             location=OpenApiParameter.QUERY, description='カンマ区切りのチームIDリスト',
+                             required=False),
+        ],
+        responses={(200, 'text/csv'): str, (200, 'application/x-ndjson'): str},
+    )
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[IsAuthenticated, IsAdmin],
+        renderer_classes=[CSVExportRenderer, NDJSONExportRenderer],
+    )
+    def export(self, request, tenants_pk):
+        """
+        テナントのエントリーを CSV / NDJSON でストリーミング出力するAPI（人事分析用）
+
+        保持期間を過ぎてアーカイブしたエントリーも含め（entry_history）、Entry は
+        iterator(chunk_size=EXPORT_CHUNK_SIZE) で、アーカイブは1か月分ずつ読みながら
+        StreamingHttpResponse で送信するため、メモリ使用量はテナントのエントリー数に依存しない。
+        記録日・ID順に出力する。
+
+        Formats:
+            - csv: 質問・回答を1問1行に展開（question_key / question / answer 列）。UTF-8 (BOM付き)
+            - ndjson: 1行1エントリー。質問・回答は question_<キー> / answer_<キー> に平坦化
+        """
+        query_params = request.query_params
+        tenant_id = request.user.tenant_id
+        date_from = self._parse_export_date(query_params, 'from')
+        date_to = self._parse_export_date(query_params, 'to')
+        team_ids = None
+        if query_params.get('team_ids'):
+            try:
+                team_ids = [int(value) for value in query_params['team_ids'].split(',') if value]
+            except ValueError:
+                raise ValidationError({'team_ids': 'カンマ区切りの数値で指定してください。'})
+
+        # 保持期間を過ぎてアーカイブしたエントリーも含める（アーカイブの行は user / team を JOIN できないため名前は辞書で引く）
+        users = {
+            user_id: (name, email)
+            for user_id, name, email in User.objects.filter(tenant_id=tenant_id).values_list('id', 'name', 'email')
+        }
+        teams = dict(Team.objects.filter(tenant_id=tenant_id).values_list('id', 'name'))
+        # レプリカへの振り分けはレスポンスの確定までのため、entry_history は送信中に読む接続先を呼び出し時に固定する
+        history = entry_history(
+            tenant_id, team_ids=team_ids, date_from=date_from, date_to=date_to, chunk_size=EXPORT_CHUNK_SIZE,
+        )
+        rows = export_rows(history, users, teams)
+
+        renderer = request.accepted_renderer
+        if isinstance(renderer, NDJSONExportRenderer):
+            content = iter_ndjson(rows)
+        else:
+            content = iter_csv(rows)
+        response = StreamingHttpResponse(buffered(content), content_type=f'{renderer.media_type}; charset=utf-8')
+        filename = f'entries-{request.user.tenant_id}-{datetime.date.today():%Y%m%d}.{renderer.format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @staticmethod
+    def _parse_export_date(query_params, name):
+        value = query_params.get(name)
+        if not value:
+            return None
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            raise ValidationError({name: '日付は YYYY-MM-DD 形式で指定してください。'})
@@ -1,20 +1,42 @@
-from collections import defaultdict
-from datetime import datetime, timedelta
+from array import array
+from base64 import b64encode
+from datetime import date, datetime, timedelta
 
-from drf_spectacular.utils import OpenApiParameter, extend_schema
+from django.db.models import Avg, F, IntegerField, Max, Min, Sum
+from django.db.models.functions import Cast, Round, TruncMonth, TruncWeek
+from django.utils.http import parse_etags
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import ViewSet
 
-from backend.models import Entry
+from backend.db_routers import ReplicaReadMixin, primary_reads
+from backend.models import Entry, TeamDailyStats
 from backend.models.user import UserRole
 from backend.permissions import IsTeamManagerOrSelf
+from backend.renderers import CompactJSONRenderer
+from backend.stats.cache import get_team_entry_cache
+
+# 期間指定がない場合の既定の表示期間（日数）
+DEFAULT_WINDOW_DAYS = 90
+
+# bucket パラメータと集計単位の切り捨て関数の対応（day は集計せず日次の行をそのまま返す）
+BUCKET_TRUNCATIONS = {
+    'day': None,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+BUCKET_CHOICES = list(BUCKET_TRUNCATIONS)
 
 
 @extend_schema(
     tags=["team-entry"])
 
-class TeamEntryViewSet(ViewSet):
+class TeamEntryViewSet(ReplicaReadMixin, ViewSet):
     """
     チーム別エントリー集約表示API ViewSet
     
@@ -28,10 +50,17 @@ class TeamEntryViewSet(ViewSet):
         
     Features:
         - 複数チームの同時データ取得
+        - 表示期間（from / to）の指定
+        - 週・月単位でのDB側ダウンサンプリング（bucket）
         - ユーザー別時系列データの構造化
-        - メモリ効率的なデータ集約処理
+        - チーム日次集計（TeamDailyStats）によるチーム単位のサマリー（summary）
+        - 権限スコープ・チーム・期間ごとのレスポンスキャッシュと ETag による 304 応答
+        - values_list のタプルを1回走査する線形時間の集約処理
+        - list / summary の読み取りはレプリカ（設定時）に振り分け（キャッシュに保存する集約は default から読む）
     """
     permission_classes = [IsAuthenticated, IsTeamManagerOrSelf]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CompactJSONRenderer]
+    replica_read_actions = ('list', 'summary')
 
     @extend_schema(
         parameters=[
@@ -39,10 +68,51 @@ class TeamEntryViewSet(ViewSet):
                 name='team_ids',
                 type={'type': 'array', 'items': {'type': 'number'}},
                 location=OpenApiParameter.QUERY,
-                description='カンマ区切りのチームIDリスト',
-                required=True
+                description='カンマ区切りのチームIDリスト（省略時は権限内の全チーム）',
+                required=False
             ),
-        ]
+            OpenApiParameter(
+                name='from',
+                type=date,
+                location=OpenApiParameter.QUERY,
+                description=f'表示期間の開始日 YYYY-MM-DD（省略時は終了日の{DEFAULT_WINDOW_DAYS}日前）',
+                required=False
+            ),
+            OpenApiParameter(
+                name='to',
+                type=date,
+                location=OpenApiParameter.QUERY,
+                description='表示期間の終了日 YYYY-MM-DD（省略時は今日）',
+                required=False
+            ),
+            OpenApiParameter(
+                name='bucket',
+                type=str,
+                enum=BUCKET_CHOICES,
+                location=OpenApiParameter.QUERY,
+                description='集計単位。week / month の場合は期間の開始日ごとにスコアを平均する（既定: day）',
+                required=False
+            ),
+            OpenApiParameter(
+                name='format',
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description='compact を指定するとチーム共通の日付軸＋整数配列のコンパクト形式で返す'
+                            '（Accept: application/vnd.wellboard.compact+json でも可）',
+                required=False
+            ),
+            OpenApiParameter(
+                name='pack',
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description='コンパクト形式で int8 を指定するとスコア配列を base64 の符号付き8bit整数列で返す（欠損は-1）',
+                required=False
+            ),
+        ],
+        responses={200: OpenApiResponse(
+            description='チーム・ユーザー別のスコアの時系列。スコアが未計算（pending / failed）の点は 0 ではなく null'
+                        '（compact の pack=int8 では -1）で返す',
+        )},
     )
     def list(self, request, tenants_pk):
         """
@@ -67,8 +137,8 @@ class TeamEntryViewSet(ViewSet):
                                 "name": str,  # ユーザー名
                                 "entries": {
                                     "labels": ["MM/DD", ...],  # 日付ラベル
-                                    "stress_values": [int, ...],  # ストレス度値
-                                    "motivation_values": [int, ...]  # モチベーション度値
+                                    "stress_values": [int|null, ...],  # ストレス度値（null はスコア未計算）
+                                    "motivation_values": [int|null, ...]  # モチベーション度値
                                 }
                             }
                         ]
@@ -79,86 +149,417 @@ class TeamEntryViewSet(ViewSet):
             - SUPERUSER/ADMIN: 全エントリーアクセス可能
             - MANAGER: 管理するチームのエントリーのみ
             - USER: 自分のエントリーのみ
+            
+        Caching:
+            - (テナント, 権限スコープ, チーム, 期間, 形式) ごとに集約結果をキャッシュする
+            - キーにはテナントのバージョンを含み、エントリーの保存・削除・スコア書き込みで無効化される
+            - ETag を返し、If-None-Match が一致する場合は 304 を返す
+            - キャッシュが無効（共有キャッシュでない場合の既定）のときは毎回集約し、ETag も返さない
+            
+        Query Parameters:
+            - team_ids: 権限で絞り込んだ結果をさらに指定チームに限定する
+            - from / to: 表示期間（両端を含む）。既定は今日までの90日間
+            - bucket: day / week / month。week・month ではDB側で TruncWeek / TruncMonth と
+              Avg により集計し、labels は各期間の開始日、スコアは未計算を除いた平均値（整数に丸め）
+            
+        Compact Format (?format=compact):
+            [
+                {
+                    "id": int,
+                    "name": str,
+                    "start": "YYYY-MM-DD",  # 日付軸の開始日
+                    "offsets": [int, ...],  # 開始日からの日数（チーム共通の日付軸）
+                    "users": [
+                        {
+                            "id": int,
+                            "name": str,
+                            "stress": [int|null, ...],  # 日付軸に対応（null はエントリーなし・スコア未計算、pack=int8 では -1）
+                            "motivation": [int|null, ...]
+                        }
+                    ]
+                }
+            ]
         """
         user = request.user
-        
-        # 3ヶ月前の日付を計算
-        three_months_ago = datetime.now().date() - timedelta(days=90)
+        team_ids, date_from, date_to, bucket = self._parse_query_params(request.query_params)
         
         # 権限に基づいてエントリーをフィルタリング
+        entries = Entry.objects.filter(
+            tenant_id=tenants_pk,
+            reported_at__gte=date_from,
+            reported_at__lte=date_to
+        )
         if user.role in [UserRole.SUPERUSER.value, UserRole.ADMIN.value]:
             # スーパーユーザーと管理者は全てのエントリーにアクセス可能
-            entries = Entry.objects.filter(
-                tenant_id=tenants_pk,
-                reported_at__gte=three_months_ago
-            )
+            scope = ['all']
         elif user.role == UserRole.MANAGER.value:
             # マネージャーは管理するチームのエントリーにアクセス可能
-            managed_team_ids = user.managed_teams.values_list('id', flat=True)
-            entries = Entry.objects.filter(
-                tenant_id=tenants_pk,
-                team_id__in=managed_team_ids,
-                reported_at__gte=three_months_ago
-            )
+            managed_team_ids = sorted(user.managed_team_ids)
+            entries = entries.filter(team_id__in=managed_team_ids)
+            scope = ['manager', managed_team_ids]
         else:
             # 一般ユーザーは自分のエントリーのみアクセス可能
-            entries = Entry.objects.filter(
-                tenant_id=tenants_pk,
-                user=user,
-                reported_at__gte=three_months_ago
-            )
+            entries = entries.filter(user_id=user.id)
+            scope = ['user', user.id]
+        
+        if team_ids is not None:
+            entries = entries.filter(team_id__in=team_ids)
+        
+        # 同じ条件・同じバージョンのレスポンスはキャッシュから返す（バージョンはエントリー書き込みで進む）
+        pack = request.query_params.get('pack')
+        response_cache = get_team_entry_cache()
+        if not response_cache.enabled:
+            # バージョンを共有できない場合は ETag も返さない（他プロセスの書き込みを検知できないため）
+            return Response(self._build_response_data(request, entries, bucket, pack))
         
-        entries = entries.select_related(
-            'team',  # 同じクエリでチームデータを取得
-            'user'   # 同じクエリでユーザーデータを取得
-        ).order_by('team_id', 'user_id', 'reported_at')
-        
-        # ネストされた構造を構築
-        teams_data = {}
-        users_data = defaultdict(lambda: {
-            "labels": [],
-            "stress_values": [],
-            "motivation_values": []
-        })
-        
-        for entry in entries:
-            team = entry.team
-            user = entry.user
+        cache_key = response_cache.make_key(
+            tenants_pk,
+            scope=scope,
+            team_ids=sorted(team_ids) if team_ids is not None else None,
+            date_from=date_from,
+            date_to=date_to,
+            bucket=bucket,
+            format=request.accepted_renderer.format,
+            pack=pack,
+        )
+        etag = response_cache.make_etag(cache_key)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response_cache.stats.incr('not_modified')
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        
+        response_data = response_cache.get(cache_key)
+        if response_data is not None:
+            response_cache.stats.incr('hits')
+            return Response(response_data, headers={'ETag': etag})
+        
+        response_cache.stats.incr('misses')
+        # キャッシュ・ETag はバージョンが進むまで使われ続けるため、レプリカの遅延した値を保存しない
+        with primary_reads():
+            response_data = self._build_response_data(request, entries, bucket, pack)
+        response_cache.set(cache_key, response_data)
             
-            if team.id not in teams_data:
-                teams_data[team.id] = {
-                    "id": team.id,
-                    "name": team.name,
-                    "users": []
+        return Response(response_data, headers={'ETag': etag})
+    
+    def _build_response_data(self, request, entries, bucket, pack):
+        """エントリーを集約し、要求された形式（通常 / コンパクト）のレスポンスデータを返す"""
+        rows = self._aggregate_rows(entries, bucket)
+        if isinstance(request.accepted_renderer, CompactJSONRenderer):
+            return self._build_compact(rows, pack=pack)
+        return self._build_series(rows)
+    
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='team_ids',
+                type={'type': 'array', 'items': {'type': 'number'}},
+                location=OpenApiParameter.QUERY,
+                description='カンマ区切りのチームIDリスト（省略時は権限内の全チーム）',
+                required=False
+            ),
+            OpenApiParameter(name='from', type=date, location=OpenApiParameter.QUERY,
+                             description='表示期間の開始日 YYYY-MM-DD', required=False),
+            OpenApiParameter(name='to', type=date, location=OpenApiParameter.QUERY,
+                             description='表示期間の終了日 YYYY-MM-DD', required=False),
+            OpenApiParameter(name='bucket', type=str, enum=BUCKET_CHOICES,
+                             location=OpenApiParameter.QUERY, description='集計単位（既定: day）', required=False),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    def summary(self, request, tenants_pk):
+        """
+        チーム単位の日次（週次・月次）スコア集計を返すAPI
+        
+        エントリーではなくチーム日次集計（TeamDailyStats）を読むため、
+        読み込む行数はユーザー数に依存せず日数（期間数）に比例する。
+        
+        Returns:
+            Response: 以下の形式のJSONレスポンス
+                [
+                    {
+                        "id": int,  # チームID
+                        "name": str,  # チーム名
+                        "stats": {
+                            "labels": ["MM/DD", ...],  # 日付（期間の開始日）ラベル
+                            "count": [int, ...],  # 集計したエントリー数
+                            "stress_avg": [float, ...],
+                            "stress_min": [int, ...],
+                            "stress_max": [int, ...],
+                            "motivation_avg": [float, ...],
+                            "motivation_min": [int, ...],
+                            "motivation_max": [int, ...]
+                        }
+                    }
+                ]
+                
+        Permission Logic:
+            - SUPERUSER/ADMIN: 全チーム
+            - MANAGER: 管理するチームのみ
+            - USER: アクセス不可（403）
+        """
+        user = request.user
+        team_ids, date_from, date_to, bucket = self._parse_query_params(request.query_params)
+        
+        stats = TeamDailyStats.objects.filter(
+            tenant_id=tenants_pk,
+            date__gte=date_from,
+            date__lte=date_to
+        )
+        if user.role in [UserRole.SUPERUSER.value, UserRole.ADMIN.value]:
+            pass
+        elif user.role == UserRole.MANAGER.value:
+            stats = stats.filter(team_id__in=user.managed_team_ids)
+        else:
+            raise PermissionDenied('チームの集計はマネージャー以上のみ閲覧できます。')
+        
+        if team_ids is not None:
+            stats = stats.filter(team_id__in=team_ids)
+        
+        # 期間単位で GROUP BY し、平均は合計÷件数で求める（日次の場合は1行ずつの集計になる）
+        truncation = BUCKET_TRUNCATIONS[bucket]
+        rows = (
+            stats
+            .values('team_id', 'team__name', period=truncation('date') if truncation else F('date'))
+            .annotate(
+                total=Sum('count'),
+                stress_total=Sum('stress_sum'),
+                stress_low=Min('stress_min'),
+                stress_high=Max('stress_max'),
+                motivation_total=Sum('motivation_sum'),
+                motivation_low=Min('motivation_min'),
+                motivation_high=Max('motivation_max'),
+            )
+            .order_by('team_id', 'period')
+        )
+        
+        response_data = []
+        team_stats = None
+        for row in rows.iterator():
+            if not response_data or response_data[-1]["id"] != row['team_id']:
+                team_stats = {
+                    "labels": [],
+                    "count": [],
+                    "stress_avg": [],
+                    "stress_min": [],
+                    "stress_max": [],
+                    "motivation_avg": [],
+                    "motivation_min": [],
+                    "motivation_max": []
                 }
+                response_data.append({
+                    "id": row['team_id'],
+                    "name": row['team__name'],
+                    "stats": team_stats
+                })
             
-            # ユーザーデータに日付と両方のスコアを追加
-            users_data[(team.id, user.id)]["labels"].append(
-                entry.reported_at.strftime("%m/%d")
+            period = row['period']
+            team_stats["labels"].append(f"{period.month:02d}/{period.day:02d}")
+            team_stats["count"].append(row['total'])
+            team_stats["stress_avg"].append(round(row['stress_total'] / row['total'], 1))
+            team_stats["stress_min"].append(row['stress_low'])
+            team_stats["stress_max"].append(row['stress_high'])
+            team_stats["motivation_avg"].append(round(row['motivation_total'] / row['total'], 1))
+            team_stats["motivation_min"].append(row['motivation_low'])
+            team_stats["motivation_max"].append(row['motivation_high'])
+        
+        return Response(response_data)
+    
+    @action(detail=False, methods=['get'], url_path='cache-stats')
+    def cache_stats(self, request, tenants_pk):
+        """
+        レスポンスキャッシュのヒット率を返すAPI（SUPERUSER/ADMIN のみ）
+        
+        カウンタはプロセス単位で、プロセス起動からの累計値。
+        
+        Returns:
+            Response: {"hits": int, "misses": int, "not_modified": int, "evictions": int, "hit_rate": float}
+        """
+        if request.user.role not in [UserRole.SUPERUSER.value, UserRole.ADMIN.value]:
+            raise PermissionDenied('キャッシュの統計は管理者のみ閲覧できます。')
+        return Response(get_team_entry_cache().stats.as_dict())
+    
+    @staticmethod
+    def _parse_query_params(query_params):
+        """
+        team_ids / from / to / bucket パラメータを検証して返す
+        
+        Returns:
+            tuple: (team_ids: list[int]|None, date_from: date, date_to: date, bucket: str)
+            
+        Raises:
+            ValidationError: 値の形式が不正な場合
+        """
+        team_ids = None
+        raw_team_ids = query_params.get('team_ids')
+        if raw_team_ids:
+            try:
+                team_ids = [int(team_id) for team_id in raw_team_ids.split(',') if team_id.strip()]
+            except ValueError:
+                raise ValidationError({'team_ids': 'カンマ区切りの整数で指定してください。'})
+        
+        dates = {}
+        for name in ('from', 'to'):
+            value = query_params.get(name)
+            if not value:
+                dates[name] = None
+                continue
+            try:
+                dates[name] = date.fromisoformat(value)
+            except ValueError:
+                raise ValidationError({name: 'YYYY-MM-DD 形式で指定してください。'})
+        
+        date_to = dates['to'] or datetime.now().date()
+        date_from = dates['from'] or date_to - timedelta(days=DEFAULT_WINDOW_DAYS)
+        if date_from > date_to:
+            raise ValidationError({'from': '開始日は終了日以前の日付を指定してください。'})
+        
+        bucket = query_params.get('bucket') or 'day'
+        if bucket not in BUCKET_TRUNCATIONS:
+            raise ValidationError({'bucket': f'{" / ".join(BUCKET_TRUNCATIONS)} のいずれかを指定してください。'})
+        
+        return team_ids, date_from, date_to, bucket
+    
+    @staticmethod
+    def _aggregate_rows(entries, bucket):
+        """
+        エントリーを集計単位に応じた (team_id, team_name, user_id, user_name, 日付, stress, motivation)
+        の行に変換する
+        
+        day の場合は日次のエントリーをそのまま返す。week / month の場合はDB側で
+        期間の開始日に切り捨てて GROUP BY し、スコアの平均値を整数に丸めて返す。
+        """
+        truncation = BUCKET_TRUNCATIONS[bucket]
+        if truncation is None:
+            return entries.order_by('team_id', 'user_id', 'reported_at').values_list(
+                'team_id', 'team__name', 'user_id', 'user__name',
+                'reported_at', 'stress_score', 'motivation_score',
             )
-            users_data[(team.id, user.id)]["stress_values"].append(
-                entry.stress_score or 0
+        
+        return (
+            entries
+            .annotate(period=truncation('reported_at'))
+            .values('team_id', 'team__name', 'user_id', 'user__name', 'period')
+            .annotate(
+                avg_stress=Cast(Round(Avg('stress_score')), IntegerField()),
+                avg_motivation=Cast(Round(Avg('motivation_score')), IntegerField()),
             )
-            users_data[(team.id, user.id)]["motivation_values"].append(
-                entry.motivation_score or 0
+            .order_by('team_id', 'user_id', 'period')
+            .values_list(
+                'team_id', 'team__name', 'user_id', 'user__name',
+                'period', 'avg_stress', 'avg_motivation',
             )
+        )
+    
+    def _build_series(self, rows):
+        """
+        既定形式（ユーザー毎の labels / stress_values / motivation_values）を構築する
+        
+        Args:
+            rows: (team_id, team_name, user_id, user_name, reported_at, stress, motivation)
+                  を team_id, user_id, reported_at 順に返すクエリセット
+        """
+        # team_id, user_id 順に並んだタプルを1回走査してネスト構造を構築
+        response_data = []
+        team_data = None
+        user_entries = None
+        current_user_key = None
         
-        # チームとユーザーデータを結合
-        for (team_id, user_id), data in users_data.items():
-            user = next(e.user for e in entries 
-                      if e.team.id == team_id and e.user.id == user_id)
+        for team_id, team_name, user_id, user_name, reported_at, stress, motivation in rows.iterator():
+            if team_data is None or team_data["id"] != team_id:
+                team_data = {
+                    "id": team_id,
+                    "name": team_name,
+                    "users": []
+                }
+                response_data.append(team_data)
             
-            teams_data[team_id]["users"].append({
-                "id": user.id,
-                "name": user.name,
-                "entries": {
-                    "labels": data["labels"],
-                    "stress_values": data["stress_values"],
-                    "motivation_values": data["motivation_values"]
+            if current_user_key != (team_id, user_id):
+                # ユーザー名は初出時に取得
+                current_user_key = (team_id, user_id)
+                user_entries = {
+                    "labels": [],
+                    "stress_values": [],
+                    "motivation_values": []
+                }
+                team_data["users"].append({
+                    "id": user_id,
+                    "name": user_name,
+                    "entries": user_entries
+                })
+            
+            # ユーザーデータに日付と両方のスコアを追加
+            user_entries["labels"].append(f"{reported_at.month:02d}/{reported_at.day:02d}")
+            # 未計算（pending / failed）のスコアは 0（ストレスなし）と区別できるよう null のまま返す
+            user_entries["stress_values"].append(stress)
+            user_entries["motivation_values"].append(motivation)
+        
+        return response_data
+    
+    def _build_compact(self, rows, pack=None):
+        """
+        コンパクト形式（チーム共通の日付軸＋ユーザー毎の整数配列）を構築する
+        
+        日付軸は開始日からの日数オフセットで表し、行毎の日付文字列整形を行わない。
+        エントリーがない日・スコアが未計算の日は null（pack=int8 の場合は -1）で埋める。
+        
+        Args:
+            rows: _build_series と同じ並びのクエリセット
+            pack (str|None): "int8" の場合、スコア配列を符号付き8bit整数の base64 文字列で返す
+        """
+        response_data = []
+        team_data = None
+        user_points = None
+        current_user_key = None
+        
+        for team_id, team_name, user_id, user_name, reported_at, stress, motivation in rows.iterator():
+            if team_data is None or team_data["id"] != team_id:
+                if team_data is not None:
+                    self._finish_compact_team(team_data, pack)
+                team_data = {
+                    "id": team_id,
+                    "name": team_name,
+                    "users": [],
+                    "_ordinals": set()
                 }
-            })
+                response_data.append(team_data)
+            
+            if current_user_key != (team_id, user_id):
+                current_user_key = (team_id, user_id)
+                user_points = []
+                team_data["users"].append({
+                    "id": user_id,
+                    "name": user_name,
+                    "_points": user_points
+                })
+            
+            ordinal = reported_at.toordinal()
+            team_data["_ordinals"].add(ordinal)
+            user_points.append((ordinal, stress, motivation))
+        
+        if team_data is not None:
+            self._finish_compact_team(team_data, pack)
+        
+        return response_data
+    
+    @staticmethod
+    def _finish_compact_team(team_data, pack):
+        """チームの日付軸を確定し、ユーザー毎の点列を軸に揃えた配列に変換する"""
+        ordinals = sorted(team_data.pop("_ordinals"))
+        start = ordinals[0]
+        positions = {ordinal: i for i, ordinal in enumerate(ordinals)}
+        gap = -1 if pack == "int8" else None
+        
+        team_data["start"] = date.fromordinal(start).isoformat()
+        team_data["offsets"] = [ordinal - start for ordinal in ordinals]
         
-        # チームIDで順序付けしたリストに変換
-        response_data = sorted(teams_data.values(), key=lambda x: x['id'])
+        for user_data in team_data["users"]:
+            stress_values = [gap] * len(ordinals)
+            motivation_values = [gap] * len(ordinals)
+            for ordinal, stress, motivation in user_data.pop("_points"):
+                stress_values[positions[ordinal]] = gap if stress is None else stress
+                motivation_values[positions[ordinal]] = gap if motivation is None else motivation
             
-        return Response(response_data)
\ No newline at end of file
+            if pack == "int8":
+                stress_values = b64encode(array("b", stress_values).tobytes()).decode("ascii")
+                motivation_values = b64encode(array("b", motivation_values).tobytes()).decode("ascii")
+            user_data["stress"] = stress_values
+            user_data["motivation"] = motivation_values
@@ -2,7 +2,9 @@ from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
+from backend.db_routers import ReplicaReadMixin
 from backend.models import Team
+from backend.pagination import IdCursorPagination
 from backend.permissions import IsAdminOrManager, IsTenantUser
 from backend.serializers.team_serializer import TeamDetailSerializer, TeamSerializer
 
@@ -12,7 +14,7 @@ from backend.serializers.team_serializer import TeamDetailSerializer, TeamSerial
             OpenApiParameter('tenants_pk', int, OpenApiParameter.PATH),
     ],
     tags=["team"])
-class TeamViewSet(ModelViewSet):
+class TeamViewSet(ReplicaReadMixin, ModelViewSet):
     """
     チーム管理API ViewSet
     
@@ -23,9 +25,12 @@ class TeamViewSet(ModelViewSet):
         - テナント内チームのみ表示
         - チーム固有の質問項目管理
         - チーム管理者の設定
+        - ID順のカーソルページネーション
+        - 一覧の読み取りはレプリカ（設定時）に振り分け
     """
     permission_classes = [IsAuthenticated, IsTenantUser]
     serializer_class = TeamSerializer
+    pagination_class = IdCursorPagination
 
     def get_permissions(self):
         """
@@ -48,9 +53,9 @@ class TeamViewSet(ModelViewSet):
     def get_queryset(self):
         # 現在のテナントに属するチームのみ表示
         return Team.objects.filter(
-            tenant=self.request.user.tenant
-        ).prefetch_related('managers')
+            tenant_id=self.request.user.tenant_id
+        ).prefetch_related('managers__teams')
     
     def perform_create(self, serializer):
         # チーム作成時に現在のユーザーのテナントを自動設定
-        serializer.save(tenant=self.request.user.tenant)
\ No newline at end of file
+        serializer.save(tenant_id=self.request.user.tenant_id)
\ No newline at end of file
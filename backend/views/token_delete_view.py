@@ -3,11 +3,17 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from backend.authentication import get_verified_token_cache
+
 
 class TokenDeleteView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
+        access_token = request.COOKIES.get('access_token')
+        if access_token is not None:
+            # 検証済みトークンキャッシュからも取り除く
+            get_verified_token_cache().evict(access_token)
         
         res = Response(status=status.HTTP_200_OK)
         res.delete_cookie('access_token')
@@ -1,12 +1,20 @@
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from backend.authentication import invalidate_cached_user
+from backend.db_routers import ReplicaReadMixin
 from backend.models import User
 from backend.models.user import UserRole
+from backend.pagination import IdCursorPagination
 from backend.permissions import IsAdminOrManager, IsOwnerOrAdmin, IsTenantUser
-from backend.serializers.user_serializer import UserDetailSerializer, UserSerializer
+from backend.serializers.user_serializer import (
+    UserDetailSerializer,
+    UserLeanSerializer,
+    UserSerializer,
+)
 
 
 @extend_schema(
@@ -15,7 +23,7 @@ from backend.serializers.user_serializer import UserDetailSerializer, UserSerial
         ],
         tags=["user"],
     )
-class UserViewSet(ModelViewSet):
+class UserViewSet(ReplicaReadMixin, ModelViewSet):
     """
     ユーザー管理API ViewSet
     
@@ -25,12 +33,16 @@ class UserViewSet(ModelViewSet):
     Features:
         - テナント内ユーザーのみ表示（SUPERUSER除外）
         - ロール変更権限のチェック
+        - ID順のカーソルページネーション
+        - 一覧・詳細は UserLeanSerializer による軽量な読み取り（?fields= で出力フィールドを指定可能）
+        - 一覧の読み取りはレプリカ（設定時）に振り分け
         
     Security:
         - 自分より上位ロールへの変更不可
         - SUPERUSERロール設定不可
     """
     serializer_class = UserSerializer
+    pagination_class = IdCursorPagination
 
     def get_permissions(self):
         """
@@ -48,6 +60,17 @@ class UserViewSet(ModelViewSet):
         
         return [permission() for permission in permission_classes]
 
+    def list(self, request, *args, **kwargs):
+        # values() の行を DRF のフィールド機構を通さずに辞書へ変換する
+        lean = UserLeanSerializer(fields=request.query_params.get('fields'))
+        rows = lean.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(lean.to_representation(page))
+
+    def retrieve(self, request, *args, **kwargs):
+        lean = UserLeanSerializer(fields=request.query_params.get('fields'))
+        return Response(lean.instance_to_representation(self.get_object()))
+
     def get_serializer_class(self):
         if self.action in ['retrieve', 'list']:
             return UserDetailSerializer
@@ -56,7 +79,7 @@ class UserViewSet(ModelViewSet):
     def get_queryset(self):
         # テナント内の全ユーザー表示（SUPERUSER除く）
         return User.objects.filter(
-            tenant=self.request.user.tenant
+            tenant_id=self.request.user.tenant_id
         ).exclude(role=UserRole.SUPERUSER.value).prefetch_related('teams')
     
     
@@ -135,6 +158,7 @@ class UserViewSet(ModelViewSet):
                 raise ValidationError({'error': error_msg})
         
         serializer.save()
+        invalidate_cached_user(serializer.instance.pk)
     
     def perform_create(self, serializer):
         # ロール設定のチェック
@@ -144,4 +168,4 @@ class UserViewSet(ModelViewSet):
                 raise ValidationError({'error': error_msg})
         
         # テナントを自動設定してユーザー作成
-        serializer.save(tenant=self.request.user.tenant)
\ No newline at end of file
+        serializer.save(tenant_id=self.request.user.tenant_id)
\ No newline at end of file
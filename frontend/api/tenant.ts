@@ -1,10 +1,16 @@
 import type { AxiosInstance } from 'axios'
-import type { ApiResponse, Team, TeamDetail, Entry, EntryDetail, TeamEntry, EntryFormData, TeamFormData, User, UserDetail, UserFormData } from '@/types'
+import dayjs from 'dayjs'
+import type { ApiResponse, CursorPage, Team, TeamDetail, Entry, EntryDetail, TeamEntry, EntryFormData, TeamFormData, User, UserDetail, UserFormData } from '@/types'
 
 export default function (httpClient: AxiosInstance) {
+  // 一覧の1ページを取得する（cursor に前のページの next を渡すと続きを取得する）
+  async function getPage<T>(url: string, cursor?: string | null): Promise<ApiResponse<CursorPage<T>>> {
+    return await httpClient.get<CursorPage<T>>(cursor || url)
+  }
+
   return {
-    async getTeams(tenant_id: number): Promise<ApiResponse<TeamDetail[]>> {
-      return httpClient.get(`/api/tenants/${tenant_id}/teams/`)
+    async getTeams(tenant_id: number, cursor?: string | null): Promise<ApiResponse<CursorPage<TeamDetail>>> {
+      return getPage<TeamDetail>(`/api/tenants/${tenant_id}/teams/`, cursor)
     },
 
     async addTeam(tenant_id: number, data: TeamFormData): Promise<ApiResponse<Team>> {
@@ -19,20 +25,23 @@ export default function (httpClient: AxiosInstance) {
       return await httpClient.delete(`/api/tenants/${tenant_id}/teams/${team_id}/`)
     },
 
-    async getEntries(tenant_id: number): Promise<ApiResponse<EntryDetail[]>> {
-      return await httpClient.get(`/api/tenants/${tenant_id}/entries/`)
+    // 記録日の新しい順に1ページずつ取得する
+    async getEntries(tenant_id: number, cursor?: string | null): Promise<ApiResponse<CursorPage<EntryDetail>>> {
+      return getPage<EntryDetail>(`/api/tenants/${tenant_id}/entries/`, cursor)
     },
 
+    // 同じチーム・記録日のエントリーは上書きする（再送しても重複エラーにならない）
     async addEntry(tenant_id: number, data: EntryFormData): Promise<ApiResponse<Entry>> {
-      return await httpClient.post(`/api/tenants/${tenant_id}/entries/`, data)
+      const reportedAt = dayjs(data.reported_at).format('YYYY-MM-DD')
+      return await httpClient.put(`/api/tenants/${tenant_id}/entries/daily/${data.team}/${reportedAt}/`, data)
     },
 
     async getTeamEntries(tenant_id: number): Promise<ApiResponse<TeamEntry[]>> {
       return await httpClient.get(`/api/tenants/${tenant_id}/team-entries/`)
     },
 
-    async getUsers(tenant_id: number): Promise<ApiResponse<UserDetail[]>> {
-      return httpClient.get(`/api/tenants/${tenant_id}/users/`)
+    async getUsers(tenant_id: number, cursor?: string | null): Promise<ApiResponse<CursorPage<UserDetail>>> {
+      return getPage<UserDetail>(`/api/tenants/${tenant_id}/users/`, cursor)
     },
 
     async addUser(tenant_id: number, data: UserFormData): Promise<ApiResponse<User>> {
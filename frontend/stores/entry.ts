@@ -3,16 +3,33 @@ import { useAuthStore } from '@/stores/auth'
 import type { EntryDetail, EntryFormData } from '@/types'
 import dayjs from 'dayjs'
 import { defineStore } from 'pinia'
-import { ref } from 'vue'
+import { computed, ref } from 'vue'
 
 export const useEntryStore = defineStore('entry', () => {
   // State
   const entries = ref<EntryDetail[]>([])
+  // 次のページのカーソル（null の場合は最後まで取得済み）
+  const next = ref<string | null>(null)
   const isLoading = ref<boolean>(false)
   const error = ref<string | null>(null)
 
+  // Getters
+  const hasMore = computed(() => next.value !== null)
+
   // Actions
+  // 最初のページ（記録日の新しい順）を取得する。続きは fetchMoreEntries で読み込む
   async function fetchEntries(): Promise<void> {
+    await loadPage(null)
+  }
+
+  async function fetchMoreEntries(): Promise<void> {
+    if (next.value === null || isLoading.value) {
+      return
+    }
+    await loadPage(next.value)
+  }
+
+  async function loadPage(cursor: string | null): Promise<void> {
     const authStore = useAuthStore()
 
     if (!authStore.user?.tenant) {
@@ -23,15 +40,16 @@ export const useEntryStore = defineStore('entry', () => {
     error.value = null
 
     try {
-      const res = await httpClient.tenant.getEntries(authStore.user.tenant)
+      const res = await httpClient.tenant.getEntries(authStore.user.tenant, cursor)
 
       // Format dates
-      const formattedEntries = res.data.map(entry => ({
+      const formattedEntries = res.data.results.map(entry => ({
         ...entry,
         reported_at: dayjs(entry.reported_at).format("YYYY/MM/DD")
       }))
 
-      entries.value = formattedEntries
+      entries.value = cursor ? [...entries.value, ...formattedEntries] : formattedEntries
+      next.value = res.data.next
     } catch (err: any) {
       error.value = err.message || 'Failed to fetch entries'
       throw err
@@ -63,11 +81,16 @@ export const useEntryStore = defineStore('entry', () => {
   return {
     // State
     entries,
+    next,
     isLoading,
     error,
 
+    // Getters
+    hasMore,
+
     // Actions
     fetchEntries,
+    fetchMoreEntries,
     addEntries
   }
 })
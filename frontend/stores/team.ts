@@ -2,16 +2,33 @@ import httpClient from '@/api'
 import { useAuthStore } from '@/stores/auth'
 import type { TeamDetail, TeamFormData } from '@/types'
 import { defineStore } from 'pinia'
-import { ref } from 'vue'
+import { computed, ref } from 'vue'
 
 export const useTeamStore = defineStore('team', () => {
   // State
   const teams = ref<TeamDetail[]>([])
+  // 次のページのカーソル（null の場合は最後まで取得済み）
+  const next = ref<string | null>(null)
   const isLoading = ref<boolean>(false)
   const error = ref<string | null>(null)
 
+  // Getters
+  const hasMore = computed(() => next.value !== null)
+
   // Actions
+  // 最初のページを取得する。続きは fetchMoreTeams で読み込む
   async function fetchTeams(): Promise<void> {
+    await loadPage(null)
+  }
+
+  async function fetchMoreTeams(): Promise<void> {
+    if (next.value === null || isLoading.value) {
+      return
+    }
+    await loadPage(next.value)
+  }
+
+  async function loadPage(cursor: string | null): Promise<void> {
     const authStore = useAuthStore()
 
     if (!authStore.user?.tenant) {
@@ -22,8 +39,9 @@ export const useTeamStore = defineStore('team', () => {
     error.value = null
 
     try {
-      const res = await httpClient.tenant.getTeams(authStore.user.tenant)
-      teams.value = res.data
+      const res = await httpClient.tenant.getTeams(authStore.user.tenant, cursor)
+      teams.value = cursor ? [...teams.value, ...res.data.results] : res.data.results
+      next.value = res.data.next
     } catch (err: any) {
       error.value = err.message || 'Failed to fetch teams'
       throw err
@@ -95,11 +113,16 @@ export const useTeamStore = defineStore('team', () => {
   return {
     // State
     teams,
+    next,
     isLoading,
     error,
 
+    // Getters
+    hasMore,
+
     // Actions
     fetchTeams,
+    fetchMoreTeams,
     addTeam,
     updateTeam,
     deleteTeam
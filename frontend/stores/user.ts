@@ -2,16 +2,33 @@ import httpClient from '@/api'
 import { useAuthStore } from '@/stores/auth'
 import type { UserDetail, UserFormData } from '@/types'
 import { defineStore } from 'pinia'
-import { ref } from 'vue'
+import { computed, ref } from 'vue'
 
 export const useUserStore = defineStore('user', () => {
   // State
   const users = ref<UserDetail[]>([])
+  // 次のページのカーソル（null の場合は最後まで取得済み）
+  const next = ref<string | null>(null)
   const isLoading = ref<boolean>(false)
   const error = ref<string | null>(null)
 
+  // Getters
+  const hasMore = computed(() => next.value !== null)
+
   // Actions
+  // 最初のページを取得する。続きは fetchMoreUsers で読み込む
   async function fetchUsers(): Promise<void> {
+    await loadPage(null)
+  }
+
+  async function fetchMoreUsers(): Promise<void> {
+    if (next.value === null || isLoading.value) {
+      return
+    }
+    await loadPage(next.value)
+  }
+
+  async function loadPage(cursor: string | null): Promise<void> {
     const authStore = useAuthStore()
 
     if (!authStore.user?.tenant) {
@@ -22,8 +39,9 @@ export const useUserStore = defineStore('user', () => {
     error.value = null
 
     try {
-      const res = await httpClient.tenant.getUsers(authStore.user.tenant)
-      users.value = res.data
+      const res = await httpClient.tenant.getUsers(authStore.user.tenant, cursor)
+      users.value = cursor ? [...users.value, ...res.data.results] : res.data.results
+      next.value = res.data.next
     } catch (err: any) {
       error.value = err.message || 'Failed to fetch users'
       throw err
@@ -95,11 +113,16 @@ export const useUserStore = defineStore('user', () => {
   return {
     // State
     users,
+    next,
     isLoading,
     error,
 
+    // Getters
+    hasMore,
+
     // Actions
     fetchUsers,
+    fetchMoreUsers,
     addUser,
     updateUser,
     deleteUser
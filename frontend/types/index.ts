@@ -60,8 +60,9 @@ export interface UserWithEntries {
   name: string
   entries: {
     labels: string[]
-    stress_values: number[]
-    motivation_values: number[]
+    // スコア未計算（pending / failed）の点は null
+    stress_values: (number | null)[]
+    motivation_values: (number | null)[]
   }
 }
 
@@ -120,6 +121,13 @@ export interface ApiResponse<T> {
   status: number
 }
 
+// カーソルページネーションの一覧レスポンス
+export interface CursorPage<T> {
+  next: string | null
+  previous: string | null
+  results: T[]
+}
+
 export interface ApiError {
   message: string
   status: number
@@ -136,15 +144,15 @@ export interface HttpClientMethods {
     refresh: () => Promise<ApiResponse<User>>
   }
   tenant: {
-    getTeams: (tenantId: number) => Promise<ApiResponse<TeamDetail[]>>
+    getTeams: (tenantId: number, cursor?: string | null) => Promise<ApiResponse<CursorPage<TeamDetail>>>
     addTeam: (tenantId: number, team: TeamFormData) => Promise<ApiResponse<Team>>
     updateTeam: (tenantId: number, teamId: number, team: TeamFormData) => Promise<ApiResponse<Team>>
     deleteTeam: (tenantId: number, teamId: number) => Promise<ApiResponse<void>>
-    getUsers: (tenantId: number) => Promise<ApiResponse<UserDetail[]>>
+    getUsers: (tenantId: number, cursor?: string | null) => Promise<ApiResponse<CursorPage<UserDetail>>>
     addUser: (tenantId: number, user: any) => Promise<ApiResponse<User>>
     updateUser: (tenantId: number, userId: number, user: any) => Promise<ApiResponse<User>>
     deleteUser: (tenantId: number, userId: number) => Promise<ApiResponse<void>>
-    getEntries: (tenantId: number) => Promise<ApiResponse<EntryDetail[]>>
+    getEntries: (tenantId: number, cursor?: string | null) => Promise<ApiResponse<CursorPage<EntryDetail>>>
     addEntry: (tenantId: number, entry: EntryFormData) => Promise<ApiResponse<Entry>>
     getTeamEntries: (tenantId: number) => Promise<ApiResponse<TeamEntry[]>>
   }